@@ -0,0 +1,24 @@
+"""Import the integration's dependency-free modules without Home Assistant.
+
+The integration package ``__init__`` imports Home Assistant. Registering a bare
+package module first lets ``codec``, ``capture`` and ``const`` be imported on
+their own, e.g. on a plain Linux box or in CI.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACKAGE = "gira_system_3000"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / PACKAGE
+
+
+def load(module: str) -> types.ModuleType:
+    """Return ``gira_system_3000.<module>`` without running the package __init__."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
@@ -0,0 +1,175 @@
+"""Vectorized decoding of captured advertisements with NumPy.
+
+Meant for offline analysis of large captures (calibrating lux and temperature
+conversions over days of data); not part of the integration, it imports the
+codec through ``_loader``.
+Frames are rows of a ``uint8`` array in the layout devices broadcast
+(``codec.frame_types``: one frame per row, big-endian value at ``FRAME_VALUE_OFFSET``).
+No Python object is created per frame.
+
+NumPy ships with Home Assistant; outside of it, install it next to the
+offline tooling.
+"""
+from __future__ import annotations
+
+import functools
+import os
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from _loader import load
+
+codec = load("codec")
+const = load("const")
+
+FRAME_VALUE_OFFSET = codec.FRAME_VALUE_OFFSET
+SENSOR_FRAME_LENGTH = const.SENSOR_FRAME_LENGTH
+
+# Shutter frames are one byte shorter than sensor/thermostat frames.
+MIN_FRAME_LENGTH = FRAME_VALUE_OFFSET + 1
+
+# Rows decoded per step when reading memory-mapped files, so temporaries stay small.
+CHUNK_ROWS = 1 << 20
+
+
+class BatchFrames(NamedTuple):
+    """Decoded columns; NaN where a row is not that kind of frame."""
+
+    position: np.ndarray
+    current_temperature: np.ndarray
+    target_temperature: np.ndarray
+    sensor_temperature: np.ndarray
+    sensor_brightness: np.ndarray
+
+    @property
+    def decoded(self) -> np.ndarray:
+        """Boolean mask of rows that decoded to any field."""
+        mask = np.zeros(len(self.position), dtype=bool)
+        for column in self:
+            mask |= ~np.isnan(column)
+        return mask
+
+
+# -----------------------------------------------------------------------------
+# Vectorized conversions (index a table of the codec's conversion)
+# -----------------------------------------------------------------------------
+_FRAME_TYPES = {frame_type.field: frame_type for frame_type in codec.frame_types()}  # in match order
+
+
+@functools.cache
+def _value_table(field: str) -> np.ndarray:
+    """The field's converted value for every raw value, built on first use."""
+    frame_type = _FRAME_TYPES[field]
+    size = 1 << (8 * frame_type.width)
+    return np.fromiter(map(frame_type.convert, range(size)), dtype=np.float64, count=size)
+
+
+# (prefix columns, prefix as uint8 array, field, value width in bytes, requires sensor length)
+_SPECS = tuple(
+    (
+        slice(frame_type.offset, frame_type.offset + len(frame_type.prefix)),
+        np.frombuffer(frame_type.prefix, dtype=np.uint8),
+        frame_type.field,
+        frame_type.width,
+        frame_type.device_type == "sensor",
+    )
+    for frame_type in _FRAME_TYPES.values()
+)
+
+
+# -----------------------------------------------------------------------------
+# Decoding
+# -----------------------------------------------------------------------------
+def _empty(rows: int) -> BatchFrames:
+    return BatchFrames(*(np.full(rows, np.nan) for _ in BatchFrames._fields))
+
+
+def _decode_into(
+    out: BatchFrames,
+    start: int,
+    frames: np.ndarray,
+    lengths: np.ndarray | None,
+) -> None:
+    width = frames.shape[1]
+    u8 = frames[:, FRAME_VALUE_OFFSET].astype(np.int64)
+    u16 = (u8 << 8) | frames[:, FRAME_VALUE_OFFSET + 1] if width > MIN_FRAME_LENGTH else None
+    stop = start + len(frames)
+    # Like codec.decode_frame, a row belongs to the first frame type it matches.
+    claimed = np.zeros(len(frames), dtype=bool)
+    for columns, prefix, field, size, sensor in _SPECS:
+        if size == 2 and u16 is None:
+            continue
+        mask = (frames[:, columns] == prefix).all(axis=1) & ~claimed
+        if lengths is not None:
+            mask &= lengths == SENSOR_FRAME_LENGTH if sensor else lengths >= FRAME_VALUE_OFFSET + size
+        elif sensor and width != SENSOR_FRAME_LENGTH:
+            continue
+        if not mask.any():
+            continue
+        claimed |= mask
+        raw = (u16 if size == 2 else u8)[mask]
+        getattr(out, field)[start:stop][mask] = _value_table(field)[raw]
+
+
+def decode_array(frames: np.ndarray, lengths: np.ndarray | None = None) -> BatchFrames:
+    """Decode a 2-D ``uint8`` array of frames (one payload per row).
+
+    ``lengths`` holds the real payload length of each row when rows are
+    zero-padded (see ``frames_from_payloads``); without it every row is taken
+    to be ``frames.shape[1]`` bytes long.
+    """
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.ndim != 2 or frames.shape[1] < MIN_FRAME_LENGTH:
+        raise ValueError(f"Expected an (n, >= {MIN_FRAME_LENGTH}) uint8 array")
+    out = _empty(len(frames))
+    for start in range(0, len(frames), CHUNK_ROWS):
+        chunk = slice(start, start + CHUNK_ROWS)
+        _decode_into(out, start, frames[chunk], None if lengths is None else lengths[chunk])
+    return out
+
+
+def decode_buffer(buffer: bytes | bytearray | memoryview, frame_length: int = SENSOR_FRAME_LENGTH) -> BatchFrames:
+    """Decode a contiguous buffer of fixed-length frames (no copy)."""
+    if len(buffer) % frame_length:
+        raise ValueError(f"Buffer length is not a multiple of {frame_length}")
+    return decode_array(np.frombuffer(buffer, dtype=np.uint8).reshape(-1, frame_length))
+
+
+def decode_file(
+    path: str | os.PathLike[str],
+    frame_length: int = SENSOR_FRAME_LENGTH,
+    *,
+    offset: int = 0,
+) -> BatchFrames:
+    """Decode a file of fixed-length frames through a memory map.
+
+    Only the decoded columns are held in RAM; the file is paged in chunk by chunk.
+    """
+    size = os.path.getsize(path) - offset
+    if size % frame_length:
+        raise ValueError(f"File payload is not a multiple of {frame_length} bytes")
+    if size == 0:
+        return _empty(0)
+    frames = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(size // frame_length, frame_length))
+    return decode_array(frames)
+
+
+def frames_from_payloads(
+    payloads: Iterable[bytes],
+    width: int = SENSOR_FRAME_LENGTH,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pack variable-length payloads into a zero-padded array plus their lengths.
+
+    Payloads longer than ``width`` are truncated; their length is kept so they
+    fail the sensor length check like in ``codec.decode_frame``.
+    """
+    payloads = list(payloads)
+    frames = np.zeros((len(payloads), width), dtype=np.uint8)
+    lengths = np.empty(len(payloads), dtype=np.int64)
+    for row, payload in enumerate(payloads):
+        length = len(payload)
+        lengths[row] = length
+        frames[row, : min(length, width)] = np.frombuffer(payload[:width], dtype=np.uint8)
+    return frames, lengths
@@ -0,0 +1,59 @@
+"""Vectorized batch decoder benchmark.
+
+Compares ``codec.decode_frames`` against ``batch.decode_array`` on synthetic
+13-byte sensor and thermostat frames, and optionally decodes a file of
+fixed-length frames through a memory map. Requires NumPy.
+
+    python benchmarks/bench_batch.py [--frames N] [--file FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import batch
+import replay
+from _loader import load
+
+codec = load("codec")
+
+
+def _best(run, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        run()
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--file", help="also decode this file of fixed-length frames")
+    parser.add_argument("--frame-length", type=int, default=13)
+    args = parser.parse_args()
+
+    print(f"{'suite':<12} {'mode':<8} {'frames':>10} {'frames/s':>14} {'ns/frame':>10}")
+    for device_type in ("thermostat", "sensor"):
+        payloads = [r.payload for r in replay.synthetic_capture(device_type, args.frames)]
+        frames = batch.np.frombuffer(b"".join(payloads), dtype=batch.np.uint8).reshape(-1, 13)
+        for mode, run in (
+            ("python", lambda: codec.decode_frames(payloads, device_type)),
+            ("numpy", lambda: batch.decode_array(frames)),
+        ):
+            ns = _best(run, args.rounds) / len(payloads)
+            print(f"{device_type:<12} {mode:<8} {len(payloads):>10} {1e9 / ns:>14,.0f} {ns:>10.1f}")
+
+    if args.file:
+        start = time.perf_counter()
+        result = batch.decode_file(args.file, args.frame_length)
+        elapsed = time.perf_counter() - start
+        rows = len(result.position)
+        print(f"{'file':<12} {'mmap':<8} {rows:>10} {rows / elapsed:>14,.0f} {elapsed * 1e9 / max(rows, 1):>10.1f}")
+        print(f"decoded rows: {int(result.decoded.sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Import time benchmark.
+
+Measures the cold import time of the dependency-free codec in a fresh
+interpreter per round, and of ``gira_ble`` (which pulls in Home Assistant and
+bleak) when those are installed.
+
+    python benchmarks/bench_import.py [--rounds N]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+CUSTOM_COMPONENTS = BENCH_DIR.parent / "custom_components"
+
+_STANDALONE = (
+    "import sys, time; sys.path.insert(0, {bench!r}); from _loader import load; "
+    "t = time.perf_counter(); load({module!r}); print(time.perf_counter() - t)"
+)
+_PACKAGE = (
+    "import sys, time; sys.path.insert(0, {path!r}); "
+    "t = time.perf_counter(); import gira_system_3000.{module}; print(time.perf_counter() - t)"
+)
+
+
+def _time_import(code: str, rounds: int) -> float | None:
+    """Return the median import time in ms, or None if the import failed."""
+    samples = []
+    for _ in range(rounds):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout.strip()) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    cases = {
+        "codec": _STANDALONE.format(bench=str(BENCH_DIR), module="codec"),
+        "gira_ble": _PACKAGE.format(path=str(CUSTOM_COMPONENTS), module="gira_ble"),
+    }
+    print(f"{'module':<12} {'import ms':>10}")
+    for name, code in cases.items():
+        ms = _time_import(code, args.rounds)
+        print(f"{name:<12} {'n/a' if ms is None else f'{ms:>10.2f}':>10}")
+
+
+if __name__ == "__main__":
+    main()
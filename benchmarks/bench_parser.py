@@ -0,0 +1,207 @@
+"""Advertisement parser benchmark.
+
+Replays synthetic captures (built from the constants in const.py) and reports
+frames/second and per-frame latency per device type:
+
+* ``base``: the original ``find()``-based parser of ``gira_ble`` (first
+  release), reproduced below without the Home Assistant plumbing
+* ``single``: the device type's frame decoder (``codec.FRAME_DECODERS``)
+* ``batch``: the batched decoder (``codec.decode_frames`` with the device
+  type, one decoder lookup mapped over the capture); mean only
+* ``coord``: the full receive path, ``async_handle_manufacturer_data`` of a
+  coordinator with ``--listeners`` entity listeners (duplicate fast-path,
+  change detection, motion tracking and listener fan-out). Needs Home
+  Assistant; skipped (offline mode) when it cannot be imported.
+
+Latency percentiles include the cost of one ``perf_counter_ns`` call per frame.
+
+    python benchmarks/bench_parser.py [--frames N] [--capture FILE] [--listeners 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+
+import replay
+from _loader import load
+
+capture = load("capture")
+codec = load("codec")
+const = load("const")
+
+DEVICE_TYPES = ("shutter", "thermostat", "sensor")
+
+
+def _baseline_parser(device_type: str) -> Callable[[bytes], dict | None]:
+    """The parsing half of the original ``_async_handle_bluetooth_event``."""
+    data: dict = {}
+
+    def parse_shutter(manufacturer_data: bytes) -> dict | None:
+        prefix_index = manufacturer_data.find(const.SHUTTER_POS_PREFIX)
+        if prefix_index == -1:
+            return None
+        if len(manufacturer_data) < prefix_index + len(const.SHUTTER_POS_PREFIX) + 1:
+            return None
+        position_byte = manufacturer_data[prefix_index + len(const.SHUTTER_POS_PREFIX)]
+        return {"position": round(100 * (255 - position_byte) / 255)}
+
+    def parse_thermostat(manufacturer_data: bytes) -> dict | None:
+        nonlocal data
+        data = dict(data)
+        for prefix, field in (
+            (const.THERMO_CURRENT_TEMP_PREFIX, "current_temperature"),
+            (const.THERMO_TARGET_TEMP_PREFIX, "target_temperature"),
+        ):
+            idx = manufacturer_data.find(prefix)
+            if idx != -1 and len(manufacturer_data) >= idx + len(prefix) + 2:
+                raw = int.from_bytes(manufacturer_data[idx + len(prefix) : idx + len(prefix) + 2], "big")
+                data[field] = codec.thermo_temperature_from_raw(raw)
+        return data or None
+
+    def parse_sensor(manufacturer_data: bytes) -> dict | None:
+        nonlocal data
+        if len(manufacturer_data) != const.SENSOR_FRAME_LENGTH:
+            return None
+        if not (
+            manufacturer_data[9] == const.SENSOR_SUFFIX_0 and manufacturer_data[10] == const.SENSOR_SUFFIX_1
+        ):
+            return None
+        cmd = manufacturer_data[8]
+        if cmd not in (const.SENSOR_CMD_TEMPERATURE, const.SENSOR_CMD_BRIGHTNESS):
+            return None
+        raw = (manufacturer_data[12] | (manufacturer_data[11] << 8)) & 0xFFFF
+        data = dict(data)
+        if cmd == const.SENSOR_CMD_TEMPERATURE:
+            if raw > const.SENSOR_TEMP_NEG_BASE:
+                data["sensor_temperature"] = (
+                    (const.SENSOR_TEMP_NEG_BASE - raw) / const.SENSOR_TEMP_NEG_BASE_DIVISOR / const.SENSOR_TEMP_DIVISOR
+                )
+            else:
+                data["sensor_temperature"] = raw / const.SENSOR_TEMP_DIVISOR
+        else:
+            data["sensor_brightness"] = 10 ** (const.SENSOR_LUX_A * float(raw) + const.SENSOR_LUX_B)
+        return data
+
+    return {"shutter": parse_shutter, "thermostat": parse_thermostat, "sensor": parse_sensor}[device_type]
+
+
+def _timed(handle: Callable[[bytes], object], payloads: list[bytes]) -> list[int]:
+    """Run ``handle`` over every payload and return each call's duration in ns."""
+    clock = time.perf_counter_ns
+    samples = []
+    for payload in payloads:
+        start = clock()
+        handle(payload)
+        samples.append(clock() - start)
+    return samples
+
+
+def _report(name: str, mode: str, frames: int, best_ns: float, samples: list[int] | None) -> None:
+    per_frame_ns = best_ns / frames
+    line = f"{name:<12} {mode:<7} {frames:>10} {1e9 / per_frame_ns:>14,.0f} {per_frame_ns:>10.0f}"
+    if samples:
+        cuts = statistics.quantiles(samples, n=100)
+        line += f" {cuts[49]:>8.0f} {cuts[94]:>8.0f} {cuts[98]:>8.0f}"
+    print(line)
+
+
+def _bench_decoder(name: str, device_type: str, payloads: list[bytes], rounds: int) -> None:
+    for mode, decode in (
+        ("base", _baseline_parser(device_type)),
+        ("single", codec.FRAME_DECODERS[device_type]),
+    ):
+        best, samples = float("inf"), []
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            round_samples = _timed(decode, payloads)
+            best = min(best, time.perf_counter_ns() - start)
+            samples.extend(round_samples)
+        _report(name, mode, len(payloads), best, samples)
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        codec.decode_frames(payloads, device_type)
+        best = min(best, time.perf_counter_ns() - start)
+    _report(name, "batch", len(payloads), best, None)
+
+
+def _device_type(name: str, payloads: list[bytes]) -> str:
+    if name in DEVICE_TYPES:
+        return name
+    return next(frame[0] for frame in map(codec.decode_frame, payloads) if frame is not None)
+
+
+async def _bench_coordinator(
+    suites: dict[str, list], rounds: int, listeners: int
+) -> None:
+    from homeassistant.core import HomeAssistant
+
+    gira_ble = load("gira_ble")
+    dispatcher = load("dispatcher").async_get_dispatcher
+    timer_wheel = load("motion").async_get_timer_wheel
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    for name, records in suites.items():
+        payloads = [record.payload for record in records]
+        device_type = _device_type(name, payloads)
+        best, samples = float("inf"), []
+        for _ in range(rounds):
+            # A fresh coordinator per round, so every round starts with an empty cache.
+            coordinator = gira_ble.GiraPassiveBluetoothDataUpdateCoordinator(
+                hass,
+                records[0].address,
+                name,
+                device_type,
+                dispatcher(hass),
+                timer_wheel=timer_wheel(hass),
+            )
+            for _ in range(listeners):
+                coordinator.async_add_listener(lambda: None)
+            start = time.perf_counter_ns()
+            round_samples = _timed(coordinator.async_handle_manufacturer_data, payloads)
+            best = min(best, time.perf_counter_ns() - start)
+            samples.extend(round_samples)
+            if coordinator.motion is not None:
+                coordinator.motion.async_reset()
+        _report(name, "coord", len(payloads), best, samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--capture", help="benchmark a recorded capture file instead")
+    parser.add_argument("--listeners", type=int, default=3, help="entity listeners per coordinator")
+    parser.add_argument("--no-coordinator", action="store_true", help="decoder only (no Home Assistant)")
+    args = parser.parse_args()
+
+    if args.capture:
+        with open(args.capture, "rb") as fp:
+            suites = {"capture": list(capture.iter_capture(fp))}
+    else:
+        suites = {dt: replay.synthetic_capture(dt, args.frames) for dt in DEVICE_TYPES}
+
+    print(
+        f"{'suite':<12} {'mode':<7} {'frames':>10} {'frames/s':>14} {'ns/frame':>10}"
+        f" {'p50 ns':>8} {'p95 ns':>8} {'p99 ns':>8}"
+    )
+    for name, records in suites.items():
+        payloads = [record.payload for record in records]
+        _bench_decoder(name, _device_type(name, payloads), payloads, args.rounds)
+    if args.no_coordinator:
+        return
+    try:
+        import homeassistant.core  # noqa: F401
+    except ImportError:
+        print("Home Assistant cannot be imported: coordinator runs skipped (offline mode).")
+        return
+    asyncio.run(_bench_coordinator(suites, args.rounds, args.listeners))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""End-to-end command latency for a scene of simulated shutters.
+
+Drives real GiraBLEClient instances through the connection scheduler against
+SimulatedAdapter transports (no radio) and reports how long it takes until
+each shutter confirmed its new position by advertisement. Requires Home
+Assistant to be installed (the client runs on its event loop helpers).
+
+    python benchmarks/bench_scene.py [--shutters 100] [--adapters 3] [--slots 3] [--visible 2]
+        [--dead 5] [--rounds 4]
+
+With ``--visible`` > 1 every shutter is seen by several adapters at random
+signal strengths, so the client's adapter routing is exercised; weak paths
+fail more often (see SimulatorProfile.weak_rssi_dbm).
+
+``--dead`` shutters still exist but every connect to them times out; with
+``--rounds`` > 1 the scene is repeated, so their circuit breakers open and
+later rounds fail them fast instead of spending adapter time on them.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+from _loader import load
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.update_coordinator import UpdateFailed
+
+    import simulator
+
+    gira_ble = load("gira_ble")
+    scheduler_mod = load("scheduler")
+    codec = load("codec")
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    scheduler = scheduler_mod.GiraConnectionScheduler(hass, default_slots=args.slots)
+
+    position = args.position
+    confirmed: dict[str, asyncio.Future[float]] = {}
+
+    def on_advertisement(address: str, payload: bytes) -> None:
+        fields = codec.decode_shutter_frame(payload)
+        fut = confirmed.get(address)
+        if fields is not None and fut is not None and not fut.done():
+            if fields["position"] == position:
+                fut.set_result(time.monotonic())
+
+    profile = simulator.SimulatorProfile(travel_s_per_step=args.travel_step)
+    adapters = [
+        simulator.SimulatedAdapter(
+            f"sim{i}", slots=args.slots, profile=profile, seed=args.seed + i,
+            on_advertisement=on_advertisement,
+        )
+        for i in range(args.adapters)
+    ]
+    radio = simulator.SimulatedRadio(adapters)
+    rng = random.Random(args.seed)
+    visible = max(1, min(args.visible, len(adapters)))
+    clients = []
+    for n in range(args.shutters):
+        address = f"E8:2B:E7:00:{n // 256:02X}:{n % 256:02X}"
+        shutter = None
+        for i in range(visible):
+            adapter = adapters[(n + i) % len(adapters)]
+            shutter = adapter.add_shutter(address, rssi=rng.randint(-95, -55), shutter=shutter)
+        shutter.reachable = n >= args.dead
+        clients.append(
+            gira_ble.GiraBLEClient(hass, address, f"shutter {n}", scheduler=scheduler, transport=radio)
+        )
+
+    loop = asyncio.get_running_loop()
+    for round_no in range(1, args.rounds + 1):
+        start = time.monotonic()
+        latencies: list[float] = []
+        failures = 0
+        attempts_before = sum(a.connect_attempts for a in adapters)
+
+        async def move(client) -> None:
+            nonlocal failures
+            confirmed[client.address] = loop.create_future()
+            try:
+                await client.send_set_position_command(codec.shutter_raw_from_position(position))
+                done = await asyncio.wait_for(confirmed[client.address], timeout=60)
+                latencies.append(done - start)
+            except (UpdateFailed, asyncio.TimeoutError):
+                failures += 1
+
+        await asyncio.gather(*(move(c) for c in clients))
+        total = time.monotonic() - start
+        for client in clients:
+            await client.async_release_idle_link()
+
+        attempts = sum(a.connect_attempts for a in adapters) - attempts_before
+        fast = sum(c.stats.fast_failures for c in clients)
+        print(
+            f"round {round_no}: shutters={args.shutters} adapters={args.adapters} slots={args.slots} "
+            f"visible={visible} dead={args.dead}"
+        )
+        print(
+            f"  scene complete: {total:.2f} s, failures: {failures} (fast: {fast}), "
+            f"connect attempts: {attempts}, retries denied: {scheduler.retry_budget.denied}"
+        )
+        if latencies:
+            print(
+                "  confirm latency s: "
+                f"p50={statistics.median(latencies):.2f} "
+                f"p95={_percentile(latencies, 0.95):.2f} "
+                f"p99={_percentile(latencies, 0.99):.2f} "
+                f"max={max(latencies):.2f}"
+            )
+        # Next round moves back, so every shutter has to travel again.
+        position = 0 if round_no % 2 else args.position
+
+    for client in clients:
+        await client.async_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shutters", type=int, default=100)
+    parser.add_argument("--adapters", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--position", type=int, default=30)
+    parser.add_argument("--travel-step", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--visible", type=int, default=1, help="adapters that see each shutter")
+    parser.add_argument("--dead", type=int, default=0, help="shutters that never accept a connection")
+    parser.add_argument("--rounds", type=int, default=1, help="times the scene is repeated")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Conversion lookup table benchmark.
+
+Compares the codec's reference conversion math against the lookup tables the
+decoders index, and reports how long each table takes to build (once per
+process, on the first frame of that kind).
+
+    python benchmarks/bench_tables.py [--calls N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from _loader import load
+
+codec = load("codec")
+
+
+CASES = (
+    ("lux", codec.sensor_brightness_from_raw, codec.sensor_brightness_table.__wrapped__, 0x10000),
+    ("sensor temp", codec.sensor_temperature_from_raw, codec.sensor_temperature_table.__wrapped__, 0x10000),
+    ("thermo temp", codec.thermo_temperature_from_raw, codec.thermo_temperature_table.__wrapped__, 0x10000),
+    ("byte->pct", codec.shutter_position_from_raw, codec.shutter_position_table.__wrapped__, 0x100),
+    ("pct->byte", codec.shutter_raw_from_position, codec.shutter_raw_table.__wrapped__, 101),
+)
+
+
+def _ns_per_call(convert, values: list[int], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for value in values:
+            convert(value)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / len(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'conversion':<12} {'build ms':>9} {'math ns':>8} {'table ns':>9} {'speedup':>8}")
+    for name, math, table, size in CASES:
+        start = time.perf_counter()
+        lookup = table().__getitem__
+        build_ms = (time.perf_counter() - start) * 1000
+        for raw in range(size):
+            assert lookup(raw) == math(raw), (name, raw)
+        values = [rng.randrange(size) for _ in range(args.calls)]
+        math_ns = _ns_per_call(math, values, args.rounds)
+        table_ns = _ns_per_call(lookup, values, args.rounds)
+        print(f"{name:<12} {build_ms:>9.1f} {math_ns:>8.1f} {table_ns:>9.1f} {math_ns / table_ns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
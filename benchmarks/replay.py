@@ -0,0 +1,99 @@
+"""Synthetic captures and replay of Gira advertisement streams.
+
+Offline tooling next to the simulator: captures recorded with the
+``record_capture`` service (file format in the integration's ``capture``
+module) or generated here are replayed into a dispatcher without a radio.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from _loader import load
+
+capture = load("capture")
+codec = load("codec")
+const = load("const")
+
+
+# -----------------------------------------------------------------------------
+# Synthetic captures
+# -----------------------------------------------------------------------------
+def synthetic_capture(
+    device_type: str,
+    count: int,
+    *,
+    address: str = "E8:2B:E7:00:00:01",
+    interval_s: float = 0.1,
+    repeat: int = 4,
+    seed: int = 0,
+) -> list[capture.CaptureRecord]:
+    """Generate a capture for one device type.
+
+    Every state is broadcast ``repeat`` times in a row, like real devices
+    re-broadcast unchanged frames: replayed into a coordinator, all but the
+    first of each run take its duplicate fast-path (no decode).
+    """
+    rng = random.Random(seed)
+    records: list[capture.CaptureRecord] = []
+    payload = b""
+    for i in range(count):
+        if i % repeat == 0:
+            if device_type == "shutter":
+                payload = codec.encode_shutter_frame((i // repeat) % 256)
+            elif device_type == "thermostat":
+                payload = codec.encode_thermostat_frame(rng.randint(1500, 3200), target=bool(i // repeat % 2))
+            elif device_type == "sensor":
+                brightness = bool(i // repeat % 2)
+                raw = rng.randint(0, 0xFFFF) if brightness else rng.randint(0, 4000)
+                payload = codec.encode_sensor_frame(raw, brightness=brightness)
+            else:
+                raise ValueError(f"Unknown device type {device_type}")
+        records.append(
+            capture.CaptureRecord(i * interval_s, address, rng.randint(-95, -45), const.GIRA_MANUFACTURER_ID, payload)
+        )
+    return records
+
+
+# -----------------------------------------------------------------------------
+# Replay
+# -----------------------------------------------------------------------------
+def replay(records: Iterable[capture.CaptureRecord], dispatch: Callable[[str, bytes], Any]) -> int:
+    """Push records into ``dispatch(address, payload)`` as fast as possible.
+
+    ``GiraAdvertisementDispatcher.async_dispatch`` is the usual target.
+    Returns the number of Gira records replayed.
+    """
+    count = 0
+    for record in records:
+        if record.manufacturer_id != const.GIRA_MANUFACTURER_ID:
+            continue
+        dispatch(record.address, record.payload)
+        count += 1
+    return count
+
+
+async def async_replay(
+    records: Iterable[capture.CaptureRecord],
+    dispatch: Callable[[str, bytes], Any],
+    *,
+    speed: float = 1.0,
+) -> int:
+    """Replay records on the event loop keeping their original spacing (scaled by speed)."""
+    count = 0
+    start = time.monotonic()
+    first: float | None = None
+    for record in records:
+        if record.manufacturer_id != const.GIRA_MANUFACTURER_ID:
+            continue
+        if first is None:
+            first = record.timestamp
+        delay = (record.timestamp - first) / speed - (time.monotonic() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        dispatch(record.address, record.payload)
+        count += 1
+    return count
@@ -0,0 +1,420 @@
+"""Simulated Bluetooth adapter for exercising GiraBLEClient without hardware.
+
+``SimulatedAdapter`` implements the ``GiraTransport`` interface. It models
+connect delay, a connection slot limit, write latency, random failures and
+connect timeouts. Simulated shutters broadcast their new position through
+``on_advertisement(address, payload)``, which is usually
+``GiraAdvertisementDispatcher.async_dispatch``.
+
+``SimulatedEsp32Node`` puts an adapter behind the ESP32 MQTT command interface
+(docs/00_overview.md), e.g. on a ``LocalBroker`` (in-memory MQTT).
+
+Test and benchmark tooling only, not part of the integration; it imports the
+integration modules through ``_loader`` and needs bleak installed.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from bleak import BleakError
+
+from _loader import load
+
+codec = load("codec")
+const = load("const")
+transport = load("transport")
+
+_PROPERTY_OFFSET = len(const.SHUTTER_COMMAND_PREFIX)
+_VALUE_OFFSET = _PROPERTY_OFFSET + 3
+
+
+@dataclass
+class SimulatorProfile:
+    """Timing and failure model of a simulated adapter (seconds / probabilities)."""
+
+    connect_delay_s: tuple[float, float] = (0.4, 1.5)
+    write_latency_s: tuple[float, float] = (0.02, 0.08)
+    connect_failure_rate: float = 0.05
+    connect_timeout_rate: float = 0.02
+    connect_timeout_s: float = 5.0
+    write_failure_rate: float = 0.01
+    travel_s_per_step: float = 0.01  # shutter travel time per position byte
+    weak_rssi_dbm: float = -85.0
+    weak_rssi_failure_rate: float = 0.5  # added to connect_failure_rate below weak_rssi_dbm
+
+
+@dataclass
+class SimulatedShutter:
+    """State of one simulated shutter."""
+
+    address: str
+    position_u8: int = 0
+    target_u8: int = 0
+    reachable: bool = True  # False: advertises, but every connect times out
+    _mover: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+
+class SimulatedLink:
+    """An open link to a simulated device (GiraLink)."""
+
+    def __init__(
+        self,
+        adapter: SimulatedAdapter,
+        device: SimulatedShutter,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> None:
+        """Initialize the link."""
+        self._adapter = adapter
+        self._device = device
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[Any, bytearray], Any] | None = None
+        self.is_connected = True
+
+    async def write_gatt_char(self, char_specifier: str, data: bytes, response: bool = True) -> None:
+        """Apply a command after the simulated write latency."""
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        await asyncio.sleep(self._adapter.rng.uniform(*self._adapter.profile.write_latency_s))
+        if self._adapter.rng.random() < self._adapter.profile.write_failure_rate:
+            raise BleakError("Simulated write failure")
+        if char_specifier == const.GIRA_WRITE_CHAR_UUID:
+            self._adapter.apply_command(self._device, bytes(data), self)
+
+    async def start_notify(self, char_specifier: str, callback: Callable[[Any, bytearray], Any]) -> None:
+        """Deliver position frames to the callback while connected."""
+        self._notify = callback
+
+    def notify(self, payload: bytes) -> None:
+        if self.is_connected and self._notify is not None:
+            self._notify(None, bytearray(payload))
+
+    async def disconnect(self) -> bool:
+        """Close the link and free the adapter slot."""
+        if self.is_connected:
+            self.is_connected = False
+            self._adapter.links.discard(self)
+            if self._disconnected_callback is not None:
+                self._disconnected_callback(self)
+        return True
+
+
+class SimulatedAdapter:
+    """A simulated adapter/proxy holding a set of shutters (GiraTransport)."""
+
+    def __init__(
+        self,
+        source: str = "sim0",
+        *,
+        slots: int = 3,
+        profile: SimulatorProfile | None = None,
+        seed: int | None = None,
+        on_advertisement: Callable[[str, bytes], Any] | None = None,
+    ) -> None:
+        """Initialize the adapter."""
+        self.source = source
+        self.slots = slots
+        self.profile = profile or SimulatorProfile()
+        self.rng = random.Random(seed)
+        self.on_advertisement = on_advertisement
+        self.devices: dict[str, SimulatedShutter] = {}
+        self.rssi: dict[str, int] = {}
+        self.links: set[SimulatedLink] = set()
+        self.connect_attempts = 0
+
+    def add_shutter(
+        self,
+        address: str,
+        position_u8: int = 0,
+        *,
+        rssi: int = -60,
+        shutter: SimulatedShutter | None = None,
+    ) -> SimulatedShutter:
+        """Add a shutter that this adapter can see.
+
+        Pass ``shutter`` to make one already added to another adapter visible here too.
+        """
+        address = address.upper()
+        device = self.devices[address] = shutter or SimulatedShutter(address, position_u8, position_u8)
+        self.rssi[address] = rssi
+        return device
+
+    # -------------------------------------------------------------------------
+    # GiraTransport
+    # -------------------------------------------------------------------------
+    def resolve(self, address: str) -> tuple[Any, str] | None:
+        """Return the simulated device and this adapter's source."""
+        device = self.devices.get(address.upper())
+        return (device, self.source) if device else None
+
+    def routes(self, address: str) -> list[transport.Route]:
+        """Return this adapter as the only route, with the device's RSSI."""
+        address = address.upper()
+        device = self.devices.get(address)
+        return [transport.Route(device, self.source, self.rssi[address])] if device else []
+
+    async def connect(
+        self,
+        device: Any,
+        name: str,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 3,
+    ) -> SimulatedLink:
+        """Open a link after the simulated connect delay, retrying like bleak-retry-connector."""
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return await self._connect_once(device, name, disconnected_callback)
+            except (BleakError, asyncio.TimeoutError):
+                if attempt == max_attempts:
+                    raise
+        raise BleakError(f"{self.source}: no connect attempts")
+
+    async def _connect_once(
+        self,
+        device: SimulatedShutter,
+        name: str,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> SimulatedLink:
+        self.connect_attempts += 1
+        if len(self.links) >= self.slots:
+            raise BleakError(f"{self.source}: no free connection slot")
+        if not device.reachable or self.rng.random() < self.profile.connect_timeout_rate:
+            await asyncio.sleep(self.profile.connect_timeout_s)
+            raise asyncio.TimeoutError(f"{self.source}: connect to {name} timed out")
+        await asyncio.sleep(self.rng.uniform(*self.profile.connect_delay_s))
+        failure_rate = self.profile.connect_failure_rate
+        if self.rssi.get(device.address, 0) < self.profile.weak_rssi_dbm:
+            failure_rate += self.profile.weak_rssi_failure_rate
+        if self.rng.random() < failure_rate:
+            raise BleakError(f"{self.source}: simulated connect failure to {name}")
+        link = SimulatedLink(self, device, disconnected_callback)
+        self.links.add(link)
+        return link
+
+    # -------------------------------------------------------------------------
+    # Device behavior
+    # -------------------------------------------------------------------------
+    def stop(self) -> None:
+        """Stop every moving shutter where it is (cancels the movement timers)."""
+        for device in self.devices.values():
+            if device._mover is not None:
+                device._mover.cancel()
+                device._mover = None
+                device.target_u8 = device.position_u8
+
+    def apply_command(self, device: SimulatedShutter, command: bytes, link: SimulatedLink) -> None:
+        """Start moving a shutter and broadcast its position as it changes."""
+        prop = command[_PROPERTY_OFFSET]
+        value = command[_VALUE_OFFSET]
+        if prop == const.SHUTTER_PROPERTY_ID_SET_POSITION:
+            device.target_u8 = value
+        elif prop == const.SHUTTER_PROPERTY_ID_MOVE:
+            device.target_u8 = 0 if value == const.SHUTTER_VALUE_UP else 0xFF
+        elif prop == const.SHUTTER_PROPERTY_ID_STOP:
+            device.target_u8 = device.position_u8
+        self._step(device, link)
+
+    def _step(self, device: SimulatedShutter, link: SimulatedLink) -> None:
+        if device._mover is not None:
+            device._mover.cancel()
+            device._mover = None
+        if device.position_u8 != device.target_u8:
+            device.position_u8 += 1 if device.target_u8 > device.position_u8 else -1
+        payload = codec.encode_shutter_frame(device.position_u8)
+        if self.on_advertisement is not None:
+            self.on_advertisement(device.address, payload)
+        link.notify(payload[len(codec.ADVERTISEMENT_HEADER):])
+        if device.position_u8 != device.target_u8:
+            device._mover = asyncio.get_running_loop().call_later(
+                self.profile.travel_s_per_step, self._step, device, link
+            )
+
+
+class SimulatedRadio:
+    """Several SimulatedAdapters seen as one transport (multi-adapter installs)."""
+
+    def __init__(self, adapters: list[SimulatedAdapter]) -> None:
+        """Initialize the radio."""
+        self.adapters = adapters
+
+    def routes(self, address: str) -> list[transport.Route]:
+        """Return a route through every adapter that sees the device."""
+        return [
+            route._replace(device=(adapter, route.device))
+            for adapter in self.adapters
+            for route in adapter.routes(address)
+        ]
+
+    def resolve(self, address: str) -> tuple[Any, str] | None:
+        """Return the route with the strongest signal."""
+        routes = self.routes(address)
+        if not routes:
+            return None
+        best = max(routes, key=lambda route: route.rssi)
+        return best.device, best.source
+
+    async def connect(
+        self,
+        device: Any,
+        name: str,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 3,
+    ) -> SimulatedLink:
+        """Connect through the adapter the route belongs to."""
+        adapter, shutter = device
+        return await adapter.connect(
+            shutter, name, disconnected_callback=disconnected_callback, max_attempts=max_attempts
+        )
+
+
+def _topic_matches(topic_filter: str, topic: str) -> bool:
+    """MQTT topic filter matching with ``+`` and ``#`` wildcards."""
+    filter_parts = topic_filter.split("/")
+    topic_parts = topic.split("/")
+    for i, part in enumerate(filter_parts):
+        if part == "#":
+            return True
+        if i >= len(topic_parts) or (part != "+" and part != topic_parts[i]):
+            return False
+    return len(filter_parts) == len(topic_parts)
+
+
+class LocalBroker:
+    """In-memory MQTT broker stand-in (publish/subscribe for GiraMqttBridge and nodes)."""
+
+    def __init__(self) -> None:
+        """Initialize the broker."""
+        self._subscriptions: list[tuple[str, Callable[[str, str], None]]] = []
+        self.published: list[tuple[str, str]] = []
+
+    async def publish(self, topic: str, payload: str) -> None:
+        """Deliver a message to every matching subscription."""
+        self.published.append((topic, payload))
+        for topic_filter, callback in list(self._subscriptions):
+            if _topic_matches(topic_filter, topic):
+                callback(topic, payload)
+
+    async def subscribe(self, topic_filter: str, callback: Callable[[str, str], None]) -> Callable[[], None]:
+        """Subscribe to a topic filter; returns the unsubscribe callable."""
+        entry = (topic_filter, callback)
+        self._subscriptions.append(entry)
+
+        def _unsubscribe() -> None:
+            if entry in self._subscriptions:
+                self._subscriptions.remove(entry)
+
+        return _unsubscribe
+
+
+class SimulatedEsp32Node:
+    """An ESP32 proxy node driving a SimulatedAdapter over MQTT.
+
+    Accepts the ``connect``/``pair``/``subscribe``/``shutter``/``disconnect``
+    command strings, publishes JSON on ``/status`` and shutter positions on
+    ``/event``. Takes over the adapter's ``on_advertisement``.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[str, str], Any],
+        subscribe: Callable[[str, Callable[[str, str], None]], Any],
+        node_id: str,
+        adapter: SimulatedAdapter,
+        *,
+        base_topic: str = const.MQTT_BASE_TOPIC,
+    ) -> None:
+        """Initialize the node."""
+        self._publish = publish
+        self._subscribe = subscribe
+        self.node_id = node_id
+        self.adapter = adapter
+        self._topic = f"{base_topic}/{node_id}"
+        self._link: SimulatedLink | None = None
+        self._peer: str | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.commands: list[str] = []
+        adapter.on_advertisement = self._on_advertisement
+
+    async def async_start(self) -> None:
+        """Subscribe to the command topic."""
+        await self._subscribe(f"{self._topic}/cmd", self._on_command)
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_command(self, topic: str, payload: str) -> None:
+        self.commands.append(payload)
+        self._spawn(self._async_run(payload))
+
+    async def _async_status(self, state: str, **fields: Any) -> None:
+        status = {
+            "state": state,
+            "connected": self._link is not None and self._link.is_connected,
+            "encrypted": False,
+            "peer": self._peer,
+            **fields,
+        }
+        await self._publish(f"{self._topic}/status", json.dumps(status))
+
+    async def _async_run(self, payload: str) -> None:
+        verb, *args = payload.split()
+        params = dict(arg.split("=", 1) for arg in args if "=" in arg)
+        try:
+            if verb == "connect":
+                await self._async_connect(params["addr"])
+            elif verb == "pair":
+                await self._async_status("ENCRYPTED", encrypted=True)
+            elif verb == "subscribe":
+                await self._async_status("READY", encrypted=True)
+            elif verb == "shutter":
+                await self._async_shutter(params)
+            elif verb == "disconnect":
+                if self._link is not None:
+                    await self._link.disconnect()
+        except (BleakError, asyncio.TimeoutError) as err:
+            await self._async_status("IDLE", error=str(err))
+
+    async def _async_connect(self, address: str) -> None:
+        if self._link is not None and self._link.is_connected:
+            raise BleakError(f"busy with {self._peer}")
+        self._peer = address.upper()
+        resolved = self.adapter.resolve(address)
+        if resolved is None:
+            raise BleakError(f"{address} not found")
+        await self._async_status("CONNECTING")
+        self._link = await self.adapter.connect(
+            resolved[0], address, disconnected_callback=self._on_disconnected
+        )
+        await self._async_status("CONNECTED")
+
+    async def _async_shutter(self, params: dict[str, str]) -> None:
+        if self._link is None or not self._link.is_connected:
+            raise BleakError("not connected")
+        if "set_pos" in params:
+            command = codec.generate_command(
+                const.SHUTTER_PROPERTY_ID_SET_POSITION, codec.lookup_shutter_raw(int(params["set_pos"]))
+            )
+        elif "move" in params:
+            value = const.SHUTTER_VALUE_UP if params["move"] == "up" else const.SHUTTER_VALUE_DOWN
+            command = codec.generate_command(const.SHUTTER_PROPERTY_ID_MOVE, value)
+        else:
+            command = codec.generate_command(const.SHUTTER_PROPERTY_ID_STOP, const.SHUTTER_VALUE_STOP)
+        await self._link.write_gatt_char(const.GIRA_WRITE_CHAR_UUID, command)
+
+    def _on_disconnected(self, link: Any) -> None:
+        self._link = None
+        self._spawn(self._async_status("IDLE", peer=self._peer))
+
+    def _on_advertisement(self, address: str, payload: bytes) -> None:
+        fields = codec.decode_shutter_frame(payload)
+        if fields is None:
+            return
+        event = {"type": "shutter", "peer": address, "position": fields["position"]}
+        self._spawn(self._publish(f"{self._topic}/event", json.dumps(event)))
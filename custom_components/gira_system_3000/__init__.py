@@ -3,21 +3,55 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, LOGGER
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_COMMAND_COALESCE_MS,
+    DEFAULT_COMMAND_COALESCE_MS,
+    CONF_RELEASE_IDLE_UNDER_PRESSURE,
+    DEFAULT_RELEASE_IDLE_UNDER_PRESSURE,
+    CONF_MQTT_NODES,
+    DEFAULT_MQTT_NODES,
+    CONF_LEARNED_PREWARM,
+    DEFAULT_LEARNED_PREWARM,
+    CONF_CONFIRM_COMMANDS,
+    DEFAULT_CONFIRM_COMMANDS,
+)
+from .dispatcher import async_get_dispatcher
+from .motion import async_get_timer_wheel
+from .scheduler import async_get_scheduler
 from .gira_ble import GiraBLEClient, GiraPassiveBluetoothDataUpdateCoordinator
+from .mqtt_transport import MqttTransport, async_get_mqtt_transport, parse_node_ids
+from .prewarm import async_track_learned_prewarm
+from .services import async_setup_services
+from .state_store import async_get_state_store
+from .stats import DeviceStats
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 def _platforms_for_device_type(device_type: str) -> list[str]:
-    """Map device_type to HA platforms."""
+    """Map device_type to HA platforms.
+
+    Every device type also gets the sensor platform for its diagnostic sensors.
+    """
     if device_type == "shutter":
-        return ["cover"]
+        return ["cover", "sensor"]
     if device_type == "thermostat":
-        return ["climate"]
+        return ["climate", "sensor"]
     if device_type == "sensor":
         return ["sensor"]
     # Safe default
-    return ["cover"]
+    return ["cover", "sensor"]
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration-wide services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -29,21 +63,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     device_type: str = entry.data.get("device_type", "shutter")
     platforms = _platforms_for_device_type(device_type)
 
-    # Coordinator (passive broadcasts)
+    # Performance counters shared by coordinator and client (diagnostics)
+    stats = DeviceStats()
+
+    # Last known state and learned pre-warm slots, shared by all devices
+    state_store = await async_get_state_store(hass)
+
+    # Coordinator (passive broadcasts), starting from the last known state
     coordinator = GiraPassiveBluetoothDataUpdateCoordinator(
         hass,
         address=address,
         name=name,
         device_type=device_type,
+        dispatcher=async_get_dispatcher(hass),
+        stats=stats,
+        timer_wheel=async_get_timer_wheel(hass),
+        state_store=state_store,
     )
 
+    # Optional ESP32/MQTT proxies instead of direct Bluetooth connections
+    transport: MqttTransport | None = None
+    node_ids = parse_node_ids(entry.options.get(CONF_MQTT_NODES, DEFAULT_MQTT_NODES))
+    if node_ids and device_type != "sensor":
+        transport = await async_get_mqtt_transport(hass, node_ids)
+
     # Client (active command sender)
-    client = GiraBLEClient(hass, address, name)
+    client = GiraBLEClient(
+        hass,
+        address,
+        name,
+        scheduler=async_get_scheduler(hass),
+        coalesce_window_s=entry.options.get(
+            CONF_COMMAND_COALESCE_MS, DEFAULT_COMMAND_COALESCE_MS
+        ) / 1000.0,
+        release_idle_under_pressure=entry.options.get(
+            CONF_RELEASE_IDLE_UNDER_PRESSURE, DEFAULT_RELEASE_IDLE_UNDER_PRESSURE
+        ),
+        # Sensors are broadcast-only; never subscribe for them.
+        on_notification=(
+            coordinator.async_handle_notification if device_type != "sensor" else None
+        ),
+        transport=transport,
+        stats=stats,
+        state_store=state_store,
+    )
+
+    # Advertisements let the breaker of an unreachable device probe it again.
+    if device_type != "sensor":
+        coordinator.async_set_seen_listener(client.async_device_seen)
+        # Route ranking follows the signal of every advertisement, not only
+        # the one seen at connect time (ESP32 node routes keep the latter).
+        if transport is None:
+            coordinator.async_set_rssi_listener(client.router.observe_rssi)
+
+    # Optionally confirm commands by the reported state instead of write responses.
+    if device_type != "sensor" and entry.options.get(CONF_CONFIRM_COMMANDS, DEFAULT_CONFIRM_COMMANDS):
+        client.async_set_state_confirmation(coordinator.async_expect_state)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "client": client,
         "device_type": device_type,
+        "stats": stats,
+        "mqtt_transport": transport,
     }
 
     # Forward only the platform(s) for this device type.
@@ -51,11 +133,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Start listening only after entities are set up and subscribed.
     entry.async_on_unload(coordinator.async_start())
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Optionally open the link ahead of the time slots in which commands usually come.
+    if device_type != "sensor" and entry.options.get(CONF_LEARNED_PREWARM, DEFAULT_LEARNED_PREWARM):
+        entry.async_on_unload(async_track_learned_prewarm(hass, client))
 
     LOGGER.debug("Setup complete: %s (%s) type=%s platforms=%s", name, address, device_type, platforms)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
@@ -74,5 +166,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except Exception:
             LOGGER.debug("BLE client close raised (ignored)", exc_info=True)
 
+    transport = data.get("mqtt_transport")
+    if transport is not None:
+        await transport.async_close()
+
     hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the persisted state of a removed device."""
+    store = await async_get_state_store(hass)
+    store.async_remove(entry.data["address"])
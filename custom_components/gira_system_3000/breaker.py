@@ -0,0 +1,132 @@
+"""Failure containment for unreachable devices.
+
+``CircuitBreaker`` (one per device) stops connect attempts after repeated
+failures and only lets a background probe through once the device advertises
+again. ``RetryBudget`` (one per Home Assistant instance, owned by the
+connection scheduler) caps connect retries across all devices, so one dead
+device cannot hold adapter slots that a scene needs.
+"""
+from __future__ import annotations
+
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_INTERVAL_S,
+    RETRY_BUDGET_MAX_TOKENS,
+    RETRY_BUDGET_MIN_PER_S,
+    RETRY_BUDGET_RATIO,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed: commands connect normally. Open: fail fast. Half-open: probing."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        probe_interval_s: float = BREAKER_PROBE_INTERVAL_S,
+    ) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.probe_interval_s = probe_interval_s
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self._last_probe: float | None = None
+
+    def allow(self) -> bool:
+        """Return True if a command may try to connect."""
+        return self.state == STATE_CLOSED
+
+    def record_success(self) -> None:
+        """A link was opened: close the breaker."""
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """A command (or probe) could not reach the device."""
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state == STATE_CLOSED:
+                self.opened += 1
+            self.state = STATE_OPEN
+            self._last_probe = time.monotonic()
+
+    def try_probe(self) -> bool:
+        """Switch an open breaker to half-open if a probe is due.
+
+        Called for every advertisement of the device; at most one probe per
+        ``probe_interval_s``.
+        """
+        if self.state != STATE_OPEN:
+            return False
+        now = time.monotonic()
+        if self._last_probe is not None and now - self._last_probe < self.probe_interval_s:
+            return False
+        self._last_probe = now
+        self.state = STATE_HALF_OPEN
+        return True
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+        }
+
+
+class RetryBudget:
+    """Token bucket for connect retries shared by all devices.
+
+    Every first attempt deposits ``ratio`` tokens and the bucket also refills
+    at ``min_per_s``; every retry (another attempt or a fallback adapter)
+    withdraws one token. When the bucket is empty, commands get a single
+    attempt.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        min_per_s: float = RETRY_BUDGET_MIN_PER_S,
+        max_tokens: float = RETRY_BUDGET_MAX_TOKENS,
+    ) -> None:
+        """Initialize the budget (full)."""
+        self.ratio = ratio
+        self.min_per_s = min_per_s
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self.denied = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_s)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Return the retries currently available."""
+        self._refill()
+        return self._tokens
+
+    def record_attempt(self) -> None:
+        """Deposit for a first attempt."""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self, wanted: int) -> int:
+        """Take up to ``wanted`` retries; returns how many were granted."""
+        self._refill()
+        granted = max(0, min(wanted, int(self._tokens)))
+        self._tokens -= granted
+        if granted < wanted:
+            self.denied += wanted - granted
+        return granted
@@ -0,0 +1,75 @@
+"""Capture files of Gira advertisement streams.
+
+Written by the ``record_capture`` service; read by the offline tools in
+``benchmarks/`` (replay, synthetic captures, parser benchmarks).
+
+Capture file layout (little-endian)::
+
+    b"GIRACAP1"
+    repeated: f64 timestamp | 6s address | i8 rssi | u16 manufacturer id | u8 length | payload
+
+Only depends on the standard library, so the tools can read captures without
+Home Assistant.
+"""
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, NamedTuple
+
+CAPTURE_MAGIC = b"GIRACAP1"
+_RECORD = struct.Struct("<d6sbHB")
+
+
+class CaptureRecord(NamedTuple):
+    """One captured advertisement."""
+
+    timestamp: float
+    address: str
+    rssi: int
+    manufacturer_id: int
+    payload: bytes
+
+
+def _pack_address(address: str) -> bytes:
+    return bytes.fromhex(address.replace(":", ""))
+
+
+def _unpack_address(raw: bytes) -> str:
+    return ":".join(f"{b:02X}" for b in raw)
+
+
+# -----------------------------------------------------------------------------
+# File I/O
+# -----------------------------------------------------------------------------
+def write_capture(fp: BinaryIO, records: Iterable[CaptureRecord]) -> int:
+    """Write records to a binary file object; returns the number written."""
+    fp.write(CAPTURE_MAGIC)
+    count = 0
+    for record in records:
+        fp.write(
+            _RECORD.pack(
+                record.timestamp,
+                _pack_address(record.address),
+                record.rssi,
+                record.manufacturer_id,
+                len(record.payload),
+            )
+        )
+        fp.write(record.payload)
+        count += 1
+    return count
+
+
+def iter_capture(fp: BinaryIO) -> Iterator[CaptureRecord]:
+    """Yield the records of a capture file object."""
+    if fp.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+        raise ValueError("Not a Gira capture file")
+    while header := fp.read(_RECORD.size):
+        if len(header) != _RECORD.size:
+            raise ValueError("Truncated capture record")
+        timestamp, address, rssi, manufacturer_id, length = _RECORD.unpack(header)
+        payload = fp.read(length)
+        if len(payload) != length:
+            raise ValueError("Truncated capture payload")
+        yield CaptureRecord(timestamp, _unpack_address(address), rssi, manufacturer_id, payload)
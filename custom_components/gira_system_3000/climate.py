@@ -6,6 +6,7 @@ from typing import Any
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
+    ATTR_HVAC_MODE,
     ClimateEntityFeature,
     HVACMode,
     HVACAction,
@@ -14,7 +15,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, UpdateFailed
 
 from .const import DOMAIN, LOGGER
 from .gira_ble import GiraBLEClient, GiraPassiveBluetoothDataUpdateCoordinator
@@ -129,27 +130,40 @@ class GiraThermostat(CoordinatorEntity[GiraPassiveBluetoothDataUpdateCoordinator
 
         LOGGER.debug("Thermostat setpoint request: %.2f°C (%s)", temp_c, self._attr_name)
 
+        hvac_mode = kwargs.get(ATTR_HVAC_MODE)
+        if hvac_mode in (HVACMode.HEAT, HVACMode.OFF):
+            # Mode and setpoint in one link-up (heating timer first).
+            self._attr_hvac_mode = hvac_mode
+            self.coordinator.async_set_field("target_temperature", temp_c)
+            result = await self._client.send_thermostat_heat_and_target(
+                hvac_mode == HVACMode.HEAT, temp_c
+            )
+            if not result.complete:
+                LOGGER.warning(
+                    "Thermostat %s: %d of %d commands sent (%s)",
+                    self._attr_name,
+                    result.sent,
+                    result.total,
+                    result.error,
+                )
+                if result.error is not None:
+                    raise UpdateFailed(result.error)
+            return
+
         current_target = self.target_temperature
-        if current_target is not None:
-            delta = round(temp_c - float(current_target), 2)
-            if delta == 0.5:
-                data = dict(self.coordinator.data or {})
-                data["target_temperature"] = temp_c
-                self.coordinator.data = data
-                self.coordinator.async_update_listeners()
-                await self._client.send_thermostat_step(up=True)
-                return
-            if delta == -0.5:
-                data = dict(self.coordinator.data or {})
-                data["target_temperature"] = temp_c
-                self.coordinator.data = data
-                self.coordinator.async_update_listeners()
-                await self._client.send_thermostat_step(up=False)
-                return
-
-        data = dict(self.coordinator.data or {})
-        data["target_temperature"] = temp_c
-        self.coordinator.data = data
-        self.coordinator.async_update_listeners()
+        reported = self.coordinator.reported.get("target_temperature")
+        self.coordinator.async_set_field("target_temperature", temp_c)
+
+        # ±0.5 °C as a one-byte step, where the transport has that command. A
+        # step is relative, so only from a target the device reported itself
+        # and nothing newer was requested since.
+        if (
+            self._client.supports_thermostat_step
+            and reported is not None
+            and reported == current_target
+            and abs(round(temp_c - reported, 2)) == 0.5
+        ):
+            await self._client.send_thermostat_step(up=temp_c > reported, temp_c=temp_c)
+            return
 
         await self._client.send_thermostat_set_target_temperature(temp_c)
@@ -0,0 +1,410 @@
+"""Protocol codec for Gira System 3000 BT devices.
+
+Encodes GATT commands and decodes advertisement/notification frames for shutters,
+thermostats and sensors, with one decoder per device type (``FRAME_DECODERS``).
+
+This module only depends on the standard library and ``.const`` (no Home
+Assistant or bleak import), so offline tools can use it directly; see
+``benchmarks/_loader.py`` for importing it without the integration package.
+"""
+from __future__ import annotations
+
+import functools
+import struct
+from array import array
+from collections.abc import Iterable
+from typing import Callable, NamedTuple
+
+from .const import (
+    SHUTTER_COMMAND_PREFIX,
+    SHUTTER_COMMAND_SUFFIX,
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+    SHUTTER_POS_PREFIX,
+    THERMO_COMMAND_PREFIX,
+    THERMO_COMMAND_SUFFIX,
+    THERMO_PROPERTY_ID_TARGET_TEMP,
+    THERMO_CURRENT_TEMP_PREFIX,
+    THERMO_TARGET_TEMP_PREFIX,
+    SENSOR_FRAME_LENGTH,
+    SENSOR_SUFFIX_0,
+    SENSOR_SUFFIX_1,
+    SENSOR_CMD_TEMPERATURE,
+    SENSOR_CMD_BRIGHTNESS,
+    SENSOR_TEMPERATURE_PREFIX,
+    SENSOR_TEMP_NEG_BASE,
+    SENSOR_TEMP_DIVISOR,
+    SENSOR_TEMP_NEG_BASE_DIVISOR,
+    SENSOR_LUX_A,
+    SENSOR_LUX_B,
+)
+
+# Manufacturer data layout: 4 header bytes, 7-byte frame prefix, big-endian value.
+# The header starts with 0x76 (see manufacturer_data_start in manifest.json).
+ADVERTISEMENT_HEADER = bytes((0x76, 0x00, 0x00, 0x00))
+FRAME_PREFIX_OFFSET = len(ADVERTISEMENT_HEADER)
+FRAME_PREFIX_LENGTH = 7
+FRAME_VALUE_OFFSET = FRAME_PREFIX_OFFSET + FRAME_PREFIX_LENGTH
+
+_U16 = struct.Struct(">H")
+
+
+# -----------------------------------------------------------------------------
+# Value conversions
+# -----------------------------------------------------------------------------
+def shutter_position_from_raw(raw: int) -> int:
+    """Convert the broadcast position byte (0x00..0xFF) to HA percent (inverted)."""
+    return round(100 * (255 - raw) / 255)
+
+
+def shutter_raw_from_position(percent: int) -> int:
+    """Convert HA percent (0..100) to the position byte sent to the device (inverted)."""
+    percent = min(max(int(percent), 0), 100)
+    return 255 - round(percent * 255 / 100)
+
+
+def thermo_temperature_from_raw(raw: int) -> float:
+    """Decode Gira thermostat temperature from u16.
+
+    Read rules (per your reverse engineering):
+    - temp <= 21.0°C : raw / 100
+    - temp > 21.0°C  : raw / 100 - 10
+    """
+    temp = raw / 100.0
+    if raw > 2100:  # 21.0°C threshold
+        temp -= 10.0
+    return temp
+
+
+def sensor_temperature_from_raw(raw: int) -> float:
+    """Signed sensor temperature conversion (ESPHome-equivalent)."""
+    if raw > SENSOR_TEMP_NEG_BASE:
+        return (SENSOR_TEMP_NEG_BASE - raw) / SENSOR_TEMP_NEG_BASE_DIVISOR / SENSOR_TEMP_DIVISOR
+    return raw / SENSOR_TEMP_DIVISOR
+
+
+def sensor_brightness_from_raw(raw: int) -> float:
+    """Log lux conversion."""
+    return 10 ** (SENSOR_LUX_A * float(raw) + SENSOR_LUX_B)
+
+
+# -----------------------------------------------------------------------------
+# Lookup tables
+# -----------------------------------------------------------------------------
+# Every decoded conversion is a table lookup: in benchmarks/bench_tables.py
+# indexing beats the math for each of them, from about 1.2x for the temperature
+# conversions to several times for the percent maps. The tables are built on first use
+# (the first frame of that kind decoded, or the first entity lookup) and shared
+# by the decoders and the entities; the functions above remain the reference
+# they are built from.
+@functools.cache
+def sensor_brightness_table() -> array[float]:
+    """Lux for every raw u16 brightness value."""
+    return array("d", map(sensor_brightness_from_raw, range(0x10000)))
+
+
+@functools.cache
+def sensor_temperature_table() -> array[float]:
+    """Sensor °C for every raw u16 temperature value."""
+    return array("d", map(sensor_temperature_from_raw, range(0x10000)))
+
+
+@functools.cache
+def thermo_temperature_table() -> array[float]:
+    """Thermostat °C for every raw u16 broadcast temperature."""
+    return array("d", map(thermo_temperature_from_raw, range(0x10000)))
+
+
+@functools.cache
+def shutter_position_table() -> tuple[int, ...]:
+    """HA percent for every position byte."""
+    return tuple(map(shutter_position_from_raw, range(0x100)))
+
+
+@functools.cache
+def shutter_raw_table() -> tuple[int, ...]:
+    """Position byte for every HA percent 0..100."""
+    return tuple(map(shutter_raw_from_position, range(101)))
+
+
+def lookup_shutter_raw(percent: int) -> int:
+    """Table-backed ``shutter_raw_from_position``."""
+    return shutter_raw_table()[min(max(int(percent), 0), 100)]
+
+
+# -----------------------------------------------------------------------------
+# Frame decoding
+# -----------------------------------------------------------------------------
+# One decoder per device type, with the acceptance rules of the original parser:
+# shutter and thermostat prefixes may sit anywhere in the payload (and one
+# thermostat payload may carry both temperatures); sensor frames are exactly
+# SENSOR_FRAME_LENGTH bytes with the command byte and 0x10 0x01 at bytes 8..10.
+# A decoder returns the decoded fields (merged into the coordinator data) or None.
+_SHUTTER_POS_PREFIX = bytes(SHUTTER_POS_PREFIX)
+_THERMO_CURRENT_PREFIX = bytes(THERMO_CURRENT_TEMP_PREFIX)
+_THERMO_TARGET_PREFIX = bytes(THERMO_TARGET_TEMP_PREFIX)
+_SENSOR_CMD_OFFSET = FRAME_PREFIX_OFFSET + 4
+_SENSOR_PREFIX_HEAD = bytes(SENSOR_TEMPERATURE_PREFIX[:4])
+_SENSOR_PREFIX_TAIL = bytes((SENSOR_SUFFIX_0, SENSOR_SUFFIX_1))
+
+def decode_shutter_frame(data: bytes) -> dict[str, int] | None:
+    """Decode the position of a shutter payload."""
+    idx = data.find(_SHUTTER_POS_PREFIX) + FRAME_PREFIX_LENGTH
+    if idx < FRAME_PREFIX_LENGTH or idx >= len(data):
+        return None
+    return {"position": shutter_position_table()[data[idx]]}
+
+
+def decode_thermostat_frame(data: bytes) -> dict[str, float] | None:
+    """Decode the current and/or target temperature of a thermostat payload."""
+    fields: dict[str, float] = {}
+    last = len(data) - 2
+    idx = data.find(_THERMO_CURRENT_PREFIX) + FRAME_PREFIX_LENGTH
+    if FRAME_PREFIX_LENGTH <= idx <= last:
+        fields["current_temperature"] = thermo_temperature_table()[data[idx] << 8 | data[idx + 1]]
+    idx = data.find(_THERMO_TARGET_PREFIX) + FRAME_PREFIX_LENGTH
+    if FRAME_PREFIX_LENGTH <= idx <= last:
+        fields["target_temperature"] = thermo_temperature_table()[data[idx] << 8 | data[idx + 1]]
+    return fields or None
+
+
+def decode_sensor_frame(data: bytes) -> dict[str, float] | None:
+    """Decode the temperature or brightness of a 13-byte sensor payload."""
+    if (
+        len(data) != SENSOR_FRAME_LENGTH
+        or data[_SENSOR_CMD_OFFSET + 1] != SENSOR_SUFFIX_0
+        or data[_SENSOR_CMD_OFFSET + 2] != SENSOR_SUFFIX_1
+    ):
+        return None
+    cmd = data[_SENSOR_CMD_OFFSET]
+    raw = data[FRAME_VALUE_OFFSET] << 8 | data[FRAME_VALUE_OFFSET + 1]
+    if cmd == SENSOR_CMD_TEMPERATURE:
+        return {"sensor_temperature": sensor_temperature_table()[raw]}
+    if cmd == SENSOR_CMD_BRIGHTNESS:
+        return {"sensor_brightness": sensor_brightness_table()[raw]}
+    return None
+
+
+FRAME_DECODERS: dict[str, Callable[[bytes], dict[str, float | int] | None]] = {
+    "shutter": decode_shutter_frame,
+    "thermostat": decode_thermostat_frame,
+    "sensor": decode_sensor_frame,
+}
+
+
+def decode_frame(data: bytes) -> tuple[str, dict[str, float | int]] | None:
+    """Decode a payload of unknown origin into ``(device_type, fields)``, or None.
+
+    Coordinators know their device type and call its decoder from
+    ``FRAME_DECODERS`` directly; this is for offline tools.
+    """
+    for device_type, decode in FRAME_DECODERS.items():
+        fields = decode(data)
+        if fields is not None:
+            return device_type, fields
+    return None
+
+
+def decode_notification(data: bytes, device_type: str) -> dict[str, float | int] | None:
+    """Decode a GATT notification from GIRA_READ_CHAR_UUID.
+
+    Notifications carry the frame without the advertisement header. The prefix
+    search finds shutter and thermostat frames either way; the fixed-offset
+    sensor layout needs the header put back.
+    """
+    if device_type == "sensor" and len(data) == SENSOR_FRAME_LENGTH - FRAME_PREFIX_OFFSET:
+        data = ADVERTISEMENT_HEADER + bytes(data)
+    return FRAME_DECODERS[device_type](data)
+
+
+def decode_frames(
+    payloads: Iterable[bytes], device_type: str | None = None
+) -> list[tuple[str, dict[str, float | int]] | dict[str, float | int] | None]:
+    """Decode many payloads.
+
+    With ``device_type`` the payloads come from one kind of device: its decoder
+    is looked up once and mapped over them, and the result holds the fields
+    only. Without it each payload is of unknown origin (see ``decode_frame``).
+    """
+    if device_type is None:
+        return list(map(decode_frame, payloads))
+    return list(map(FRAME_DECODERS[device_type], payloads))
+
+
+def decode_notifications(payloads: Iterable[bytes], device_type: str) -> list[dict[str, float | int] | None]:
+    """Decode many GATT notifications of one device type."""
+    return [decode_notification(data, device_type) for data in payloads]
+
+
+class FrameType(NamedTuple):
+    """A frame in the layout every device broadcasts: ``prefix`` at ``offset``,
+    then a big-endian value at ``FRAME_VALUE_OFFSET``."""
+
+    prefix: bytes
+    offset: int
+    device_type: str
+    field: str
+    width: int                               # value bytes
+    convert: Callable[[int], float | int]    # raw value -> state value
+
+
+def frame_types() -> tuple[FrameType, ...]:
+    """Return every frame type the decoders know (e.g. for offline decoders).
+
+    Offline decoders matching these only see the broadcast layout; the
+    decoders above also find shutter and thermostat prefixes at other offsets.
+    The order is the order ``decode_frame`` tries them in: a thermostat frame
+    also passes the sensor checks, so the first match wins.
+    """
+    sensor_temperature = bytes((SENSOR_CMD_TEMPERATURE,)) + _SENSOR_PREFIX_TAIL
+    sensor_brightness = bytes((SENSOR_CMD_BRIGHTNESS,)) + _SENSOR_PREFIX_TAIL
+    return (
+        FrameType(_SHUTTER_POS_PREFIX, FRAME_PREFIX_OFFSET, "shutter", "position", 1, shutter_position_from_raw),
+        FrameType(
+            _THERMO_CURRENT_PREFIX, FRAME_PREFIX_OFFSET, "thermostat", "current_temperature", 2,
+            thermo_temperature_from_raw,
+        ),
+        FrameType(
+            _THERMO_TARGET_PREFIX, FRAME_PREFIX_OFFSET, "thermostat", "target_temperature", 2,
+            thermo_temperature_from_raw,
+        ),
+        FrameType(
+            sensor_temperature, _SENSOR_CMD_OFFSET, "sensor", "sensor_temperature", 2,
+            sensor_temperature_from_raw,
+        ),
+        FrameType(
+            sensor_brightness, _SENSOR_CMD_OFFSET, "sensor", "sensor_brightness", 2,
+            sensor_brightness_from_raw,
+        ),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Command encoding (GATT writes to GIRA_WRITE_CHAR_UUID)
+# -----------------------------------------------------------------------------
+def generate_command(property_id: int, value: int) -> bytearray:
+    """Generates the full shutter command byte array from its parts."""
+    return (
+        SHUTTER_COMMAND_PREFIX
+        + property_id.to_bytes(1, 'big')
+        + SHUTTER_COMMAND_SUFFIX
+        + value.to_bytes(1, 'big')
+    )
+
+
+def generate_position_command(percentage: int) -> bytearray:
+    """Generates the command for setting absolute blinds position."""
+    if not 0 <= percentage <= 100:
+        raise ValueError("Percentage must be between 0 and 100.")
+    return generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, percentage)
+
+
+def generate_thermo_u8_command(property_id: int, value_u8: int) -> bytearray:
+    """Generate thermostat command with a single u8 value."""
+    v = int(value_u8) & 0xFF
+    return (
+        THERMO_COMMAND_PREFIX
+        + property_id.to_bytes(1, "big")
+        + THERMO_COMMAND_SUFFIX
+        + v.to_bytes(1, "big")
+    )
+
+
+def generate_thermo_u16_command(property_id: int, value_u16: int) -> bytearray:
+    """Generate thermostat command with a uint16 value (big-endian)."""
+    v = int(value_u16)
+    if v < 0:
+        v = 0
+    if v > 0xFFFF:
+        v = 0xFFFF
+    return (
+        THERMO_COMMAND_PREFIX
+        + property_id.to_bytes(1, "big")
+        + THERMO_COMMAND_SUFFIX
+        + v.to_bytes(2, "big", signed=False)
+    )
+
+
+def thermo_raw_from_temperature(temp_c: float) -> int:
+    """Device-specific WRITE encoding: raw_u16 = round((21 + temp_c) * 50 + 1000)."""
+    raw = int(round((21.0 + float(temp_c)) * 50.0 + 1000.0))
+    return min(max(raw, 0), 0xFFFF)
+
+
+def generate_thermo_target_temperature_command(temp_c: float) -> bytearray:
+    """Generate the set-target-temperature command (property 0xF5)."""
+    return generate_thermo_u16_command(
+        THERMO_PROPERTY_ID_TARGET_TEMP, thermo_raw_from_temperature(temp_c)
+    )
+
+
+def generate_commands(commands: Iterable[tuple[int, int]]) -> list[bytearray]:
+    """Generate many shutter commands from (property_id, value) pairs."""
+    return [generate_command(property_id, value) for property_id, value in commands]
+
+
+def thermo_temperature_from_command_raw(raw: int) -> float:
+    """Inverse of ``thermo_raw_from_temperature`` (setpoint written to the device)."""
+    return round((raw - 1000.0) / 50.0 - 21.0, 2)
+
+
+class DecodedCommand(NamedTuple):
+    """A GATT command split into its parts."""
+
+    device_type: str
+    property_id: int
+    value: int
+
+
+_COMMAND_HEAD = len(SHUTTER_COMMAND_PREFIX)
+_COMMAND_VALUE_OFFSET = _COMMAND_HEAD + 1 + len(SHUTTER_COMMAND_SUFFIX)
+_COMMAND_TYPES = {
+    bytes(SHUTTER_COMMAND_PREFIX): ("shutter", bytes(SHUTTER_COMMAND_SUFFIX)),
+    bytes(THERMO_COMMAND_PREFIX): ("thermostat", bytes(THERMO_COMMAND_SUFFIX)),
+}
+
+
+def decode_command(data: bytes) -> DecodedCommand | None:
+    """Split a command built by the generate_* functions (u8 or u16 value)."""
+    kind = _COMMAND_TYPES.get(bytes(data[:_COMMAND_HEAD]))
+    if kind is None or data[_COMMAND_HEAD + 1:_COMMAND_VALUE_OFFSET] != kind[1]:
+        return None
+    device_type = kind[0]
+    value = data[_COMMAND_VALUE_OFFSET:]
+    if len(value) == 1:
+        return DecodedCommand(device_type, data[_COMMAND_HEAD], value[0])
+    if len(value) == 2:
+        return DecodedCommand(device_type, data[_COMMAND_HEAD], _U16.unpack(value)[0])
+    return None
+
+
+# -----------------------------------------------------------------------------
+# Frame encoding (advertisements, as broadcast by the devices)
+# -----------------------------------------------------------------------------
+def encode_shutter_frame(position_u8: int) -> bytes:
+    """Build a shutter position advertisement payload."""
+    return ADVERTISEMENT_HEADER + bytes(SHUTTER_POS_PREFIX) + bytes((position_u8 & 0xFF,))
+
+
+def thermo_raw_from_reading(temp_c: float) -> int:
+    """Inverse of ``thermo_temperature_from_raw`` for readings in broadcast frames."""
+    temp_c = float(temp_c)
+    raw = round(temp_c * 100) if temp_c <= 21.0 else round((temp_c + 10.0) * 100)
+    return min(max(raw, 0), 0xFFFF)
+
+
+def encode_thermostat_frame(raw_u16: int, *, target: bool = False) -> bytes:
+    """Build a thermostat current/target temperature advertisement payload."""
+    prefix = THERMO_TARGET_TEMP_PREFIX if target else THERMO_CURRENT_TEMP_PREFIX
+    return ADVERTISEMENT_HEADER + bytes(prefix) + _U16.pack(raw_u16 & 0xFFFF)
+
+
+def encode_sensor_frame(raw_u16: int, *, brightness: bool = False) -> bytes:
+    """Build a 13-byte sensor temperature/brightness advertisement payload."""
+    cmd = SENSOR_CMD_BRIGHTNESS if brightness else SENSOR_CMD_TEMPERATURE
+    return (
+        ADVERTISEMENT_HEADER
+        + _SENSOR_PREFIX_HEAD
+        + bytes((cmd,))
+        + _SENSOR_PREFIX_TAIL
+        + _U16.pack(raw_u16 & 0xFFFF)
+    )
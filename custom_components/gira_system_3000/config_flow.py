@@ -14,7 +14,21 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.device_registry import format_mac
 from bleak import BleakClient, BleakError
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_MAX_STATE_UPDATES_PER_S,
+    DEFAULT_MAX_STATE_UPDATES_PER_S,
+    CONF_COMMAND_COALESCE_MS,
+    DEFAULT_COMMAND_COALESCE_MS,
+    CONF_RELEASE_IDLE_UNDER_PRESSURE,
+    DEFAULT_RELEASE_IDLE_UNDER_PRESSURE,
+    CONF_MQTT_NODES,
+    DEFAULT_MQTT_NODES,
+    CONF_LEARNED_PREWARM,
+    DEFAULT_LEARNED_PREWARM,
+    CONF_CONFIRM_COMMANDS,
+    DEFAULT_CONFIRM_COMMANDS,
+)
 from .gira_ble import GiraBLEClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -127,9 +141,78 @@ class GiraSystem3000ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }), errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow handler."""
+        return GiraSystem3000OptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Sensors only broadcast; none of the options apply to them."""
+        return config_entry.data.get("device_type", "shutter") != "sensor"
+
     @callback
     def _async_abort_if_device_already_configured(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> None:
         """Abort if the device is already configured."""
         pass
+
+
+class GiraSystem3000OptionsFlow(config_entries.OptionsFlow):
+    """Handle options for a Gira 3000 BT device."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        device_type = self.config_entry.data.get("device_type", "shutter")
+        schema: dict[Any, Any] = {}
+        if device_type == "shutter":
+            # State-write throttling (and position interpolation) of the cover
+            schema[vol.Required(
+                CONF_MAX_STATE_UPDATES_PER_S,
+                default=options.get(
+                    CONF_MAX_STATE_UPDATES_PER_S, DEFAULT_MAX_STATE_UPDATES_PER_S
+                ),
+            )] = vol.All(vol.Coerce(float), vol.Range(min=0, max=20))
+        if device_type in ("shutter", "thermostat"):
+            # Command path: set-position / setpoint writes over a GATT link
+            schema.update({
+                vol.Required(
+                    CONF_COMMAND_COALESCE_MS,
+                    default=options.get(
+                        CONF_COMMAND_COALESCE_MS, DEFAULT_COMMAND_COALESCE_MS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+                vol.Required(
+                    CONF_RELEASE_IDLE_UNDER_PRESSURE,
+                    default=options.get(
+                        CONF_RELEASE_IDLE_UNDER_PRESSURE,
+                        DEFAULT_RELEASE_IDLE_UNDER_PRESSURE,
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_MQTT_NODES,
+                    default=options.get(CONF_MQTT_NODES, DEFAULT_MQTT_NODES),
+                ): str,
+                vol.Required(
+                    CONF_LEARNED_PREWARM,
+                    default=options.get(CONF_LEARNED_PREWARM, DEFAULT_LEARNED_PREWARM),
+                ): bool,
+                vol.Required(
+                    CONF_CONFIRM_COMMANDS,
+                    default=options.get(CONF_CONFIRM_COMMANDS, DEFAULT_CONFIRM_COMMANDS),
+                ): bool,
+            })
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
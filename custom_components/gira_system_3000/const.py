@@ -85,3 +85,138 @@ SENSOR_TEMP_NEG_BASE_DIVISOR = 10.0  # scale is raw/1000 additional /10 to keep
 
 SENSOR_LUX_A = 0.00015070156043542327    #   float lux = powf(10.0f, SENSOR_LUX_A * r + SENSOR_LUX_B);
 SENSOR_LUX_B = 0.9468552783240188
+
+# --------------------------------------------------------------------------------------
+# Connection scheduling
+# --------------------------------------------------------------------------------------
+# Concurrent GATT connections per Bluetooth adapter / proxy (HA "source") when
+# HA's Bluetooth stack reports no slot allocation for it.
+DEFAULT_ADAPTER_CONNECTION_SLOTS = 3
+
+# Connect attempts per command, spread over the ranked adapters (one per
+# fallback adapter, the rest on the last one tried).
+CONNECT_MAX_ATTEMPTS = 3
+
+# Idle disconnect timeout, learned per device from the gaps between commands.
+IDLE_DISCONNECT_DEFAULT_S = 15.0   # until enough gaps were observed
+IDLE_DISCONNECT_MIN_S = 3.0
+IDLE_DISCONNECT_MAX_S = 60.0
+IDLE_DISCONNECT_MIN_SAMPLES = 5
+IDLE_DISCONNECT_PERCENTILE = 0.8   # hold the link long enough for 80% of gaps
+
+# Per-device circuit breaker: fail fast after this many unreachable commands and
+# probe again (only on a fresh advertisement) at most once per interval.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_PROBE_INTERVAL_S = 30.0
+
+# Integration-wide retry budget: each first connect attempt earns RETRY_BUDGET_RATIO
+# retries, plus RETRY_BUDGET_MIN_PER_S per second, capped at RETRY_BUDGET_MAX_TOKENS.
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MIN_PER_S = 0.5
+RETRY_BUDGET_MAX_TOKENS = 10.0
+# Pause before retrying a connect through the same adapter.
+CONNECT_RETRY_BACKOFF_S = 0.25
+
+# Pre-warm: open the link before an expected command.
+DEFAULT_PREWARM_HOLD_S = 60.0      # link held at least this long (prewarm service)
+PREWARM_MAX_HOLD_S = 1800.0
+# Learned schedule: time-of-day slots, pre-warmed PREWARM_LEAD_MINUTES ahead when
+# commands were sent in that slot on recent days (one count per day, decayed daily).
+PREWARM_BIN_MINUTES = 15
+PREWARM_LEAD_MINUTES = 1
+PREWARM_DAILY_DECAY = 0.8
+PREWARM_MIN_SCORE = 1.5            # e.g. the last two days
+
+# Confirmation mode: writes without response, confirmed by the matching state
+# arriving by advertisement/notification within CONFIRM_TIMEOUT_S, else resent.
+CONFIRM_TIMEOUT_S = 5.0
+CONFIRM_RESENDS = 1
+CONFIRM_TEMPERATURE_TOLERANCE_C = 0.25
+
+# --------------------------------------------------------------------------------------
+# Persisted device state (restored at startup, before the first advertisement)
+# --------------------------------------------------------------------------------------
+STATE_STORAGE_KEY = f"{DOMAIN}.state"
+STATE_STORAGE_VERSION = 1
+# Changes of all devices are written together, at most once per this interval;
+# a device that keeps re-advertising the same state refreshes its timestamp as often.
+STATE_SAVE_DELAY_S = 30.0
+# Stored states older than this are not restored.
+STATE_RESTORE_MAX_AGE_S = 7 * 24 * 3600
+
+# --------------------------------------------------------------------------------------
+# Shutter motion tracking
+# --------------------------------------------------------------------------------------
+# A moving shutter counts as stopped once its position has not changed this long.
+MOTION_STOP_TIMEOUT_S = 2.0
+# Shared stop-timer wheel: resolution and slots (one turn = TICK_S * SLOTS seconds).
+MOTION_WHEEL_TICK_S = 0.1
+MOTION_WHEEL_SLOTS = 64
+# Fired on the HA event bus when a shutter stopped: {address, name, position}.
+EVENT_SHUTTER_STOPPED = f"{DOMAIN}_shutter_stopped"
+# Travel model: full 0..100% travel time until runs were observed, and the
+# shortest run (percent) that is learned from.
+SHUTTER_DEFAULT_TRAVEL_S = 30.0
+TRAVEL_MIN_DISTANCE = 5
+# While moving, the cover shows the interpolated position; an advertisement
+# within this many percent of it needs no extra state write.
+INTERPOLATION_TOLERANCE_PCT = 2
+
+# --------------------------------------------------------------------------------------
+# Services
+# --------------------------------------------------------------------------------------
+SERVICE_SET_POSITIONS = "set_positions"
+DEFAULT_BULK_MAX_PARALLEL = 6  # concurrent device sessions for set_positions
+SERVICE_PREWARM = "prewarm"
+# record_capture: advertisements are kept in memory until the file is written.
+SERVICE_RECORD_CAPTURE = "record_capture"
+DEFAULT_CAPTURE_S = 60
+CAPTURE_MAX_S = 3600
+CAPTURE_MAX_RECORDS = 500_000
+CAPTURE_DIR = DOMAIN  # below the Home Assistant config directory
+
+# --------------------------------------------------------------------------------------
+# Options (options flow)
+# --------------------------------------------------------------------------------------
+# Max. cover state writes per second while a shutter is moving (0 = no throttling).
+# The first change and the final resting position are always written.
+CONF_MAX_STATE_UPDATES_PER_S = "max_state_updates_per_second"
+DEFAULT_MAX_STATE_UPDATES_PER_S = 2.0
+
+# Window in which rapid set-position / setpoint changes collapse into one write
+# (only the latest target is sent; 0 = send every change).
+CONF_COMMAND_COALESCE_MS = "command_coalesce_ms"
+DEFAULT_COMMAND_COALESCE_MS = 150
+
+# Release idle links early when another device needs the adapter slot.
+CONF_RELEASE_IDLE_UNDER_PRESSURE = "release_idle_under_pressure"
+DEFAULT_RELEASE_IDLE_UNDER_PRESSURE = True
+
+# Comma-separated ESP32 node ids to drive this device through (MQTT, see docs/);
+# empty = direct Bluetooth connections.
+CONF_MQTT_NODES = "mqtt_nodes"
+DEFAULT_MQTT_NODES = ""
+
+# Confirm set-position / set-target-temperature by the advertised state instead of
+# write-with-response (see CONFIRM_TIMEOUT_S).
+CONF_CONFIRM_COMMANDS = "confirm_commands"
+DEFAULT_CONFIRM_COMMANDS = False
+
+# Pre-warm links ahead of time slots in which commands were sent on recent days.
+CONF_LEARNED_PREWARM = "learned_prewarm"
+DEFAULT_LEARNED_PREWARM = False
+
+# --------------------------------------------------------------------------------------
+# ESP32 / MQTT proxies
+# --------------------------------------------------------------------------------------
+# Topics: <base>/<node_id>/cmd, /status, /event
+MQTT_BASE_TOPIC = "gira"
+
+# --------------------------------------------------------------------------------------
+# hass.data keys for integration-wide (shared across config entries) helpers
+# --------------------------------------------------------------------------------------
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_MQTT_BRIDGE = f"{DOMAIN}_mqtt_bridge"
+DATA_TIMER_WHEEL = f"{DOMAIN}_timer_wheel"
+DATA_STATE_STORE = f"{DOMAIN}_state_store"
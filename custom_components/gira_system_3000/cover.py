@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.cover import (
@@ -9,16 +10,25 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     UpdateFailed,
 )
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_MAX_STATE_UPDATES_PER_S,
+    DEFAULT_MAX_STATE_UPDATES_PER_S,
+    INTERPOLATION_TOLERANCE_PCT,
+)
+from .codec import lookup_shutter_raw
 from .gira_ble import GiraBLEClient, GiraPassiveBluetoothDataUpdateCoordinator
+from .motion import async_get_timer_wheel
 
 
 async def async_setup_entry(
@@ -51,7 +61,6 @@ class GiraSystem3000Cover(
         | CoverEntityFeature.STOP
         | CoverEntityFeature.SET_POSITION
     )
-    _attr_assumed_state = False
 
     def __init__(
         self,
@@ -68,9 +77,35 @@ class GiraSystem3000Cover(
             name=client.name,
             connections={(config_entry.entry_id, client.address)},
         )
-        self._attr_current_cover_position = None  # Initialize the state to None
+        # Last known position (restored from before a restart), else unknown
+        self._attr_current_cover_position = (coordinator.data or {}).get("position")
+
+        # State-write coalescing while moving (0 = write every change)
+        max_rate = float(
+            config_entry.options.get(
+                CONF_MAX_STATE_UPDATES_PER_S, DEFAULT_MAX_STATE_UPDATES_PER_S
+            )
+        )
+        self._min_write_interval_s = 1.0 / max_rate if max_rate > 0 else 0.0
+        self._last_write_monotonic = 0.0
+        self._pending_write: CALLBACK_TYPE | None = None
+        # Interpolated position updates while moving (needs a write interval)
+        self._interpolation_key = (client.address, "cover")
         LOGGER.debug("Created cover entity for %s", client.name)
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending coalesced state write."""
+        await super().async_will_remove_from_hass()
+        if self._pending_write is not None:
+            self._pending_write()
+            self._pending_write = None
+        async_get_timer_wheel(self.hass).cancel(self._interpolation_key)
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the position is restored and not yet reported again."""
+        return self.coordinator.restored_at is not None
+
     @property
     def available(self) -> bool:
         """Return if the entity is available."""
@@ -79,6 +114,7 @@ class GiraSystem3000Cover(
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open the cover."""
+        self._set_motion_target(100)
         try:
             await self._client.send_shutter_up_command()
         except UpdateFailed:
@@ -87,6 +123,7 @@ class GiraSystem3000Cover(
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close the cover."""
+        self._set_motion_target(0)
         try:
             await self._client.send_shutter_down_command()
         except UpdateFailed:
@@ -95,6 +132,7 @@ class GiraSystem3000Cover(
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
+        self._set_motion_target(None)
         try:
             await self._client.send_shutter_stop_command()
         except UpdateFailed:
@@ -112,13 +150,9 @@ class GiraSystem3000Cover(
         except (TypeError, ValueError):
             return
 
-        if position_pct < 0:
-            position_pct = 0
-        if position_pct > 100:
-            position_pct = 100
-
         # Map 0..100% -> 0x00..0xFF (0..255)
-        pos_u8 = 255 - round(position_pct * 255 / 100)
+        pos_u8 = lookup_shutter_raw(position_pct)
+        self._set_motion_target(position_pct)
 
         try:
             await self._client.send_set_position_command(pos_u8)
@@ -126,12 +160,29 @@ class GiraSystem3000Cover(
             self._attr_available = False
             self.async_write_ha_state()
 
+    def _set_motion_target(self, target: int | None) -> None:
+        """Tell the motion tracker where the shutter is heading (bounds interpolation)."""
+        if self.coordinator.motion is not None:
+            self.coordinator.motion.target = target
+
     @property
     def current_cover_position(self) -> int | None:
         """Return the current position of the cover."""
         # Return the cached state attribute
         return self._attr_current_cover_position
 
+    @property
+    def is_opening(self) -> bool | None:
+        """Return True while the position is rising."""
+        motion = self.coordinator.motion
+        return motion.is_opening if motion is not None else None
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Return True while the position is falling."""
+        motion = self.coordinator.motion
+        return motion.is_closing if motion is not None else None
+
     @property
     def is_closed(self) -> bool | None:
         """Return if the cover is closed or not."""
@@ -143,13 +194,70 @@ class GiraSystem3000Cover(
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        motion = self.coordinator.motion
+        interpolating = motion is not None and motion.moving and self._min_write_interval_s > 0
         if self.coordinator.data is not None:
             new_position = self.coordinator.data.get("position")
             # Only update the state if a new position is available
             if new_position is not None:
+                if (
+                    interpolating
+                    and self._attr_current_cover_position is not None
+                    and abs(new_position - self._attr_current_cover_position) <= INTERPOLATION_TOLERANCE_PCT
+                ):
+                    # The interpolated position already shows this; the next tick moves on.
+                    return
                 self._attr_current_cover_position = new_position
                 LOGGER.debug(
                     "Cover entity received update. New position: %s",
                     self.current_cover_position,
                 )
+        self._async_write_coalesced()
+        if interpolating:
+            self._async_schedule_interpolation()
+
+    @callback
+    def _async_schedule_interpolation(self) -> None:
+        async_get_timer_wheel(self.hass).schedule(
+            self._interpolation_key, self._min_write_interval_s, self._async_interpolate
+        )
+
+    @callback
+    def _async_interpolate(self) -> None:
+        """Show the estimated position between advertisements while moving."""
+        motion = self.coordinator.motion
+        if motion is None or not motion.moving:
+            return
+        estimate = motion.estimate_position(time.monotonic())
+        if estimate is not None and round(estimate) != self._attr_current_cover_position:
+            self._attr_current_cover_position = round(estimate)
+            self._async_write_coalesced()
+        self._async_schedule_interpolation()
+
+    @callback
+    def _async_write_coalesced(self) -> None:
+        """Write state at most once per interval.
+
+        The first change after a quiet period is written immediately. Changes
+        inside the interval are folded into one deferred write that carries the
+        latest position, so the final resting position is always written.
+        """
+        if self._pending_write is not None:
+            return
+
+        delay = self._last_write_monotonic + self._min_write_interval_s - time.monotonic()
+        if delay <= 0:
+            self._async_write_now()
+            return
+
+        self._pending_write = async_call_later(self.hass, delay, self._async_flush_pending)
+
+    @callback
+    def _async_flush_pending(self, _now: Any) -> None:
+        self._pending_write = None
+        self._async_write_now()
+
+    @callback
+    def _async_write_now(self) -> None:
+        self._last_write_monotonic = time.monotonic()
         self.async_write_ha_state()
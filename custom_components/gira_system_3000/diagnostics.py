@@ -0,0 +1,60 @@
+"""Diagnostics support for the Gira System 3000 integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .scheduler import async_get_scheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return per-device performance data for a config entry."""
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    coordinator = data.get("coordinator")
+    client = data.get("client")
+    stats = data.get("stats")
+    scheduler = async_get_scheduler(hass)
+
+    adapter = scheduler.source_of(client) if client else None
+    if adapter is None and client is not None:
+        adapter = client.resolve_adapter()
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "state": dict(coordinator.data or {}) if coordinator else None,
+        "state_restored_at": coordinator.restored_at.isoformat()
+        if coordinator and coordinator.restored_at
+        else None,
+        "travel": coordinator.motion.travel.as_dict()
+        if coordinator and coordinator.motion
+        else None,
+        "client": {
+            "connected": client.is_connected,
+            "idle_disconnect_s": client.idle_disconnect_s,
+            "coalesced_writes": client.coalesced_writes,
+            "prewarm_slots": client.prewarm_schedule.likely_slots(dt_util.now()),
+        }
+        if client
+        else None,
+        "adapter": {
+            "source": adapter,
+            "slots": scheduler.slots_for(adapter) if adapter else None,
+            "links": scheduler.links_on(adapter) if adapter else None,
+        },
+        "routes": client.router.as_dict() if client else None,
+        "breaker": client.breaker.as_dict() if client else None,
+        "retry_budget": {
+            "tokens": round(scheduler.retry_budget.tokens, 2),
+            "denied": scheduler.retry_budget.denied,
+        },
+        "stats": stats.as_dict() if stats else None,
+    }
@@ -0,0 +1,119 @@
+"""Integration-wide advertisement dispatcher for Gira System 3000 BT devices."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_DISPATCHER, GIRA_MANUFACTURER_ID, LOGGER
+
+if TYPE_CHECKING:
+    from .gira_ble import GiraPassiveBluetoothDataUpdateCoordinator
+
+
+class GiraAdvertisementDispatcher:
+    """Routes Gira advertisements to the coordinator of the matching device.
+
+    A single Bluetooth callback (manufacturer ID 1412) is registered for the whole
+    integration. Addresses are normalized once at registration, so the cost per
+    advertisement is one dict lookup regardless of how many devices are configured.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._coordinators: dict[str, GiraPassiveBluetoothDataUpdateCoordinator] = {}
+        self._cancel_callback: CALLBACK_TYPE | None = None
+        self._recorders: list[Callable[[BluetoothServiceInfoBleak], None]] = []
+
+    @callback
+    def async_register(
+        self, coordinator: GiraPassiveBluetoothDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Register a coordinator; returns a callable that unregisters it."""
+        key = coordinator.address.upper()
+        self._coordinators[key] = coordinator
+
+        if self._cancel_callback is None:
+            self._cancel_callback = bluetooth.async_register_callback(
+                self.hass,
+                self._async_handle_advertisement,
+                BluetoothCallbackMatcher(
+                    manufacturer_id=GIRA_MANUFACTURER_ID, connectable=False
+                ),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            )
+            LOGGER.debug("Registered shared Gira advertisement callback")
+
+        @callback
+        def _unregister() -> None:
+            if self._coordinators.get(key) is coordinator:
+                del self._coordinators[key]
+            if not self._coordinators and self._cancel_callback is not None:
+                self._cancel_callback()
+                self._cancel_callback = None
+                LOGGER.debug("Removed shared Gira advertisement callback")
+
+        return _unregister
+
+    @callback
+    def _async_handle_advertisement(
+        self,
+        service_info: BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Handle an advertisement from any Gira device."""
+        if self._recorders:
+            for recorder in self._recorders:
+                recorder(service_info)
+        # HA reports addresses upper-case already; no per-advertisement normalization.
+        coordinator = self._coordinators.get(service_info.address)
+        if coordinator is None:
+            return
+
+        # Every advertisement is an RSSI sample of the adapter that heard it.
+        coordinator.async_handle_rssi(service_info.source, service_info.rssi)
+        manufacturer_data = service_info.manufacturer_data.get(GIRA_MANUFACTURER_ID)
+        if manufacturer_data:
+            coordinator.async_handle_manufacturer_data(manufacturer_data)
+
+    @callback
+    def async_add_recorder(
+        self, recorder: Callable[[BluetoothServiceInfoBleak], None]
+    ) -> CALLBACK_TYPE:
+        """Also hand every Gira advertisement (configured device or not) to ``recorder``.
+
+        Returns a callable that removes it. Advertisements only arrive while at
+        least one device is registered.
+        """
+        self._recorders.append(recorder)
+
+        @callback
+        def _remove() -> None:
+            self._recorders.remove(recorder)
+
+        return _remove
+
+    @callback
+    def async_dispatch(self, address: str, manufacturer_data: bytes) -> bool:
+        """Route a raw manufacturer payload to its device. Returns False if unknown."""
+        coordinator = self._coordinators.get(address.upper())
+        if coordinator is None:
+            return False
+        coordinator.async_handle_manufacturer_data(manufacturer_data)
+        return True
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> GiraAdvertisementDispatcher:
+    """Return the integration-wide dispatcher, creating it on first use."""
+    dispatcher: GiraAdvertisementDispatcher | None = hass.data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = GiraAdvertisementDispatcher(hass)
+    return dispatcher
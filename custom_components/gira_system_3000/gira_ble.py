@@ -1,80 +1,91 @@
 """Bluetooth LE communication for Gira System 3000 BT devices."""
 import asyncio
-import logging
-from typing import Any, cast, Optional
+import heapq
+import itertools
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, NamedTuple, Optional
 
-from bleak import BleakClient, BleakError, BLEDevice
-from bleak_retry_connector import establish_connection
+from bleak import BleakError
 
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothDataUpdateCoordinator,
 )
 from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN, EVENT_SHUTTER_STOPPED, LOGGER
+from .codec import (
+    FRAME_DECODERS,
+    decode_notification,
+    generate_command,
+    generate_position_command,  # noqa: F401 - re-exported for existing callers
+    generate_thermo_target_temperature_command,
+    generate_thermo_u8_command,
+    shutter_position_from_raw,
+)
+from .breaker import CircuitBreaker
+from .dispatcher import GiraAdvertisementDispatcher
+from .motion import ShutterMotion, TimerWheel
+from .prewarm import PrewarmSchedule
+from .router import AdapterRouter
+from .scheduler import GiraConnectionScheduler
+from .state_store import GiraStateStore
+from .stats import DeviceStats, RollingHistogram
+from .transport import BleakTransport, GiraLink, GiraTransport, Route, UnsupportedCommandError
 
 from .const import (
-    LOGGER,
-    GIRA_MANUFACTURER_ID,
-    GIRA_SERVICE_UUID,
     GIRA_WRITE_CHAR_UUID,
+    GIRA_READ_CHAR_UUID,
+    IDLE_DISCONNECT_DEFAULT_S,
+    IDLE_DISCONNECT_MIN_S,
+    IDLE_DISCONNECT_MAX_S,
+    IDLE_DISCONNECT_MIN_SAMPLES,
+    IDLE_DISCONNECT_PERCENTILE,
+    CONNECT_MAX_ATTEMPTS,
+    CONNECT_RETRY_BACKOFF_S,
+    CONFIRM_RESENDS,
+    CONFIRM_TEMPERATURE_TOLERANCE_C,
+    CONFIRM_TIMEOUT_S,
+    DEFAULT_PREWARM_HOLD_S,
+    STATE_SAVE_DELAY_S,
     # Shutter constants
-    SHUTTER_COMMAND_PREFIX,
-    SHUTTER_COMMAND_SUFFIX,
     SHUTTER_PROPERTY_ID_MOVE,
     SHUTTER_PROPERTY_ID_STOP,
-    SHUTTER_PROPERTY_ID_STEP,
     SHUTTER_PROPERTY_ID_SET_POSITION,
     SHUTTER_VALUE_UP,
     SHUTTER_VALUE_DOWN,
     SHUTTER_VALUE_STOP,
-    SHUTTER_POS_PREFIX,
-    SHUTTER_POS_LENGTH_BYTES,
-    SHUTTER_INVERT_POSITION,
     # Thermostat constants
-    THERMO_COMMAND_PREFIX,
-    THERMO_COMMAND_SUFFIX,
     THERMO_PROPERTY_ID_TIMER_HEAT,
-    THERMO_PROPERTY_ID_TARGET_TEMP,
     THERMO_PROPERTY_ID_STEP,
     THERMO_VALUE_START,
     THERMO_VALUE_STOP,
-    THERMO_CURRENT_TEMP_PREFIX,
-    THERMO_TARGET_TEMP_PREFIX,
-    THERMO_TEMPERATURE_LENGTH_BYTES,
-    # Sensor constants
-    SENSOR_TEMPERATURE_PREFIX,
-    SENSOR_BRIGHTNESS_PREFIX,
-    SENSOR_LENGTH_BYTES,
-    SENSOR_FRAME_LENGTH,
-    SENSOR_SUFFIX_0,
-    SENSOR_SUFFIX_1,
-    SENSOR_CMD_TEMPERATURE,
-    SENSOR_CMD_BRIGHTNESS,
-    SENSOR_TEMP_NEG_BASE,
-    SENSOR_TEMP_DIVISOR,
-    SENSOR_TEMP_NEG_BASE_DIVISOR,
-    SENSOR_LUX_A,
-    SENSOR_LUX_B,
 )
 
-def _thermo_decode_temp_u16(raw: int) -> float:
-    """Decode Gira thermostat temperature from u16.
+# check(reported state when the command was sent, reported state now) -> confirmed?
+StateCheck = Callable[[dict[str, Any], dict[str, Any]], bool]
+
+
+def _target_reported(temp_c: float) -> StateCheck:
+    """Confirmed once the device reports ``temp_c`` as its target temperature."""
+
+    def check(_before: dict[str, Any], now: dict[str, Any]) -> bool:
+        target = now.get("target_temperature")
+        return target is not None and abs(target - temp_c) <= CONFIRM_TEMPERATURE_TOLERANCE_C
 
-    Read rules (per your reverse engineering):
-    - temp <= 21.0°C : raw / 100
-    - temp > 21.0°C  : raw / 100 - 10
-    """
-    temp = raw / 100.0
-    if raw > 2100:  # 21.0°C threshold
-        temp -= 10.0
-    return temp
+    return check
+
+# Upper bound for remembered payloads; thermostats alternate between frame types.
+_SEEN_PAYLOADS_MAX = 8
 
 # -----------------------------------------------------------------------------
-# Passive coordinator (advertisements) - parses based on device_type
+# Passive coordinator (advertisements) - keeps frames matching device_type
 # -----------------------------------------------------------------------------
 
 class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordinator):
@@ -86,6 +97,10 @@ class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordi
         address: str,
         name: str,
         device_type: str,
+        dispatcher: GiraAdvertisementDispatcher,
+        stats: DeviceStats | None = None,
+        timer_wheel: TimerWheel | None = None,
+        state_store: GiraStateStore | None = None,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -97,8 +112,33 @@ class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordi
         )
         self._device_name = name
         self._device_type = device_type
+        self._decode = FRAME_DECODERS[device_type]
+        self._dispatcher = dispatcher
+        self.stats = stats or DeviceStats()
+        self._seen_listener: Callable[[], None] | None = None
+        self._rssi_listener: Callable[[str, int], None] | None = None
+        # Last state reported by the device itself (no optimistic updates) and
+        # pending command confirmations: (reported state at registration, check, future)
+        self._reported: dict[str, Any] = {}
+        self._expectations: list[tuple[dict[str, Any], StateCheck, asyncio.Future[None]]] = []
+        # Movement state derived from the position stream (shutters only)
+        self.motion: ShutterMotion | None = None
+        if device_type == "shutter" and timer_wheel is not None:
+            self.motion = ShutterMotion(timer_wheel, address, self._async_motion_stopped)
+        # Payloads already applied since the last state change (fingerprint fast-path)
+        self._seen_payloads: set[bytes] = set()
         self.data = {}
-        
+        # Last known state across restarts: restored until the device reports
+        # again (restored_at = when the restored state was last reported).
+        self._state_store = state_store
+        self._persisted: dict[str, Any] = {}
+        self._persisted_monotonic = 0.0
+        self.restored_at: datetime | None = None
+        restored = state_store.get(address) if state_store is not None else None
+        if restored is not None:
+            self._persisted, self.restored_at = restored
+            self.data = dict(self._persisted)
+
         LOGGER.debug(
             "Created coordinator instance for %s (%s) type=%s",
             name,
@@ -106,189 +146,316 @@ class GiraPassiveBluetoothDataUpdateCoordinator(PassiveBluetoothDataUpdateCoordi
             device_type,
         )
 
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start receiving advertisements through the shared dispatcher."""
+        unregister = self._dispatcher.async_register(self)
+        cancel_unavailable = bluetooth.async_track_unavailable(
+            self.hass, self._async_handle_unavailable, self.address, connectable=False
+        )
+
+        @callback
+        def _async_stop() -> None:
+            unregister()
+            cancel_unavailable()
+            if self.motion is not None:
+                self.motion.async_reset()
+
+        return _async_stop
+
+    @callback
+    def async_set_seen_listener(self, listener: Callable[[], None] | None) -> None:
+        """Call ``listener`` for every advertisement of the device, duplicates included."""
+        self._seen_listener = listener
+
+    @callback
+    def async_set_rssi_listener(self, listener: Callable[[str, int], None] | None) -> None:
+        """Call ``listener(source, rssi)`` for every advertisement heard by an HA adapter."""
+        self._rssi_listener = listener
+
+    @callback
+    def async_handle_rssi(self, source: str, rssi: int | None) -> None:
+        """Handle the signal strength of an advertisement as seen by one adapter."""
+        if self._rssi_listener is not None and rssi is not None:
+            self._rssi_listener(source, rssi)
+
     def _async_handle_unavailable(
         self, service_info: BluetoothServiceInfoBleak
     ) -> None:
         """Handle the device going unavailable."""
         LOGGER.debug("Handle unavailable for %s (%s)", self._device_name, self.address)
         self.last_update_success = False
+        self._seen_payloads.clear()
+        if self.motion is not None:
+            self.motion.async_reset()
         self.async_update_listeners()
 
-    def _async_handle_bluetooth_event(
-        self,
-        service_info: BluetoothServiceInfoBleak,
-        change: bluetooth.BluetoothChange,
-    ) -> Optional[dict]:
-        """Handle incoming BLE advertisements for this device."""
-        
-        # Check if this event is for our device
-        if service_info.device.address.upper() != self.address.upper():
+    @callback
+    def async_handle_manufacturer_data(self, manufacturer_data: bytes) -> Optional[dict]:
+        """Handle a Gira manufacturer payload routed here by the dispatcher."""
+        if not manufacturer_data:
             return None
 
-        manufacturer_data = service_info.manufacturer_data.get(GIRA_MANUFACTURER_ID)
-        if not manufacturer_data:
+        # Devices re-broadcast the same frame many times per second: identical
+        # bytes cannot change state, so skip decoding entirely.
+        now = time.monotonic()
+        self.stats.record_advertisement(now)
+        if self._seen_listener is not None:
+            self._seen_listener()
+        if manufacturer_data in self._seen_payloads:
+            # Unchanged state: only keep its stored timestamp fresh.
+            if self._state_store is not None and now - self._persisted_monotonic >= STATE_SAVE_DELAY_S:
+                self._async_persist(now)
             return None
 
-        # ---------------------------
-        # SHUTTER
-        # ---------------------------
-        if self._device_type == "shutter":
-            prefix_index = manufacturer_data.find(SHUTTER_POS_PREFIX)
-            # Ensure enough bytes after prefix to read position
-            if prefix_index == -1:
-                return None
-            if len(manufacturer_data) < prefix_index + len(SHUTTER_POS_PREFIX) + 1:
-                return None
-
-            # Extract position byte, 1 byte after prefix
-            position_byte = manufacturer_data[prefix_index + len(SHUTTER_POS_PREFIX)]
-            ha_position = round(100 * (255 - position_byte) / 255)
-
-            # Return dictionary containing new data.
-            self.data = {"position": ha_position}
-            self.async_update_listeners()         
-            return self.data
-
-        # ---------------------------
-        # THERMOSTAT
-        # ---------------------------
-        if self._device_type == "thermostat":
-            # MERGE partial broadcasts (do NOT overwrite)
-            data: dict[str, Any] = dict(getattr(self, "data", {}) or {})
-
-            idx = manufacturer_data.find(THERMO_CURRENT_TEMP_PREFIX)
-            if idx != -1 and len(manufacturer_data) >= idx + len(THERMO_CURRENT_TEMP_PREFIX) + 2:
-                raw = int.from_bytes(
-                    manufacturer_data[
-                        idx + len(THERMO_CURRENT_TEMP_PREFIX)
-                        : idx + len(THERMO_CURRENT_TEMP_PREFIX) + 2
-                    ],
-                    "big",
-                )
-                data["current_temperature"] = _thermo_decode_temp_u16(raw)
-
-            idx = manufacturer_data.find(THERMO_TARGET_TEMP_PREFIX)
-            if idx != -1 and len(manufacturer_data) >= idx + len(THERMO_TARGET_TEMP_PREFIX) + 2:
-                raw = int.from_bytes(
-                    manufacturer_data[
-                        idx + len(THERMO_TARGET_TEMP_PREFIX)
-                        : idx + len(THERMO_TARGET_TEMP_PREFIX) + 2
-                    ],
-                    "big",
-                )
-                data["target_temperature"] = _thermo_decode_temp_u16(raw)
+        start = time.perf_counter_ns()
+        fields = self._decode(manufacturer_data)
+        self.stats.parse_us.add((time.perf_counter_ns() - start) / 1000)
+        if fields is None:
+            return None
+
+        data = self._async_apply_fields(fields)
+        if len(self._seen_payloads) >= _SEEN_PAYLOADS_MAX:
+            self._seen_payloads.clear()
+        self._seen_payloads.add(bytes(manufacturer_data))
+        return data
+
+    @callback
+    def async_handle_notification(self, payload: bytes) -> Optional[dict]:
+        """Handle a GATT notification received while GiraBLEClient holds a link."""
+        fields = decode_notification(payload, self._device_type)
+        if fields is None:
+            return None
+        return self._async_apply_fields(fields)
+
+    @property
+    def reported(self) -> Mapping[str, Any]:
+        """State as last reported by the device itself (no optimistic updates)."""
+        return self._reported
 
-            if data:
-                self.data = data
+    @callback
+    def async_expect_state(self, check: StateCheck) -> asyncio.Future[None]:
+        """Return a future that resolves once the device reports a matching state.
+
+        ``check(reported_before, reported_now)`` is evaluated for every decoded
+        frame (also ones that do not change ``data``, e.g. after an optimistic
+        update); the future resolves at once if the state already matches.
+        """
+        initial = dict(self._reported)
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        if check(initial, initial):
+            future.set_result(None)
+        else:
+            self._expectations.append((initial, check, future))
+        return future
+
+    @callback
+    def _async_check_expectations(self) -> None:
+        pending = []
+        for initial, check, future in self._expectations:
+            if future.done():
+                continue
+            if check(initial, self._reported):
+                future.set_result(None)
+            else:
+                pending.append((initial, check, future))
+        self._expectations = pending
+
+    @callback
+    def _async_apply_fields(self, fields: dict[str, Any]) -> Optional[dict]:
+        """Merge decoded values into the state; notify listeners on change."""
+        self._reported.update(fields)
+        if self._expectations:
+            self._async_check_expectations()
+        if self._state_store is not None and (
+            self.restored_at is not None or not fields.items() <= self._persisted.items()
+        ):
+            self._persisted.update(fields)
+            self._async_persist(time.monotonic())
+        # The device reported itself: the state is live from here on.
+        was_restored, self.restored_at = self.restored_at is not None, None
+
+        current = self.data
+        if current and fields.items() <= current.items():
+            if was_restored:
                 self.async_update_listeners()
-                return data
+            return None
 
-        # ---------------------------
-        # SENSOR
-        # ---------------------------
-        if self._device_type == "sensor":
-            # ESPHome-equivalent parsing (13-byte manufacturer frame)
-            if len(manufacturer_data) != SENSOR_FRAME_LENGTH:
-                return None
+        # MERGE partial broadcasts (do NOT overwrite)
+        data: dict[str, Any] = dict(current or {})
+        data.update(fields)
+        self.data = data
+        # Payloads seen before the change are meaningful again (e.g. a shutter
+        # moving back to a position it already reported).
+        self._seen_payloads.clear()
+        self.last_update_success = True
+        position = fields.get("position")
+        if self.motion is not None and position is not None:
+            now = time.monotonic()
+            if self.motion.moving:
+                # Reconcile: how far off was the interpolated position?
+                estimate = self.motion.estimate_position(now)
+                if estimate is not None:
+                    self.stats.estimate_error_pct.add(abs(position - estimate))
+            self.motion.async_update(position, now)
+        self.async_update_listeners()
+        return data
 
-            if not (manufacturer_data[9] == SENSOR_SUFFIX_0 and manufacturer_data[10] == SENSOR_SUFFIX_1):
-                return None
+    @callback
+    def _async_persist(self, now: float) -> None:
+        """Hand the reported state to the store (written in its next batch)."""
+        if self._state_store is not None:
+            self._state_store.async_update(self.address, self._persisted)
+            self._persisted_monotonic = now
 
-            cmd = manufacturer_data[8]
-            if cmd not in (SENSOR_CMD_TEMPERATURE, SENSOR_CMD_BRIGHTNESS):
-                return None
+    @callback
+    def _async_motion_stopped(self, position: int) -> None:
+        """Report the end of a movement to entities and automations."""
+        LOGGER.debug("%s (%s) stopped at %s%%", self._device_name, self.address, position)
+        self.async_update_listeners()
+        self.hass.bus.async_fire(
+            EVENT_SHUTTER_STOPPED,
+            {"address": self.address, "name": self._device_name, "position": position},
+        )
 
-            hi = manufacturer_data[11]
-            lo = manufacturer_data[12]
-            raw = (lo | (hi << 8)) & 0xFFFF
+    @callback
+    def async_set_field(self, field: str, value: Any) -> None:
+        """Set a state field locally (optimistic update) and notify listeners."""
+        data: dict[str, Any] = dict(self.data or {})
+        data[field] = value
+        self.data = data
+        # The next broadcast must be applied even if its bytes were seen before.
+        self._seen_payloads.clear()
+        self.async_update_listeners()
 
-            data: dict[str, Any] = dict(getattr(self, "data", {}) or {})
+# -----------------------------------------------------------------------------
+# Command queue
+# -----------------------------------------------------------------------------
+PRIORITY_STOP = 0
+PRIORITY_NORMAL = 10
 
-            if cmd == SENSOR_CMD_TEMPERATURE:
-                # Signed temperature conversion
-                if raw > SENSOR_TEMP_NEG_BASE:
-                    data["sensor_temperature"] = (SENSOR_TEMP_NEG_BASE - raw) / SENSOR_TEMP_NEG_BASE_DIVISOR / SENSOR_TEMP_DIVISOR
-                else:
-                    data["sensor_temperature"] = raw / SENSOR_TEMP_DIVISOR
+# Supersede keys: a queued command is dropped when a newer one with the same key
+# arrives. All shutter movement commands share one key (the latest intent wins).
+KEY_SHUTTER_MOTION = "shutter_motion"
+KEY_THERMO_TARGET = "thermo_target"
+KEY_THERMO_TIMER = "thermo_timer"
+# Heating timer + setpoint session: only a newer session replaces it, a plain
+# setpoint must not drop the timer change queued with it.
+KEY_THERMO_SESSION = "thermo_session"
+
+
+class SessionResult(NamedTuple):
+    """Outcome of ``GiraBLEClient.send_session``."""
+
+    sent: int                    # commands written, in order
+    total: int
+    write_s: tuple[float, ...]   # duration of each write
+    error: str | None = None
+    skipped: tuple[int, ...] = ()  # indexes of commands the link cannot carry
+
+    @property
+    def complete(self) -> bool:
+        """Return True if every command was written or skipped as unsupported."""
+        return self.sent + len(self.skipped) == self.total
 
-            else:
-                # Log lux conversion
-                data["sensor_brightness"] = 10 ** (SENSOR_LUX_A * float(raw) + SENSOR_LUX_B)
-                if data["sensor_brightness"] < 0:
-                    data["sensor_brightness"] = 0.0
-
-            self.data = data
-            self.async_update_listeners()
-            return data
-
-# ---------------------------
-# SHUTER
-# ---------------------------
-def _generate_command(property_id: int, value: int) -> bytearray:
-    """Generates the full command byte array from its parts."""
-    return (
-        SHUTTER_COMMAND_PREFIX
-        + property_id.to_bytes(1, 'big')
-        + SHUTTER_COMMAND_SUFFIX
-        + value.to_bytes(1, 'big')
-    )
-
-def generate_position_command(percentage: int) -> bytearray:
-    """Generates the command for setting absolute blinds position."""
-    if not 0 <= percentage <= 100:
-        raise ValueError("Percentage must be between 0 and 100.")
-    return _generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, percentage)
-
-# ---------------------------
-# THERMOSTAT
-# ---------------------------
-def _generate_thermo_u8_command(property_id: int, value_u8: int) -> bytearray:
-    """Generate thermostat command with a single u8 value."""
-    v = int(value_u8) & 0xFF
-    return (
-        THERMO_COMMAND_PREFIX
-        + property_id.to_bytes(1, "big")
-        + THERMO_COMMAND_SUFFIX
-        + v.to_bytes(1, "big")
-    )
-
-def _generate_thermo_u16_command(property_id: int, value_u16: int) -> bytearray:
-    """Generate thermostat command with a uint16 value (big-endian)."""
-    v = int(value_u16)
-    if v < 0:
-        v = 0
-    if v > 0xFFFF:
-        v = 0xFFFF
-    return (
-        THERMO_COMMAND_PREFIX
-        + property_id.to_bytes(1, "big")
-        + THERMO_COMMAND_SUFFIX
-        + v.to_bytes(2, "big", signed=False)
-    )
+
+@dataclass(order=True)
+class _QueuedCommand:
+    priority: int
+    seq: int
+    commands: tuple[bytearray, ...] = field(compare=False)
+    response: bool = field(compare=False)
+    key: str | None = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+    # Set when pre-empted while connecting: the link is kept, the write skipped.
+    superseded: bool = field(default=False, compare=False)
+    # Duration of every write done so far; a reconnect resumes after them.
+    write_s: list[float] = field(default_factory=list, compare=False)
+    # Sessions only: commands skipped because the link cannot carry them.
+    skipped: list[int] | None = field(default=None, compare=False)
+
+
+@dataclass
+class _CoalescedCommand:
+    command: bytearray
+    response: bool
+    future: asyncio.Future[None]
+    flush: asyncio.TimerHandle | None = None
 
 
 class GiraBLEClient:
     """Manages the Bluetooth LE connection and command sending for a Gira device."""
 
-    def __init__(self, hass: HomeAssistant, address: str, name: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        name: str,
+        scheduler: GiraConnectionScheduler,
+        coalesce_window_s: float = 0.0,
+        release_idle_under_pressure: bool = True,
+        on_notification: Callable[[bytes], Any] | None = None,
+        transport: GiraTransport | None = None,
+        stats: DeviceStats | None = None,
+        state_store: GiraStateStore | None = None,
+    ) -> None:
         """Initialize the client."""
         self.hass = hass
         self.address = address
         self.name = name
-        
-        self._client: BleakClient | None = None
+        self._scheduler = scheduler
+        self.transport: GiraTransport = transport or BleakTransport(hass)
+        self.router = AdapterRouter()
+        self.breaker = CircuitBreaker()
+        self._probe_task: asyncio.Task | None = None
+        self.stats = stats or DeviceStats()
+
+        self._client: GiraLink | None = None
         self._is_connecting = asyncio.Lock()
 
         self._idle_disconnect_handle = None
-        self._idle_disconnect_s = 15.0      # seconds to keep connection open
+        self._idle_disconnect_s = IDLE_DISCONNECT_DEFAULT_S  # adapted from command gaps
         self._write_timeout_s = 2.0         # seconds for write_gatt_char
-    
+        self._idle_since: float | None = None
+        self._hold_until: float | None = None  # pre-warmed link kept at least until then
+        self._command_gaps = RollingHistogram()
+        self._last_command_monotonic: float | None = None
+        self.prewarm_schedule = PrewarmSchedule()
+        # Learned slots are kept across restarts with the last-known state.
+        self._state_store = state_store
+        if state_store is not None and (stored := state_store.get_prewarm(address)):
+            self.prewarm_schedule.restore(stored)
+        self.release_idle_under_pressure = release_idle_under_pressure
+
+        # GATT notifications on GIRA_READ_CHAR_UUID while a link is open
+        self._on_notification = on_notification
+        self._notify_supported = on_notification is not None
+        self._notifying: GiraLink | None = None  # link notifications were started on
+
+        # Per-device priority command queue (heap of _QueuedCommand)
+        self._queue: list[_QueuedCommand] = []
+        self._queue_seq = itertools.count()
+        self._queue_worker: asyncio.Task | None = None
+        self._active: _QueuedCommand | None = None
+        self._active_task: asyncio.Task | None = None
+        self._connecting = False
+
+        # Debounce stage in front of the queue: latest target per key wins
+        self._coalesce_window_s = coalesce_window_s
+        self._coalescing: dict[str, _CoalescedCommand] = {}
+        self.coalesced_writes = 0   # writes saved by coalescing/superseding
+
+        # Confirmation mode (see async_set_state_confirmation)
+        self._expect_state: Callable[[StateCheck], asyncio.Future[None]] | None = None
+        self._latest_request: dict[str, bytearray] = {}
+
         LOGGER.debug("GiraBLEClient initialized for %s (%s)", name, address)
     
     # -------------------------------------------------------------------------
     # Idle disconnect helpers
     # -------------------------------------------------------------------------
     def _cancel_idle_disconnect(self) -> None:
+        self._idle_since = None
         if self._idle_disconnect_handle is not None:
             try:
                 self._idle_disconnect_handle.cancel()
@@ -298,88 +465,635 @@ class GiraBLEClient:
 
     def _schedule_idle_disconnect(self) -> None:
         self._cancel_idle_disconnect()
+        self._idle_since = time.monotonic()
 
         def _cb() -> None:
+            self.stats.idle_disconnects += 1
             self.hass.async_create_task(self._disconnect_now())
 
-        self._idle_disconnect_handle = self.hass.loop.call_later(self._idle_disconnect_s, _cb)
+        delay = self._idle_disconnect_s
+        if self._hold_until is not None:
+            delay = max(delay, self._hold_until - time.monotonic())
+        self._idle_disconnect_handle = self.hass.loop.call_later(delay, _cb)
+        # More commands for this device: keep the link (and slot) for them.
+        if not self._queue and not self._coalescing:
+            self._scheduler.async_link_idle(self)
 
     async def _disconnect_now(self) -> None:
         async with self._is_connecting:
             self._cancel_idle_disconnect()
-            if self._client and self._client.is_connected:
-                try:
+            try:
+                if self._client and self._client.is_connected:
                     await self._client.disconnect()
-                finally:
-                    self._client = None
+            finally:
+                self._client = None
+                self._scheduler.async_release(self)
+
+    def _record_command_gap(self) -> None:
+        """Learn the idle timeout from the gaps between commands.
+
+        The link is held long enough to cover most observed gaps, within
+        [IDLE_DISCONNECT_MIN_S, IDLE_DISCONNECT_MAX_S]. Devices whose commands are
+        further apart than the maximum get the minimum: holding their link only
+        occupies an adapter slot.
+        """
+        now = time.monotonic()
+        if self._last_command_monotonic is not None:
+            self._command_gaps.add(now - self._last_command_monotonic)
+        self._last_command_monotonic = now
+
+        if len(self._command_gaps) < IDLE_DISCONNECT_MIN_SAMPLES:
+            return
+        gap = self._command_gaps.percentile(IDLE_DISCONNECT_PERCENTILE)
+        if gap is None or gap > IDLE_DISCONNECT_MAX_S:
+            self._idle_disconnect_s = IDLE_DISCONNECT_MIN_S
+        else:
+            self._idle_disconnect_s = min(
+                IDLE_DISCONNECT_MAX_S, max(IDLE_DISCONNECT_MIN_S, gap * 1.2)
+            )
+
+    def rank_routes(self) -> list[Route]:
+        """Return the adapters that can reach the device, best first."""
+        return self.router.rank(self.transport.routes(self.address), self._scheduler.backlog)
+
+    def resolve_adapter(self) -> str | None:
+        """Return the adapter the device would be connected through."""
+        routes = self.rank_routes()
+        return routes[0].source if routes else None
+
+    @property
+    def idle_disconnect_s(self) -> float:
+        """Return the current (learned) idle disconnect timeout."""
+        return self._idle_disconnect_s
+
+    @property
+    def idle_for(self) -> float:
+        """Return how long the open link has been idle (0 if not idle)."""
+        if self._idle_since is None:
+            return 0.0
+        return time.monotonic() - self._idle_since
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True if a GATT link to the device is open."""
+        return self._client is not None and self._client.is_connected
+
+    @property
+    def is_idle(self) -> bool:
+        """Return True if the link is open but only waiting for its idle disconnect."""
+        return self._idle_disconnect_handle is not None and not self._is_connecting.locked()
+
+    async def async_release_idle_link(self) -> None:
+        """Disconnect now instead of at the idle timeout (frees the adapter slot)."""
+        await self._disconnect_now()
+
+    async def _drop_client(self) -> None:
+        """Best-effort disconnect of the current link and release of its slot."""
+        try:
+            if self._client and self._client.is_connected:
+                await self._client.disconnect()
+        except Exception:
+            pass
+        self._client = None
+        self._scheduler.async_release(self)
+
+    def _on_disconnected(self, client: GiraLink) -> None:
+        """Handle the device dropping the link."""
+        if client is not self._client:
+            return
+        LOGGER.debug("%s (%s) disconnected.", self.name, self.address)
+        self._cancel_idle_disconnect()
+        self._client = None
+        self._scheduler.async_release(self)
+
+    # -------------------------------------------------------------------------
+    # Command queue
+    # -------------------------------------------------------------------------
+    async def send_command(
+        self,
+        command: bytearray,
+        *,
+        response: bool = True,
+        priority: int = PRIORITY_NORMAL,
+        key: str | None = None,
+    ) -> None:
+        """Queue a command and wait until it was sent, superseded or pre-empted.
+
+        Lower priority values are sent first. A queued command is dropped when a
+        newer command with the same key arrives, and so is one still waiting
+        in the coalescing window. A STOP (PRIORITY_STOP) also drops queued or
+        coalescing shutter movement and cancels an in-flight one.
+        Superseded commands return without error.
+        """
+        await self._enqueue((command,), response, priority, key).future
+
+    async def send_session(
+        self,
+        commands: Sequence[bytearray],
+        *,
+        response: bool = False,
+        priority: int = PRIORITY_NORMAL,
+        key: str | None = None,
+    ) -> SessionResult:
+        """Send several commands in order over one link-up.
+
+        The commands are one queue entry: they are written back to back while
+        the link is held, with no idle disconnect or other command in between.
+        After a failed write the reconnect resumes at the first unsent command.
+        A command the link cannot carry (e.g. the heating timer through an
+        ESP32 node) is skipped and the session goes on with the next one.
+        Instead of raising, the result tells how far the session got; a
+        superseded or pre-empted session stops where it was.
+        """
+        if not commands:
+            return SessionResult(0, 0, ())
+        item = self._enqueue(tuple(commands), response, priority, key, session=True)
+        error: str | None = None
+        try:
+            await item.future
+        except UpdateFailed as err:
+            error = str(err)
+        return SessionResult(
+            len(item.write_s), len(item.commands), tuple(item.write_s), error, tuple(item.skipped)
+        )
+
+    def _enqueue(
+        self,
+        commands: tuple[bytearray, ...],
+        response: bool,
+        priority: int,
+        key: str | None,
+        *,
+        session: bool = False,
+    ) -> _QueuedCommand:
+        """Put commands on the queue (see send_command) and start the worker."""
+        self._record_command_gap()
+        if self.prewarm_schedule.record(dt_util.now()) and self._state_store is not None:
+            self._state_store.async_update_prewarm(self.address, self.prewarm_schedule.as_dict())
+        item = _QueuedCommand(
+            priority,
+            next(self._queue_seq),
+            commands,
+            response,
+            key,
+            self.hass.loop.create_future(),
+            skipped=[] if session else None,
+        )
+
+        if key is not None:
+            self._latest_request[key] = commands[-1]
+            self._drop_coalescing(key)
+            self._drop_queued(key)
+        if priority == PRIORITY_STOP:
+            self._latest_request[KEY_SHUTTER_MOTION] = commands[-1]
+            self._drop_coalescing(KEY_SHUTTER_MOTION)
+            self._drop_queued(KEY_SHUTTER_MOTION)
+            active = self._active
+            if (
+                active is not None
+                and active.key == KEY_SHUTTER_MOTION
+                and active.priority > priority
+                and self._active_task is not None
+            ):
+                LOGGER.debug("Pre-empting in-flight command on %s", self.name)
+                active.superseded = True
+                if not self._connecting:
+                    # Mid-write: cancel it. While connecting, the connection is
+                    # finished for the STOP and only the superseded write is skipped.
+                    self._active_task.cancel()
+
+        heapq.heappush(self._queue, item)
+        if self._queue_worker is None or self._queue_worker.done():
+            self._queue_worker = self.hass.async_create_background_task(
+                self._async_process_queue(), f"{DOMAIN} command queue {self.address}"
+            )
+        return item
+
+    def _drop_queued(self, key: str) -> None:
+        """Resolve and remove queued (not yet active) commands with the given key."""
+        kept: list[_QueuedCommand] = []
+        for queued in self._queue:
+            if queued.key == key:
+                LOGGER.debug("Dropping superseded command %s for %s", queued.commands[0].hex(), self.name)
+                self.coalesced_writes += 1
+                if not queued.future.done():
+                    queued.future.set_result(None)
+            else:
+                kept.append(queued)
+        if len(kept) != len(self._queue):
+            heapq.heapify(kept)
+            self._queue = kept
+
+    def _drop_coalescing(self, key: str) -> None:
+        """Resolve and discard a command still waiting in the coalescing window."""
+        pending = self._coalescing.pop(key, None)
+        if pending is None:
+            return
+        LOGGER.debug("Dropping coalescing command %s for %s", pending.command.hex(), self.name)
+        if pending.flush is not None:
+            pending.flush.cancel()
+        self.coalesced_writes += 1
+        if not pending.future.done():
+            pending.future.set_result(None)
+
+    async def _send_coalesced(self, command: bytearray, *, key: str, response: bool = True) -> None:
+        """Send a command after the coalescing window; newer commands replace it.
+
+        All callers within one window share the outcome of the single write.
+        """
+        if self._coalesce_window_s <= 0:
+            await self.send_command(command, response=response, key=key)
+            return
+
+        pending = self._coalescing.get(key)
+        if pending is not None:
+            pending.command = command
+            pending.response = response
+            self.coalesced_writes += 1
+        else:
+            pending = self._coalescing[key] = _CoalescedCommand(
+                command, response, self.hass.loop.create_future()
+            )
+            pending.flush = self.hass.loop.call_later(
+                self._coalesce_window_s, self._flush_coalesced, key
+            )
+
+        # Shield: one caller giving up must not cancel the write for the others.
+        await asyncio.shield(pending.future)
+
+    def _flush_coalesced(self, key: str) -> None:
+        pending = self._coalescing.pop(key, None)
+        if pending is None:
+            return
+
+        # Queued right away: a command coalescing behind this one must not be
+        # dropped by it, which it would be if this was queued later.
+        item = self._enqueue((pending.command,), pending.response, PRIORITY_NORMAL, key)
+
+        async def _send() -> None:
+            try:
+                await item.future
+            except Exception as err:  # handed to the waiting callers
+                if not pending.future.done():
+                    pending.future.set_exception(err)
+            else:
+                if not pending.future.done():
+                    pending.future.set_result(None)
+
+        self.hass.async_create_task(_send())
+
+    async def _async_process_queue(self) -> None:
+        """Send queued commands one at a time, highest priority first."""
+        while self._queue:
+            item = heapq.heappop(self._queue)
+            if item.future.done():
+                continue
+
+            self._active = item
+            self._active_task = asyncio.create_task(
+                self._send_now(
+                    item.commands, response=item.response, write_s=item.write_s, skipped=item.skipped
+                )
+            )
+            try:
+                # asyncio.wait does not raise when the active task is cancelled.
+                await asyncio.wait((self._active_task,))
+            finally:
+                task, self._active, self._active_task = self._active_task, None, None
+
+            if item.future.done():
+                continue
+            if task.cancelled():
+                # Pre-empted by a higher-priority command
+                item.future.set_result(None)
+            elif (err := task.exception()) is not None:
+                item.future.set_exception(err)
+            else:
+                item.future.set_result(None)
+
+        # Queue drained: the link may now go to another device waiting for the slot.
+        if self.is_idle:
+            self._scheduler.async_link_idle(self)
+
+    # -------------------------------------------------------------------------
+    # Confirmation mode
+    # -------------------------------------------------------------------------
+    @callback
+    def async_set_state_confirmation(
+        self, expect_state: Callable[[StateCheck], asyncio.Future[None]] | None
+    ) -> None:
+        """Confirm set-position/setpoint writes by reported state instead of a write response.
+
+        ``expect_state`` is the coordinator's ``async_expect_state``; None
+        switches back to write-with-response.
+        """
+        self._expect_state = expect_state
+
+    async def _send_confirmed(
+        self,
+        command: bytearray,
+        *,
+        key: str,
+        check: StateCheck,
+        resend: bytearray | None = None,
+    ) -> None:
+        """Write without response and wait for the device to report the new state.
+
+        Resends up to CONFIRM_RESENDS times when no matching state arrives within
+        CONFIRM_TIMEOUT_S; ``resend`` replaces ``command`` for those (the absolute
+        form of a relative command, which must not be applied twice). A command
+        superseded by a newer one (or a STOP) is not confirmed or resent.
+        """
+        expect_state = self._expect_state
+        if expect_state is None:
+            await self._send_coalesced(command, key=key)
+            return
+
+        sent = command
+        for attempt in range(CONFIRM_RESENDS + 1):
+            # Register before writing so a fast state change is not missed.
+            confirmation = expect_state(check)
+            try:
+                if attempt == 0:
+                    await self._send_coalesced(command, key=key, response=False)
+                else:
+                    self.stats.resends += 1
+                    sent = resend if resend is not None else command
+                    await self.send_command(sent, response=False, key=key)
+                if self._latest_request.get(key) is not sent:
+                    return
+                await asyncio.wait_for(confirmation, CONFIRM_TIMEOUT_S)
+                self.stats.confirmed += 1
+                return
+            except asyncio.TimeoutError:
+                if self._latest_request.get(key) is not sent:
+                    return
+                LOGGER.debug("%s did not confirm %s in time", self.name, sent.hex())
+            finally:
+                confirmation.cancel()
+
+        self.stats.unconfirmed += 1
+        raise UpdateFailed(f"{self.name} did not confirm the command")
 
     # -------------------------------------------------------------------------
     # Core send path
     # -------------------------------------------------------------------------
-    async def send_command(self, command: bytearray, *, response: bool = True) -> None:
-        """Send a command using a short-lived persistent connection (idle disconnect)."""
+    async def _send_now(
+        self,
+        commands: Sequence[bytearray] | None,
+        *,
+        response: bool = True,
+        write_s: list[float] | None = None,
+        skipped: list[int] | None = None,
+    ) -> None:
+        """Send commands using a short-lived persistent connection (idle disconnect).
+
+        ``commands=None`` only opens the link (breaker probe, pre-warm). Write
+        durations are appended to ``write_s``; commands already listed there
+        are not written again. With a ``skipped`` list (sessions), commands the
+        link cannot carry are recorded there instead of failing the send.
+        """
+        if write_s is None:
+            write_s = []
         async with self._is_connecting:
             # If already connected, reuse it and cancel pending idle disconnect.
             if self._client and self._client.is_connected:
+                if commands is None:
+                    # Probe or pre-warm of an open link: restart its idle timer.
+                    self._schedule_idle_disconnect()
+                    return
                 self._cancel_idle_disconnect()
                 LOGGER.debug("Client already connected, sending command directly.")
                 try:
-                    LOGGER.debug("Sending command: %s", command.hex())
-                    await asyncio.wait_for(
-                        self._client.write_gatt_char(GIRA_WRITE_CHAR_UUID, command, response=response),
-                        timeout=self._write_timeout_s,
-                    )
+                    await self._async_write_all(self._client, commands, response, write_s, skipped)
+                    # First command on a pre-warmed or probed link: subscribe now.
+                    await self._async_start_notify(self._client)
                     self._schedule_idle_disconnect()
                     return
+                except asyncio.CancelledError:
+                    # Pre-empted mid-write: keep the link for the next command.
+                    self._schedule_idle_disconnect()
+                    raise
+                except UnsupportedCommandError as err:
+                    # Nothing wrong with the link; reconnecting would not help.
+                    self._schedule_idle_disconnect()
+                    raise UpdateFailed(f"{self.name}: {err}") from err
                 except (BleakError, asyncio.TimeoutError) as e:
                     LOGGER.warning("Failed to send command to connected device: %s", e)
+                    self.stats.retries += 1
                     # Force a clean reconnect
-                    try:
-                        await self._client.disconnect()
-                    except Exception:
-                        pass
-                    self._client = None
+                    await self._drop_client()
+
+            # Unreachable device: fail fast until a probe gets through.
+            if commands is not None and not self.breaker.allow():
+                self.stats.fast_failures += 1
+                raise UpdateFailed(f"{self.name} is unreachable; waiting for it to advertise again.")
 
             # Not connected -> connect
             LOGGER.debug("Attempting to connect to %s (%s) to send command.", self.name, self.address)
 
-            device = bluetooth.async_ble_device_from_address(self.hass, self.address)
-            if not device:
+            routes = self.rank_routes()[:CONNECT_MAX_ATTEMPTS]
+            if not routes:
                 LOGGER.error("Device %s (%s) not found in Bluetooth registry.", self.name, self.address)
+                self.breaker.record_failure()
                 raise UpdateFailed(f"Device {self.name} not found.")
 
+            # Try the adapters in rank order; a bad path gets one attempt, the
+            # last one tried gets the rest. Probes and devices whose previous
+            # command failed get a single attempt, and every retry needs a
+            # token from the shared budget.
+            if commands is None or self.breaker.consecutive_failures:
+                attempts = routes[:1]
+            else:
+                attempts = routes + [routes[-1]] * (CONNECT_MAX_ATTEMPTS - len(routes))
+            budget = self._scheduler.retry_budget
+            budget.record_attempt()
+            error: Exception | None = None
+            for index, route in enumerate(attempts):
+                if index:
+                    if not budget.withdraw(1):
+                        LOGGER.debug("Retry budget exhausted; giving up on %s", self.name)
+                        break
+                    self.stats.retries += 1
+                    if route.source == attempts[index - 1].source:
+                        await asyncio.sleep(CONNECT_RETRY_BACKOFF_S)
+                try:
+                    await self._async_send_via(route, commands, response, write_s, skipped)
+                    return
+                except UnsupportedCommandError as err:
+                    raise UpdateFailed(f"{self.name}: {err}") from err
+                except (BleakError, asyncio.TimeoutError) as e:
+                    error = e
+                    LOGGER.debug("Connecting to %s via %s failed: %s", self.name, route.source, e)
+
+            LOGGER.error("Failed to connect or send command to %s (%s): %s", self.name, self.address, error)
+            self.stats.failures += 1
+            self.breaker.record_failure()
+            raise UpdateFailed(f"Failed to connect and send command to {self.name}: {error}") from error
+
+    async def _async_send_via(
+        self,
+        route: Route,
+        commands: Sequence[bytearray] | None,
+        response: bool,
+        write_s: list[float],
+        skipped: list[int] | None = None,
+    ) -> None:
+        """Open a link through one adapter and send the commands on it."""
+        # Wait for a free connection slot on that adapter.
+        await self._scheduler.async_acquire(self, route.source)
+
+        try:
+            self._connecting = True
+            connect_start = time.monotonic()
             try:
-                client = await establish_connection(
-                    BleakClient,
-                    device,
+                client = await self.transport.connect(
+                    route.device,
                     self.name,
-                    pair=True,
-                    timeout=5,
-                    max_attempts=3,
+                    disconnected_callback=self._on_disconnected,
+                    max_attempts=1,
                 )
-                self._client = client
-                LOGGER.info("Successfully connected to %s (%s).", self.name, self.address)
+            except (BleakError, asyncio.TimeoutError):
+                self.router.record_failure(route.source)
+                raise
+            finally:
+                self._connecting = False
+            connect_s = time.monotonic() - connect_start
+            self.stats.record_connect(connect_s)
+            self.router.record_connect(route.source, connect_s)
+            self.breaker.record_success()
+            self._client = client
+            LOGGER.info("Successfully connected to %s (%s) via %s.", self.name, self.address, route.source)
 
-                LOGGER.debug("Sending command: %s", command.hex())
-                await asyncio.wait_for(
-                    client.write_gatt_char(GIRA_WRITE_CHAR_UUID, command, response=response),
-                    timeout=self._write_timeout_s,
-                )
-                LOGGER.info("Command sent successfully to %s.", self.name)
+            if commands is None:
+                # Pre-warm or probe: no command waits, so subscribe right away.
+                await self._async_start_notify(client)
+                self._schedule_idle_disconnect()
+                return
+            if self._active is not None and self._active.superseded:
+                LOGGER.debug("Command superseded while connecting to %s; write skipped.", self.name)
+                self._schedule_idle_disconnect()
+                return
+
+            await self._async_write_all(client, commands, response, write_s, skipped)
+            LOGGER.info("Command sent successfully to %s.", self.name)
+
+            # Subscribe after the write so it does not delay the command.
+            await self._async_start_notify(client)
 
-                # Keep link open briefly for rapid successive commands
+            # Keep link open briefly for rapid successive commands
+            self._schedule_idle_disconnect()
+
+        except (asyncio.CancelledError, UnsupportedCommandError):
+            # Pre-empted or a command the link cannot carry: keep an
+            # established link, free the slot otherwise.
+            if self.is_connected:
                 self._schedule_idle_disconnect()
+            else:
+                await self._drop_client()
+            raise
 
-            except (BleakError, asyncio.TimeoutError) as e:
-                LOGGER.error("Failed to connect or send command to %s (%s): %s", self.name, self.address, e)
-                # Clean up
-                try:
-                    if self._client and self._client.is_connected:
-                        await self._client.disconnect()
-                except Exception:
-                    pass
-                self._client = None
-                raise UpdateFailed(f"Failed to connect and send command to {self.name}: {e}") from e
+        except Exception:
+            # Never leak the adapter slot; the caller decides whether to fall back.
+            await self._drop_client()
+            raise
+
+    # -------------------------------------------------------------------------
+    # Pre-warm
+    # -------------------------------------------------------------------------
+    async def async_prewarm(self, hold_s: float = DEFAULT_PREWARM_HOLD_S) -> bool:
+        """Open the link ahead of an expected command and keep it for ``hold_s``.
+
+        Only uses a free adapter slot (never waits for or evicts another link)
+        and skips devices whose breaker is open. The held link is idle, so it is
+        still released early when a command needs the slot. Returns True if the
+        link is open.
+        """
+        if not self.breaker.allow():
+            return False
+        if not self.is_connected:
+            source = self.resolve_adapter()
+            if source is None or not self._scheduler.has_free_slot(source):
+                LOGGER.debug("No free adapter slot to pre-warm %s", self.name)
+                return False
+        self._hold_until = time.monotonic() + hold_s
+        try:
+            await self._send_now(None)
+        except UpdateFailed as err:
+            LOGGER.debug("Pre-warm of %s failed: %s", self.name, err)
+            return False
+        self.stats.prewarms += 1
+        return self.is_connected
+
+    # -------------------------------------------------------------------------
+    # Circuit breaker
+    # -------------------------------------------------------------------------
+    @callback
+    def async_device_seen(self) -> None:
+        """Handle an advertisement of the device: probe an open breaker when due."""
+        if not self.breaker.try_probe():
+            return
+        self._probe_task = self.hass.async_create_background_task(
+            self._async_probe(), f"{DOMAIN} probe {self.address}"
+        )
+
+    async def _async_probe(self) -> None:
+        """Try one connect; a success closes the breaker and keeps the link idle."""
+        self.stats.probes += 1
+        LOGGER.debug("Probing unreachable %s (%s)", self.name, self.address)
+        try:
+            await self._send_now(None)
+        except UpdateFailed:
+            LOGGER.debug("Probe of %s failed; breaker stays open.", self.name)
+
+    async def _async_write(self, client: GiraLink, command: bytearray, response: bool) -> float:
+        """Write one command to the device; records and returns the write time."""
+        LOGGER.debug("Sending command: %s", command.hex())
+        start = time.monotonic()
+        await asyncio.wait_for(
+            client.write_gatt_char(GIRA_WRITE_CHAR_UUID, command, response=response),
+            timeout=self._write_timeout_s,
+        )
+        elapsed = time.monotonic() - start
+        self.stats.write_s.add(elapsed)
+        return elapsed
+
+    async def _async_write_all(
+        self,
+        client: GiraLink,
+        commands: Sequence[bytearray],
+        response: bool,
+        write_s: list[float],
+        skipped: list[int] | None = None,
+    ) -> None:
+        """Write the commands not yet in ``write_s`` (or ``skipped``) back to back."""
+        for index in range(len(write_s) + len(skipped or ()), len(commands)):
+            try:
+                write_s.append(await self._async_write(client, commands[index], response))
+            except UnsupportedCommandError as err:
+                if skipped is None:
+                    raise
+                LOGGER.warning("%s: command %d of %d skipped: %s", self.name, index + 1, len(commands), err)
+                skipped.append(index)
+
+    async def _async_start_notify(self, client: GiraLink) -> None:
+        """Subscribe to state notifications once per link (best-effort)."""
+        if not self._notify_supported or self._notifying is client:
+            return
+        try:
+            await asyncio.wait_for(
+                client.start_notify(GIRA_READ_CHAR_UUID, self._handle_notification),
+                timeout=self._write_timeout_s,
+            )
+            self._notifying = client
+        except (BleakError, asyncio.TimeoutError) as e:
+            # Device without the characteristic: rely on advertisements only.
+            LOGGER.debug("Notifications unavailable on %s: %s", self.name, e)
+            self._notify_supported = False
+
+    def _handle_notification(self, _sender: Any, data: bytearray) -> None:
+        if self._on_notification is not None:
+            self._on_notification(bytes(data))
 
     async def send_set_position_command(self, position_u8: int) -> None:
         """Send absolute position command to the shutter. The device expects one byte 0x00..0xFF (mapped from 0..100% in the cover entity)."""
@@ -388,63 +1102,143 @@ class GiraBLEClient:
             pos = 0
         if pos > 0xFF:
             pos = 0xFF
-        await self.send_command(_generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, pos))
+        target = shutter_position_from_raw(pos)
+
+        def _moved_towards_target(before: dict[str, Any], now: dict[str, Any]) -> bool:
+            # Confirmed once the shutter is there, or has moved from where it was
+            # towards it without passing it. A position beyond the target is
+            # still heading somewhere else (e.g. an earlier up/down).
+            position, start = now.get("position"), before.get("position")
+            if position is None:
+                return False
+            if position == target:
+                return True
+            if start is None or position == start:
+                return False
+            return (position - start) * (target - start) > 0 and (target - position) * (target - start) > 0
+
+        await self._send_confirmed(
+            generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, pos),
+            key=KEY_SHUTTER_MOTION,
+            check=_moved_towards_target,
+        )
+
+    async def send_stop_and_set_position(self, position_u8: int) -> SessionResult:
+        """Stop the shutter, then send the new absolute position, in one session."""
+        pos = min(max(int(position_u8), 0), 0xFF)
+        return await self.send_session(
+            [
+                generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP),
+                generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, pos),
+            ],
+            key=KEY_SHUTTER_MOTION,
+        )
 
     async def send_shutter_up_command(self) -> None:
         """Send the command to raise the shutter."""
-        await self.send_command(_generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_UP))
+        await self.send_command(
+            generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_UP), key=KEY_SHUTTER_MOTION
+        )
 
     async def send_shutter_down_command(self) -> None:
         """Send the command to lower the shutter."""
-        await self.send_command(_generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_DOWN))
+        await self.send_command(
+            generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_DOWN), key=KEY_SHUTTER_MOTION
+        )
 
     async def send_shutter_stop_command(self) -> None:
-        """Stop shutter movement (property 0xFD, value 0x00)."""
-        cmd = _generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP)
-        await self.send_command(cmd, response=True)
+        """Stop shutter movement (property 0xFD, value 0x00). Jumps ahead of queued commands."""
+        cmd = generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP)
+        await self.send_command(cmd, response=True, priority=PRIORITY_STOP)
 
     async def send_thermostat_set_target_temperature(self, temp_c: float) -> None:
         """Set thermostat target temperature (°C) using device-specific WRITE encoding.
 
         raw_u16 = round((21 + temp_c) * 50 + 1000)
         """
-        raw = int(round((21.0 + float(temp_c)) * 50.0 + 1000.0))
-
-        if raw < 0:
-            raw = 0
-        if raw > 0xFFFF:
-            raw = 0xFFFF
+        cmd = generate_thermo_target_temperature_command(temp_c)
+        await self._send_confirmed(cmd, key=KEY_THERMO_TARGET, check=_target_reported(temp_c))
 
-        hi = (raw >> 8) & 0xFF
-        lo = raw & 0xFF
-
-        cmd = bytearray([
-            0xF6, 0x00, 0x65, 0x01,
-            THERMO_PROPERTY_ID_TARGET_TEMP,  # 0xF5
-            0x10, 0x01,
-            hi, lo
-        ])
-
-        await self.send_command(cmd, response=True)
 
+    async def send_thermostat_heat_and_target(self, start: bool, temp_c: float) -> SessionResult:
+        """Start/stop the heating timer, then set the target temperature, in one session."""
+        return await self.send_session(
+            [
+                generate_thermo_u8_command(
+                    THERMO_PROPERTY_ID_TIMER_HEAT,
+                    THERMO_VALUE_START if start else THERMO_VALUE_STOP,
+                ),
+                generate_thermo_target_temperature_command(temp_c),
+            ],
+            key=KEY_THERMO_SESSION,
+        )
 
     async def send_thermostat_timer_heat(self, start: bool) -> None:
         """Start/stop heating timer (property 0xFE)."""
-        cmd = _generate_thermo_u8_command(
+        cmd = generate_thermo_u8_command(
             THERMO_PROPERTY_ID_TIMER_HEAT,
             THERMO_VALUE_START if start else THERMO_VALUE_STOP,
         )
-        await self.send_command(cmd, response=False)
+        await self.send_command(cmd, response=False, key=KEY_THERMO_TIMER)
 
-    async def send_thermostat_step(self, up: bool) -> None:
-        """Step target temperature by ±0.5°C (property 0xF6)."""
-        cmd = _generate_thermo_u8_command(
+    @property
+    def supports_thermostat_step(self) -> bool:
+        """Return False if the transport has no thermostat step command."""
+        return getattr(self.transport, "supports_thermostat_step", True)
+
+    def _setpoint_pending(self) -> bool:
+        """Return True while a setpoint is coalescing, queued or being written."""
+        keys = (KEY_THERMO_TARGET, KEY_THERMO_SESSION)
+        active = self._active
+        return (
+            any(key in self._coalescing for key in keys)
+            or (active is not None and active.key in keys)
+            or any(item.key in keys and not item.future.done() for item in self._queue)
+        )
+
+    async def send_thermostat_step(self, up: bool, temp_c: float) -> None:
+        """Step target temperature by ±0.5°C (property 0xF6) to ``temp_c``.
+
+        Sent like a setpoint (same key and confirmation), so it keeps its place
+        among setpoints. A step is relative to the device's target: while
+        another setpoint is on its way, and for resends, the absolute setpoint
+        is sent instead.
+        """
+        if self._setpoint_pending():
+            await self.send_thermostat_set_target_temperature(temp_c)
+            return
+        cmd = generate_thermo_u8_command(
             THERMO_PROPERTY_ID_STEP,
             0x01 if up else 0x00,
         )
-        await self.send_command(cmd, response=False)
+        await self._send_confirmed(
+            cmd,
+            key=KEY_THERMO_TARGET,
+            check=_target_reported(temp_c),
+            resend=generate_thermo_target_temperature_command(temp_c),
+        )
         
     async def async_close(self) -> None:
         """Close/disconnect the BLE client."""
+        for pending in self._coalescing.values():
+            if pending.flush is not None:
+                pending.flush.cancel()
+            if not pending.future.done():
+                pending.future.cancel()
+        self._coalescing.clear()
+        for queued in self._queue:
+            if not queued.future.done():
+                queued.future.cancel()
+        self._queue.clear()
+        if self._queue_worker is not None:
+            self._queue_worker.cancel()
+            self._queue_worker = None
+        if self._active is not None and not self._active.future.done():
+            self._active.future.cancel()
+        if self._active_task is not None:
+            self._active_task.cancel()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
         await self._disconnect_now()
         
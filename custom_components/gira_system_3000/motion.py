@@ -0,0 +1,304 @@
+"""Shutter movement tracking from the advertised position stream.
+
+Gira shutters only broadcast their position; they never announce that a
+movement started or ended. ``ShutterMotion`` derives direction and speed from
+consecutive position changes and reports a stop once the position has not
+changed for ``MOTION_STOP_TIMEOUT_S``. The stop timers of all shutters share
+one ``TimerWheel``, so tracking many moving shutters costs a single event loop
+timer instead of one ``call_later`` handle per device and position change.
+
+Every finished run also teaches the shutter's ``TravelModel`` (speed per
+direction), which is used to estimate the position between advertisements
+and the time a movement will take.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+from collections.abc import Callable, Hashable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_TIMER_WHEEL,
+    MOTION_STOP_TIMEOUT_S,
+    MOTION_WHEEL_SLOTS,
+    MOTION_WHEEL_TICK_S,
+    SHUTTER_DEFAULT_TRAVEL_S,
+    TRAVEL_MIN_DISTANCE,
+)
+
+# Weight of the newest speed sample.
+_ALPHA = 0.5
+# Weight of a finished run in the learned speed.
+_TRAVEL_ALPHA = 0.3
+# Never extrapolate further than this past the last advertisement.
+_MAX_EXTRAPOLATION_S = 1.0
+
+DIRECTION_OPENING = 1
+DIRECTION_CLOSING = -1
+
+
+class TimerWheel:
+    """Hashed timer wheel with a resolution of ``tick_s``.
+
+    Timers are keyed; scheduling a key again replaces its timer, which is the
+    common case (every position change pushes the stop deadline out). The loop
+    timer only runs while at least one timer is pending.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        tick_s: float = MOTION_WHEEL_TICK_S,
+        slots: int = MOTION_WHEEL_SLOTS,
+    ) -> None:
+        """Initialize an empty wheel."""
+        self._loop = loop
+        self.tick_s = tick_s
+        # slot -> key -> (remaining full turns, callback)
+        self._slots: list[dict[Hashable, tuple[int, Callable[[], None]]]] = [
+            {} for _ in range(slots)
+        ]
+        self._where: dict[Hashable, int] = {}
+        self._cursor = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._next_tick = 0.0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    @callback
+    def schedule(self, key: Hashable, delay_s: float, action: Callable[[], None]) -> None:
+        """Call ``action`` after about ``delay_s`` (rounded up to a tick)."""
+        self.cancel(key)
+        if self._handle is None:
+            self._next_tick = self._loop.time() + self.tick_s
+            self._handle = self._loop.call_at(self._next_tick, self._tick)
+        # Ticks after the next one until due.
+        remaining = delay_s - (self._next_tick - self._loop.time())
+        ticks = max(0, math.ceil(remaining / self.tick_s))
+        turns, offset = divmod(ticks, len(self._slots))
+        slot = (self._cursor + offset) % len(self._slots)
+        self._slots[slot][key] = (turns, action)
+        self._where[key] = slot
+
+    @callback
+    def cancel(self, key: Hashable) -> None:
+        """Cancel the timer of ``key`` (no-op if none is pending)."""
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    @callback
+    def _tick(self) -> None:
+        bucket = self._slots[self._cursor]
+        due: list[Callable[[], None]] = []
+        for key, (turns, action) in list(bucket.items()):
+            if turns:
+                bucket[key] = (turns - 1, action)
+                continue
+            del bucket[key]
+            del self._where[key]
+            due.append(action)
+        self._cursor = (self._cursor + 1) % len(self._slots)
+
+        if self._where:
+            self._next_tick += self.tick_s
+            self._handle = self._loop.call_at(self._next_tick, self._tick)
+        else:
+            self._handle = None
+        for action in due:
+            action()
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop all timers."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for bucket in self._slots:
+            bucket.clear()
+        self._where.clear()
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the integration-wide timer wheel, creating it on first use."""
+    wheel: TimerWheel | None = hass.data.get(DATA_TIMER_WHEEL)
+    if wheel is None:
+        wheel = hass.data[DATA_TIMER_WHEEL] = TimerWheel(hass.loop)
+    return wheel
+
+
+class TravelModel:
+    """Learned speed of one shutter per direction (percent per second).
+
+    A direction without runs yet borrows the other direction's speed, and the
+    default full travel time applies until the first run finished.
+    """
+
+    def __init__(self, default_travel_s: float = SHUTTER_DEFAULT_TRAVEL_S) -> None:
+        """Initialize the model with the default speed."""
+        self.default_speed = 100.0 / default_travel_s
+        self._speed: dict[int, float] = {}
+        self.runs = 0
+
+    def speed(self, direction: int) -> float:
+        """Return the expected speed (always positive) in one direction."""
+        speed = self._speed.get(direction)
+        if speed is None:
+            speed = self._speed.get(-direction, self.default_speed)
+        return speed
+
+    def learn(self, direction: int, distance: float, duration_s: float) -> None:
+        """Add a finished run; short runs are dominated by frame timing and ignored."""
+        if distance < TRAVEL_MIN_DISTANCE or duration_s <= 0:
+            return
+        sample = distance / duration_s
+        speed = self._speed.get(direction)
+        self._speed[direction] = sample if speed is None else speed + _TRAVEL_ALPHA * (sample - speed)
+        self.runs += 1
+
+    def travel_s(self, start: float, target: float) -> float:
+        """Return the expected seconds to move from ``start`` to ``target``."""
+        if target == start:
+            return 0.0
+        direction = DIRECTION_OPENING if target > start else DIRECTION_CLOSING
+        return abs(target - start) / self.speed(direction)
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the learned speeds for diagnostics."""
+        return {
+            "opening_pct_per_s": round(self.speed(DIRECTION_OPENING), 2),
+            "closing_pct_per_s": round(self.speed(DIRECTION_CLOSING), 2),
+            "runs": self.runs,
+        }
+
+
+class ShutterMotion:
+    """Movement state of one shutter, fed with its position changes.
+
+    Positions are percent with 100 = open, so a rising position means opening.
+    """
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        key: Hashable,
+        on_stopped: Callable[[int], None],
+        stop_timeout_s: float = MOTION_STOP_TIMEOUT_S,
+    ) -> None:
+        """Initialize the tracker (not moving, position unknown)."""
+        self._wheel = wheel
+        self._key = key
+        self._on_stopped = on_stopped
+        self.stop_timeout_s = stop_timeout_s
+        self.position: int | None = None
+        self.direction = 0
+        self.velocity = 0.0  # percent per second, signed
+        self.moving_since: float | None = None
+        self.target: int | None = None  # commanded position, if known
+        self.travel = TravelModel()
+        self._last_change: float | None = None
+        self._run_start: int | None = None
+
+    @property
+    def moving(self) -> bool:
+        """Return True while the position is changing."""
+        return self.direction != 0
+
+    @property
+    def is_opening(self) -> bool:
+        """Return True while the shutter is opening."""
+        return self.direction == DIRECTION_OPENING
+
+    @property
+    def is_closing(self) -> bool:
+        """Return True while the shutter is closing."""
+        return self.direction == DIRECTION_CLOSING
+
+    @callback
+    def async_update(self, position: int, now: float) -> None:
+        """Record a new position (``now`` is ``time.monotonic()``)."""
+        previous, last = self.position, self._last_change
+        if previous is None or last is None or position == previous:
+            self.position = position
+            self._last_change = now
+            return
+
+        direction = DIRECTION_OPENING if position > previous else DIRECTION_CLOSING
+        if direction != self.direction:
+            # Started, or reversed: a reversed run ended at the previous
+            # position. The new run is timed from this first change on.
+            self._async_learn_run()
+            self.moving_since = now
+            self._run_start = position
+            self.velocity = 0.0
+        self.position = position
+        self._last_change = now
+        self.direction = direction
+        elapsed = now - last
+        if elapsed > 0 and elapsed < self.stop_timeout_s:
+            sample = (position - previous) / elapsed
+            self.velocity = sample if not self.velocity else self.velocity + _ALPHA * (sample - self.velocity)
+        self._wheel.schedule(self._key, self.stop_timeout_s, self._async_stopped)
+
+    @callback
+    def _async_learn_run(self) -> None:
+        if not self.moving or self._run_start is None or self.position is None:
+            return
+        if self.moving_since is None or self._last_change is None:
+            return
+        self.travel.learn(
+            self.direction,
+            abs(self.position - self._run_start),
+            self._last_change - self.moving_since,
+        )
+
+    @callback
+    def _async_stopped(self) -> None:
+        self._async_learn_run()
+        self.direction = 0
+        self.velocity = 0.0
+        self.moving_since = None
+        self.target = None
+        self._run_start = None
+        if self.position is not None:
+            self._on_stopped(self.position)
+
+    def estimate_position(self, now: float) -> float | None:
+        """Return the expected position at ``now`` (``time.monotonic()``).
+
+        While moving, the last advertised position is carried forward at the
+        speed measured in this run (the learned speed until there is one),
+        never past the commanded target or the end positions.
+        """
+        if self.position is None or not self.moving or self._last_change is None:
+            return self.position
+        elapsed = min(max(0.0, now - self._last_change), _MAX_EXTRAPOLATION_S)
+        speed = abs(self.velocity) or self.travel.speed(self.direction)
+        estimate = self.position + self.direction * speed * elapsed
+        if self.target is not None and (self.target - self.position) * self.direction >= 0:
+            estimate = min(estimate, self.target) if self.direction > 0 else max(estimate, self.target)
+        return min(100.0, max(0.0, estimate))
+
+    def time_to(self, target: int, now: float) -> float:
+        """Return the expected seconds until the shutter reaches ``target``."""
+        position = self.estimate_position(now)
+        if position is None:
+            # Unknown position: assume a full travel.
+            return 100.0 / self.travel.speed(DIRECTION_CLOSING if target < 50 else DIRECTION_OPENING)
+        return self.travel.travel_s(position, target)
+
+    @callback
+    def async_reset(self) -> None:
+        """Forget the state (device unavailable); no stop is reported."""
+        self._wheel.cancel(self._key)
+        self.position = None
+        self.direction = 0
+        self.velocity = 0.0
+        self.moving_since = None
+        self.target = None
+        self._last_change = None
+        self._run_start = None
@@ -0,0 +1,447 @@
+"""ESP32/MQTT proxy transport (see docs/00_overview.md).
+
+An ESP32 node runs one GATT session at a time. It is driven with single-line
+command strings on ``<base>/<node_id>/cmd`` and reports its state machine on
+``/status`` and parsed device events on ``/event`` (both JSON).
+
+``GiraMqttBridge`` owns the node subscriptions and is shared by all config
+entries. ``MqttTransport`` is a per-device ``GiraTransport`` view on a subset of
+the nodes: GATT writes on its links are translated into the documented command
+strings, and events are turned back into manufacturer frames for
+``on_advertisement`` (usually the dispatcher), so coordinators update whether
+or not a link is open.
+
+Publishing and subscribing are injected. ``async_get_mqtt_bridge`` wires them
+to Home Assistant's MQTT integration; tests and benchmarks use the in-memory
+``LocalBroker`` of benchmarks/simulator.py.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from bleak import BleakError
+
+from .codec import (
+    decode_command,
+    encode_shutter_frame,
+    encode_thermostat_frame,
+    lookup_shutter_raw,
+    shutter_position_table,
+    thermo_raw_from_reading,
+    thermo_temperature_from_command_raw,
+)
+from .const import (
+    DATA_MQTT_BRIDGE,
+    LOGGER,
+    MQTT_BASE_TOPIC,
+    SHUTTER_PROPERTY_ID_MOVE,
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+    SHUTTER_PROPERTY_ID_STOP,
+    SHUTTER_VALUE_UP,
+    THERMO_PROPERTY_ID_TARGET_TEMP,
+)
+from .transport import Route, UnsupportedCommandError
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+MessageCallback = Callable[[str, str], None]
+PublishCallable = Callable[[str, str], Awaitable[None]]
+SubscribeCallable = Callable[[str, MessageCallback], Awaitable[Callable[[], None]]]
+
+SOURCE_PREFIX = "mqtt:"
+
+# Extra time on top of the timeout sent to the node before giving up on its status.
+_STATUS_GRACE_S = 2.0
+
+
+class MqttPeer(NamedTuple):
+    """A device as resolved through one ESP32 node."""
+
+    node_id: str
+    address: str
+
+
+# -----------------------------------------------------------------------------
+# Payload translation
+# -----------------------------------------------------------------------------
+def command_string(data: bytes) -> str:
+    """Translate a GATT command into the ESP32 command string.
+
+    Raises UnsupportedCommandError for commands the node has no string for
+    (thermostat step and heating timer).
+    """
+    decoded = decode_command(data)
+    if decoded is not None:
+        device_type, prop, value = decoded
+        if device_type == "shutter":
+            if prop == SHUTTER_PROPERTY_ID_SET_POSITION:
+                return f"shutter set_pos={shutter_position_table()[value]}"
+            if prop == SHUTTER_PROPERTY_ID_MOVE:
+                return "shutter move=up" if value == SHUTTER_VALUE_UP else "shutter move=down"
+            if prop == SHUTTER_PROPERTY_ID_STOP:
+                return "shutter stop=1"
+        elif prop == THERMO_PROPERTY_ID_TARGET_TEMP:
+            return f"thermostat set_target_c={thermo_temperature_from_command_raw(value):g}"
+    raise UnsupportedCommandError(f"Command {bytes(data).hex()} has no MQTT equivalent")
+
+
+def event_frames(event: dict[str, Any]) -> list[bytes]:
+    """Translate an ``/event`` message into manufacturer frames."""
+    kind = event.get("type")
+    frames: list[bytes] = []
+    if kind == "shutter" and event.get("position") is not None:
+        frames.append(encode_shutter_frame(lookup_shutter_raw(event["position"])))
+    elif kind == "thermostat":
+        if event.get("current_c") is not None:
+            frames.append(encode_thermostat_frame(thermo_raw_from_reading(event["current_c"])))
+        if event.get("target_c") is not None:
+            frames.append(
+                encode_thermostat_frame(thermo_raw_from_reading(event["target_c"]), target=True)
+            )
+    return frames
+
+
+# -----------------------------------------------------------------------------
+# Nodes and links
+# -----------------------------------------------------------------------------
+class MqttLink:
+    """An open GATT session on an ESP32 node (GiraLink)."""
+
+    def __init__(
+        self,
+        node: _MqttNode,
+        address: str,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> None:
+        """Initialize the link."""
+        self._node = node
+        self.address = address
+        self._disconnected_callback = disconnected_callback
+        self.is_connected = True
+
+    async def write_gatt_char(self, char_specifier: str, data: bytes, response: bool = True) -> None:
+        """Publish the command string for a GATT write."""
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        await self._node.async_publish(command_string(data))
+
+    async def start_notify(self, char_specifier: str, callback: Callable[[Any, bytearray], Any]) -> None:
+        """Enable notifications on the node.
+
+        State arrives as ``/event`` messages, which the bridge hands to
+        ``on_advertisement``; the callback is not used.
+        """
+        await self._node.async_publish("subscribe notify=1")
+
+    async def disconnect(self) -> bool:
+        """End the session on the node."""
+        if self.is_connected:
+            self._set_disconnected()
+            await self._node.async_publish("disconnect reason=idle")
+        return True
+
+    def _set_disconnected(self) -> None:
+        if not self.is_connected:
+            return
+        self.is_connected = False
+        if self._node.link is self:
+            self._node.link = None
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+
+class _MqttNode:
+    """State of one ESP32 node as reported on its status topic."""
+
+    def __init__(self, bridge: GiraMqttBridge, node_id: str) -> None:
+        self.bridge = bridge
+        self.node_id = node_id
+        self.source = f"{SOURCE_PREFIX}{node_id}"
+        self.status: dict[str, Any] = {}
+        self.link: MqttLink | None = None
+        self.unsubscribe: list[Callable[[], None]] = []
+        # (peer address, status predicate, future) of commands awaiting a status
+        self._waiters: list[tuple[str, Callable[[dict[str, Any]], bool], asyncio.Future[None]]] = []
+
+    async def async_publish(self, command: str) -> None:
+        LOGGER.debug("%s <- %s", self.source, command)
+        await self.bridge.publish(f"{self.bridge.base_topic}/{self.node_id}/cmd", command)
+
+    async def async_command(
+        self,
+        command: str,
+        address: str,
+        until: Callable[[dict[str, Any]], bool],
+        timeout: float,
+    ) -> None:
+        """Publish a command for a peer and wait for a status satisfying ``until``.
+
+        Statuses about another peer (e.g. the late IDLE of the previous session)
+        are ignored; IDLE or an ``error`` for this peer fails the command.
+        """
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter = (address, until, future)
+        self._waiters.append(waiter)
+        try:
+            await self.async_publish(command)
+            await asyncio.wait_for(future, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def handle_status(self, status: dict[str, Any]) -> None:
+        self.status = status
+        peer = str(status.get("peer") or "").upper()
+        failed = status.get("state") == "IDLE" or "error" in status
+        for address, until, future in list(self._waiters):
+            if future.done() or (peer and peer != address):
+                continue
+            if until(status):
+                future.set_result(None)
+            elif failed:
+                reason = status.get("error") or status.get("state")
+                future.set_exception(BleakError(f"{self.source}: {reason}"))
+        link = self.link
+        if link is not None and not status.get("connected", True) and peer in ("", link.address):
+            link._set_disconnected()
+
+
+class GiraMqttBridge:
+    """Shared state of all ESP32 nodes (subscriptions, status, sightings)."""
+
+    def __init__(
+        self,
+        publish: PublishCallable,
+        subscribe: SubscribeCallable,
+        *,
+        base_topic: str = MQTT_BASE_TOPIC,
+        on_advertisement: Callable[[str, bytes], Any] | None = None,
+        connect_timeout_s: float = 15.0,
+        pair_timeout_s: float = 20.0,
+    ) -> None:
+        """Initialize the bridge."""
+        self.publish = publish
+        self.subscribe = subscribe
+        self.base_topic = base_topic
+        self.on_advertisement = on_advertisement
+        self.connect_timeout_s = connect_timeout_s
+        self.pair_timeout_s = pair_timeout_s
+        self._nodes: dict[str, _MqttNode] = {}
+        self._refs: dict[str, int] = {}
+        # address -> node_id -> monotonic time of the last event for it
+        self._seen: dict[str, dict[str, float]] = {}
+        # address -> node_id -> last RSSI reported in an event
+        self._rssi: dict[str, dict[str, int]] = {}
+
+    @property
+    def sources(self) -> list[str]:
+        """Return the scheduler sources of all active nodes."""
+        return [node.source for node in self._nodes.values()]
+
+    async def async_add_node(self, node_id: str) -> str:
+        """Start following a node (reference counted); returns its source."""
+        self._refs[node_id] = self._refs.get(node_id, 0) + 1
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = self._nodes[node_id] = _MqttNode(self, node_id)
+            prefix = f"{self.base_topic}/{node_id}"
+            node.unsubscribe = [
+                await self.subscribe(f"{prefix}/status", self._handle_status),
+                await self.subscribe(f"{prefix}/event", self._handle_event),
+            ]
+        return node.source
+
+    async def async_remove_node(self, node_id: str) -> None:
+        """Stop following a node once no device uses it any more."""
+        self._refs[node_id] = self._refs.get(node_id, 1) - 1
+        if self._refs[node_id] > 0:
+            return
+        del self._refs[node_id]
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return
+        for unsubscribe in node.unsubscribe:
+            unsubscribe()
+        if node.link is not None:
+            await node.link.disconnect()
+
+    def last_seen(self, address: str, node_id: str) -> float | None:
+        """Return when a node last reported an event for a device."""
+        return self._seen.get(address.upper(), {}).get(node_id)
+
+    def last_rssi(self, address: str, node_id: str) -> int | None:
+        """Return the last RSSI a node reported for a device."""
+        return self._rssi.get(address.upper(), {}).get(node_id)
+
+    def _node_for_topic(self, topic: str) -> _MqttNode | None:
+        parts = topic.split("/")
+        return self._nodes.get(parts[-2]) if len(parts) >= 2 else None
+
+    def _handle_status(self, topic: str, payload: str) -> None:
+        node = self._node_for_topic(topic)
+        if node is None:
+            return
+        try:
+            status = json.loads(payload)
+        except ValueError:
+            LOGGER.debug("Ignoring malformed status on %s: %r", topic, payload)
+            return
+        if isinstance(status, dict):
+            node.handle_status(status)
+
+    def _handle_event(self, topic: str, payload: str) -> None:
+        node = self._node_for_topic(topic)
+        if node is None:
+            return
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            LOGGER.debug("Ignoring malformed event on %s: %r", topic, payload)
+            return
+        if not isinstance(event, dict) or not isinstance(peer := event.get("peer"), str):
+            return
+        address = peer.upper()
+        self._seen.setdefault(address, {})[node.node_id] = time.monotonic()
+        if isinstance(rssi := event.get("rssi"), int):
+            self._rssi.setdefault(address, {})[node.node_id] = rssi
+        if self.on_advertisement is not None:
+            for frame in event_frames(event):
+                self.on_advertisement(address, frame)
+
+    async def async_connect(
+        self,
+        peer: MqttPeer,
+        disconnected_callback: Callable[[Any], None] | None,
+    ) -> MqttLink:
+        """Run the connect/pair sequence for a device on its node."""
+        node = self._nodes.get(peer.node_id)
+        if node is None:
+            raise BleakError(f"{SOURCE_PREFIX}{peer.node_id}: node not configured")
+        if node.link is not None and node.link.is_connected:
+            raise BleakError(f"{node.source}: busy with {node.link.address}")
+        address = peer.address
+
+        await node.async_command(
+            f"connect addr={address} addr_type=random "
+            f"timeout_ms={round(self.connect_timeout_s * 1000)} disconnect_on_fail=1",
+            address,
+            lambda status: bool(status.get("connected")),
+            self.connect_timeout_s + _STATUS_GRACE_S,
+        )
+        if not node.status.get("encrypted"):
+            await node.async_command(
+                f"pair timeout_ms={round(self.pair_timeout_s * 1000)} probe=none disconnect_on_fail=1",
+                address,
+                lambda status: bool(status.get("encrypted")),
+                self.pair_timeout_s + _STATUS_GRACE_S,
+            )
+        link = node.link = MqttLink(node, address, disconnected_callback)
+        return link
+
+
+class MqttTransport:
+    """GiraTransport that drives a device through a set of ESP32 nodes."""
+
+    # The node only takes absolute setpoints (set_target_c).
+    supports_thermostat_step = False
+
+    def __init__(self, bridge: GiraMqttBridge, node_ids: Iterable[str]) -> None:
+        """Initialize the transport."""
+        self.bridge = bridge
+        self.node_ids = list(node_ids)
+
+    def resolve(self, address: str) -> tuple[Any, str] | None:
+        """Return the node that reported the device most recently (else the first)."""
+        if not self.node_ids:
+            return None
+        address = address.upper()
+        node_id = max(
+            self.node_ids,
+            key=lambda node: self.bridge.last_seen(address, node) or float("-inf"),
+        )
+        return MqttPeer(node_id, address), f"{SOURCE_PREFIX}{node_id}"
+
+    def routes(self, address: str) -> list[Route]:
+        """Return a route through every node (RSSI if the node reported one)."""
+        address = address.upper()
+        return [
+            Route(MqttPeer(node_id, address), f"{SOURCE_PREFIX}{node_id}", self.bridge.last_rssi(address, node_id))
+            for node_id in self.node_ids
+        ]
+
+    async def connect(
+        self,
+        device: Any,
+        name: str,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 3,
+    ) -> MqttLink:
+        """Open a session on a node from ``resolve`` or ``routes``.
+
+        The node applies its own connect timeout; ``max_attempts`` is not used.
+        """
+        return await self.bridge.async_connect(device, disconnected_callback)
+
+    async def async_close(self) -> None:
+        """Stop following this transport's nodes."""
+        for node_id in self.node_ids:
+            await self.bridge.async_remove_node(node_id)
+
+
+def parse_node_ids(value: str) -> list[str]:
+    """Split the comma-separated node option into node ids."""
+    return [node_id for node_id in (part.strip() for part in value.split(",")) if node_id]
+
+
+def async_get_mqtt_bridge(hass: HomeAssistant) -> GiraMqttBridge:
+    """Return the shared bridge wired to Home Assistant's MQTT integration."""
+    bridge: GiraMqttBridge | None = hass.data.get(DATA_MQTT_BRIDGE)
+    if bridge is None:
+        # MQTT is optional: only import it once a device is routed through a node.
+        from homeassistant.components import mqtt
+        from homeassistant.core import callback
+
+        from .dispatcher import async_get_dispatcher
+
+        async def _publish(topic: str, payload: str) -> None:
+            await mqtt.async_publish(hass, topic, payload)
+
+        async def _subscribe(topic: str, on_message: MessageCallback) -> Callable[[], None]:
+            @callback
+            def _message_received(msg: Any) -> None:
+                on_message(msg.topic, msg.payload)
+
+            return await mqtt.async_subscribe(hass, topic, _message_received)
+
+        bridge = hass.data[DATA_MQTT_BRIDGE] = GiraMqttBridge(
+            _publish,
+            _subscribe,
+            on_advertisement=async_get_dispatcher(hass).async_dispatch,
+        )
+    return bridge
+
+
+async def async_get_mqtt_transport(hass: HomeAssistant, node_ids: list[str]) -> MqttTransport:
+    """Follow the nodes on the shared bridge and return a transport over them.
+
+    Each node runs one GATT session at a time, so its scheduler source gets a
+    single connection slot.
+    """
+    from homeassistant.components import mqtt
+    from homeassistant.exceptions import ConfigEntryNotReady
+
+    from .scheduler import async_get_scheduler
+
+    if not await mqtt.async_wait_for_mqtt_client(hass):
+        raise ConfigEntryNotReady("MQTT is not available")
+    bridge = async_get_mqtt_bridge(hass)
+    scheduler = async_get_scheduler(hass)
+    for node_id in node_ids:
+        scheduler.async_set_slots(await bridge.async_add_node(node_id), 1)
+    return MqttTransport(bridge, node_ids)
@@ -0,0 +1,127 @@
+"""Learned pre-warm schedule for Gira System 3000 BT devices.
+
+``PrewarmSchedule`` counts, per time-of-day slot, on how many recent days a
+command was sent (older days decay). ``async_track_learned_prewarm`` opens the
+link shortly before a slot that is likely to see a command again, so the
+command finds a connected device.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+
+from .const import (
+    DOMAIN,
+    PREWARM_BIN_MINUTES,
+    PREWARM_DAILY_DECAY,
+    PREWARM_LEAD_MINUTES,
+    PREWARM_MIN_SCORE,
+)
+
+if TYPE_CHECKING:
+    from .gira_ble import GiraBLEClient
+
+
+class PrewarmSchedule:
+    """Time-of-day slots in which commands are usually sent."""
+
+    def __init__(
+        self,
+        bin_minutes: int = PREWARM_BIN_MINUTES,
+        decay: float = PREWARM_DAILY_DECAY,
+        min_score: float = PREWARM_MIN_SCORE,
+    ) -> None:
+        """Initialize an empty schedule."""
+        if 60 % bin_minutes:
+            raise ValueError("bin_minutes must divide an hour")
+        self.bin_minutes = bin_minutes
+        self.decay = decay
+        self.min_score = min_score
+        bins = 24 * 60 // bin_minutes
+        self._score = [0.0] * bins
+        self._day: list[int | None] = [None] * bins
+
+    def _bin(self, when: datetime) -> int:
+        return (when.hour * 60 + when.minute) // self.bin_minutes
+
+    def record(self, when: datetime) -> bool:
+        """Record a command sent at ``when`` (local time); one count per slot and day.
+
+        Returns True if the histogram changed (the first command in the slot that day).
+        """
+        index = self._bin(when)
+        day = when.toordinal()
+        last = self._day[index]
+        if last == day:
+            return False
+        score = 0.0 if last is None else self._score[index] * self.decay ** (day - last)
+        self._score[index] = score + 1.0
+        self._day[index] = day
+        return True
+
+    def score(self, when: datetime) -> float:
+        """Return the slot's score as of the day before ``when``."""
+        index = self._bin(when)
+        last = self._day[index]
+        if last is None:
+            return 0.0
+        return self._score[index] * self.decay ** max(0, when.toordinal() - 1 - last)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slots seen so far as ``[index, score, day]`` (JSON-serializable)."""
+        return {
+            "bin_minutes": self.bin_minutes,
+            "slots": [
+                [index, round(self._score[index], 6), day]
+                for index, day in enumerate(self._day)
+                if day is not None
+            ],
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Load slots saved by ``as_dict``; ignored if the slot size differs."""
+        if data.get("bin_minutes") != self.bin_minutes:
+            return
+        for index, score, day in data.get("slots", ()):
+            if 0 <= index < len(self._score):
+                self._score[index] = float(score)
+                self._day[index] = int(day)
+
+    def is_likely(self, when: datetime) -> bool:
+        """Return True if a command is expected in the slot of ``when``."""
+        return self.score(when) >= self.min_score
+
+    def likely_slots(self, when: datetime) -> list[str]:
+        """Return the start times ("HH:MM") of the likely slots on the day of ``when``."""
+        midnight = when.replace(hour=0, minute=0, second=0, microsecond=0)
+        slots = []
+        for index in range(len(self._score)):
+            start = midnight + timedelta(minutes=index * self.bin_minutes)
+            if self.is_likely(start):
+                slots.append(start.strftime("%H:%M"))
+        return slots
+
+
+@callback
+def async_track_learned_prewarm(hass: HomeAssistant, client: GiraBLEClient) -> CALLBACK_TYPE:
+    """Pre-warm the client's link ahead of every likely slot; returns the unsubscribe."""
+    schedule = client.prewarm_schedule
+    lead = timedelta(minutes=PREWARM_LEAD_MINUTES)
+    # Hold the link from the lead time until the end of the slot.
+    hold_s = (PREWARM_LEAD_MINUTES + schedule.bin_minutes) * 60.0
+
+    @callback
+    def _async_check(now: datetime) -> None:
+        if not schedule.is_likely(now + lead):
+            return
+        hass.async_create_background_task(
+            client.async_prewarm(hold_s), f"{DOMAIN} prewarm {client.address}"
+        )
+
+    minutes = sorted(
+        (start - PREWARM_LEAD_MINUTES) % 60 for start in range(0, 60, schedule.bin_minutes)
+    )
+    return async_track_time_change(hass, _async_check, minute=minutes, second=0)
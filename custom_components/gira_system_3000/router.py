@@ -0,0 +1,128 @@
+"""Per-device adapter routing for GiraBLEClient.
+
+Every adapter (HA Bluetooth "source", or ESP32 node) that can reach a device
+is a route. ``AdapterRouter`` keeps a short history per route (RSSI and connect
+outcomes/latency as exponential moving averages) and orders the routes by
+expected time to an open link, including the time spent waiting for a
+connection slot on that adapter.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .transport import Route
+
+# Weight of the newest sample in the moving averages.
+_ALPHA = 0.3
+# Until a route has this many connect outcomes its RSSI prior dominates.
+_PRIOR_WEIGHT = 3.0
+# Connect success probability vs RSSI: 50% at _RSSI_MID dBm, logistic slope _RSSI_SCALE.
+_RSSI_MID = -90.0
+_RSSI_SCALE = 4.0
+# Success prior for routes without RSSI (e.g. ESP32 nodes that do not report it).
+_UNKNOWN_RSSI_SUCCESS = 0.8
+# Connect latency assumed for routes without samples (seconds).
+_DEFAULT_CONNECT_S = 1.5
+_MIN_SUCCESS = 0.05
+
+
+def _ema(previous: float | None, sample: float) -> float:
+    return sample if previous is None else previous + _ALPHA * (sample - previous)
+
+
+@dataclass
+class _RouteStats:
+    rssi: float | None = None
+    connect_s: float | None = None
+    success: float | None = None
+    outcomes: int = 0
+    consecutive_failures: int = 0
+
+    def success_probability(self, fallback_rssi: float | None = None) -> float:
+        rssi = self.rssi if self.rssi is not None else fallback_rssi
+        if rssi is None:
+            prior = _UNKNOWN_RSSI_SUCCESS
+        else:
+            prior = 1.0 / (1.0 + math.exp(-(rssi - _RSSI_MID) / _RSSI_SCALE))
+        if self.success is None:
+            return max(prior, _MIN_SUCCESS)
+        n = float(self.outcomes)
+        blended = (n * self.success + _PRIOR_WEIGHT * prior) / (n + _PRIOR_WEIGHT)
+        return max(blended, _MIN_SUCCESS)
+
+
+class AdapterRouter:
+    """Ranks the routes to one device by expected connect cost."""
+
+    def __init__(self) -> None:
+        """Initialize the router."""
+        self._routes: dict[str, _RouteStats] = {}
+
+    def _stats(self, source: str) -> _RouteStats:
+        stats = self._routes.get(source)
+        if stats is None:
+            stats = self._routes[source] = _RouteStats()
+        return stats
+
+    def observe_rssi(self, source: str, rssi: int | None) -> None:
+        """Add an RSSI sample seen by an adapter (fed by every advertisement)."""
+        if rssi is None:
+            return
+        stats = self._stats(source)
+        stats.rssi = _ema(stats.rssi, float(rssi))
+
+    def record_connect(self, source: str, elapsed_s: float) -> None:
+        """Record a successful connect through an adapter."""
+        stats = self._stats(source)
+        stats.connect_s = _ema(stats.connect_s, elapsed_s)
+        stats.success = _ema(stats.success, 1.0)
+        stats.outcomes += 1
+        stats.consecutive_failures = 0
+
+    def record_failure(self, source: str) -> None:
+        """Record a failed connect through an adapter."""
+        stats = self._stats(source)
+        stats.success = _ema(stats.success, 0.0)
+        stats.outcomes += 1
+        stats.consecutive_failures += 1
+
+    def expected_cost(self, source: str, backlog: int = 0, fallback_rssi: int | None = None) -> float:
+        """Expected seconds until a link is open through ``source``.
+
+        Failed attempts are retried, so the connect time is divided by the
+        success probability; ``backlog`` sessions ahead of us on that adapter
+        each cost about one connect as well. ``fallback_rssi`` stands in for
+        the RSSI average of a source no advertisement was observed on yet.
+        """
+        stats = self._routes.get(source) or _RouteStats()
+        connect_s = stats.connect_s if stats.connect_s is not None else _DEFAULT_CONNECT_S
+        return connect_s / stats.success_probability(fallback_rssi) + backlog * connect_s
+
+    def rank(self, routes: Iterable[Route], backlog: Callable[[str], int]) -> list[Route]:
+        """Return the routes cheapest first.
+
+        Only reads the stored estimates: RSSI samples come from the
+        advertisements (``observe_rssi``), and a route's own RSSI is used for
+        a source without samples but not recorded.
+        """
+        return sorted(
+            routes,
+            key=lambda route: self.expected_cost(route.source, backlog(route.source), route.rssi),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the route history for diagnostics."""
+        return {
+            source: {
+                "rssi": None if stats.rssi is None else round(stats.rssi, 1),
+                "connect_s": None if stats.connect_s is None else round(stats.connect_s, 3),
+                "success": round(stats.success_probability(), 3),
+                "outcomes": stats.outcomes,
+                "consecutive_failures": stats.consecutive_failures,
+                "expected_cost_s": round(self.expected_cost(source), 3),
+            }
+            for source, stats in self._routes.items()
+        }
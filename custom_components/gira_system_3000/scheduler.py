@@ -0,0 +1,182 @@
+"""Integration-wide BLE connection scheduler for Gira System 3000 BT devices."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant, callback
+
+from .breaker import RetryBudget
+from .const import DATA_SCHEDULER, DEFAULT_ADAPTER_CONNECTION_SLOTS, LOGGER
+
+if TYPE_CHECKING:
+    from .gira_ble import GiraBLEClient
+
+
+class GiraConnectionScheduler:
+    """Hands out adapter connection slots to GiraBLEClient links.
+
+    Every adapter (HA Bluetooth "source") has a number of connection slots: the
+    allocation HA's Bluetooth stack reports for it, less the slots other
+    integrations hold, or an override (MQTT nodes). Clients that already hold a link on an adapter reuse it. When all slots are
+    taken, the link that has been idle longest is released early (unless its
+    client opted out); otherwise the request waits in a FIFO queue for that adapter.
+    Connect retries of all clients draw from one shared ``retry_budget``.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        default_slots: int = DEFAULT_ADAPTER_CONNECTION_SLOTS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._default_slots = default_slots
+        self._slots: dict[str, int] = {}
+        # source -> address -> client holding a slot on that adapter
+        self._links: dict[str, dict[str, GiraBLEClient]] = {}
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {}
+        self.retry_budget = RetryBudget()
+
+    @callback
+    def async_set_slots(self, source: str, slots: int) -> None:
+        """Override the connection slot count of one adapter."""
+        self._slots[source] = max(1, int(slots))
+        self._async_wake(source)
+
+    def slots_for(self, source: str) -> int:
+        """Return the number of connection slots of an adapter available to us."""
+        if (slots := self._slots.get(source)) is not None:
+            return slots
+        if "bluetooth" not in self.hass.config.components:
+            return self._default_slots
+        for allocation in bluetooth.async_current_allocations(self.hass, source) or ():
+            if allocation.source != source:
+                continue
+            ours = self._links.get(source, {})
+            others = sum(1 for address in allocation.allocated if address not in ours)
+            return max(1, allocation.slots - others)
+        return self._default_slots
+
+    def links_on(self, source: str) -> int:
+        """Return the number of slots currently in use on an adapter."""
+        return len(self._links.get(source, ()))
+
+    def has_free_slot(self, source: str) -> bool:
+        """Return True if a link could be opened on an adapter without waiting or evicting."""
+        return self.links_on(source) < self.slots_for(source) and not self._waiters.get(source)
+
+    def backlog(self, source: str) -> int:
+        """Return how many sessions a new request would wait behind on an adapter.
+
+        Idle links that may be released early do not count.
+        """
+        busy = sum(
+            1
+            for link in self._links.get(source, {}).values()
+            if not (link.is_idle and link.release_idle_under_pressure)
+        )
+        waiting = len(self._waiters.get(source, ()))
+        return max(0, busy + waiting - self.slots_for(source) + 1)
+
+    def source_of(self, client: GiraBLEClient) -> str | None:
+        """Return the adapter a client currently holds a slot on."""
+        for source, links in self._links.items():
+            if links.get(client.address) is client:
+                return source
+        return None
+
+    async def async_acquire(self, client: GiraBLEClient, source: str) -> None:
+        """Wait until the client holds a connection slot on the given adapter."""
+        links = self._links.setdefault(source, {})
+        if links.get(client.address) is client:
+            return
+
+        waiters = self._waiters.setdefault(source, deque())
+        # Queue behind earlier requests even if a slot looks free (fairness).
+        queued_behind = bool(waiters)
+        head_of_queue = False
+        while queued_behind or len(links) >= self.slots_for(source):
+            if not queued_behind and (victim := self._idle_link(source)) is not None:
+                LOGGER.debug(
+                    "Releasing idle link %s early for %s on %s",
+                    victim.name,
+                    client.name,
+                    source,
+                )
+                await victim.async_release_idle_link()
+                continue
+
+            waiter: asyncio.Future[None] = self.hass.loop.create_future()
+            if head_of_queue:
+                waiters.appendleft(waiter)
+            else:
+                waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up we can no longer use on to the next waiter.
+                if waiter.done() and not waiter.cancelled():
+                    self._async_wake(source)
+                raise
+            finally:
+                if waiter in waiters:
+                    waiters.remove(waiter)
+            queued_behind = False
+            head_of_queue = True
+
+        links[client.address] = client
+
+    @callback
+    def async_release(self, client: GiraBLEClient) -> None:
+        """Release the slot held by a client (no-op if it holds none)."""
+        source = self.source_of(client)
+        if source is None:
+            return
+        del self._links[source][client.address]
+        self._async_wake(source)
+
+    @callback
+    def async_link_idle(self, client: GiraBLEClient) -> None:
+        """Hand an idle link's slot to a queued request right away.
+
+        Clients call this once their own queue is empty, so a link is never
+        torn down between commands of the same device.
+        """
+        source = self.source_of(client)
+        if source is None or not self._waiters.get(source):
+            return
+        if client.release_idle_under_pressure:
+            LOGGER.debug("Releasing idle link %s for a queued request on %s", client.name, source)
+            self.hass.async_create_task(client.async_release_idle_link())
+
+    def _idle_link(self, source: str) -> GiraBLEClient | None:
+        """Return the releasable link that has been idle the longest, if any."""
+        candidates = [
+            link
+            for link in self._links.get(source, {}).values()
+            if link.is_idle and link.release_idle_under_pressure
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda link: link.idle_for)
+
+    @callback
+    def _async_wake(self, source: str) -> None:
+        waiters = self._waiters.get(source)
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> GiraConnectionScheduler:
+    """Return the integration-wide connection scheduler, creating it on first use."""
+    scheduler: GiraConnectionScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = GiraConnectionScheduler(hass)
+    return scheduler
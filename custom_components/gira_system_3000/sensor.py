@@ -1,16 +1,24 @@
 """Sensor platform for Gira System 3000 BT (read-only sensor devices)."""
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .gira_ble import GiraPassiveBluetoothDataUpdateCoordinator
+from .gira_ble import GiraBLEClient, GiraPassiveBluetoothDataUpdateCoordinator
+from .stats import DeviceStats
+
+# Diagnostic sensors are polled; the stats they read change without coordinator updates.
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
 @dataclass(frozen=True)
@@ -27,11 +35,25 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     runtime = _Runtime(coordinator=data["coordinator"])
 
-    async_add_entities(
-        [
+    entities: list[SensorEntity] = [
+        GiraDiagnosticSensor(data["stats"], data["client"], entry, description)
+        for description in DIAGNOSTIC_SENSORS
+    ]
+    if data.get("device_type") == "sensor":
+        entities += [
             GiraTemperatureSensor(runtime, entry),
             GiraBrightnessSensor(runtime, entry),
         ]
+    async_add_entities(entities)
+
+
+def _sensor_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device of a sensor entry (no cover/climate entity creates one)."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.unique_id or entry.entry_id)},
+        name=entry.data.get("name") or "Gira Sensor",
+        manufacturer="Gira",
+        model="System 3000 BT Sensor",
     )
 
 
@@ -41,7 +63,7 @@ class _Base(CoordinatorEntity[GiraPassiveBluetoothDataUpdateCoordinator], Sensor
     def __init__(self, runtime: _Runtime, entry: ConfigEntry) -> None:
         super().__init__(runtime.coordinator)
         self._entry = entry
-        self._base_name = entry.data.get("name", "Gira Sensor")
+        self._attr_device_info = _sensor_device_info(entry)
 
     @property
     def available(self) -> bool:
@@ -56,7 +78,7 @@ class GiraTemperatureSensor(_Base):
     def __init__(self, runtime: _Runtime, entry: ConfigEntry) -> None:
         super().__init__(runtime, entry)
         self._attr_unique_id = f"{entry.unique_id}_temp"
-        self._attr_name = f"{self._base_name} Temperatur"
+        self._attr_name = "Temperatur"
 
     @property
     def native_value(self) -> float | None:
@@ -73,10 +95,117 @@ class GiraBrightnessSensor(_Base):
     def __init__(self, runtime: _Runtime, entry: ConfigEntry) -> None:
         super().__init__(runtime, entry)
         self._attr_unique_id = f"{entry.unique_id}_lux"
-        self._attr_name = f"{self._base_name} Helligkeit"
+        self._attr_name = "Helligkeit"
 
     @property
     def native_value(self) -> float | None:
         if not self.coordinator.data:
             return None
         return self.coordinator.data.get("sensor_brightness")
+
+
+# -----------------------------------------------------------------------------
+# Diagnostic (performance) sensors, disabled by default
+# -----------------------------------------------------------------------------
+def _ms(value: float | None) -> float | None:
+    return None if value is None else round(value * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class GiraDiagnosticSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[DeviceStats, GiraBLEClient], float | int | None]
+
+
+DIAGNOSTIC_SENSORS: tuple[GiraDiagnosticSensorDescription, ...] = (
+    GiraDiagnosticSensorDescription(
+        key="connect_time_p50",
+        name="Connect time (median)",
+        native_unit_of_measurement="ms",
+        value_fn=lambda stats, _: _ms(stats.connect_s.percentile(0.5)),
+    ),
+    GiraDiagnosticSensorDescription(
+        key="connect_time_p95",
+        name="Connect time (p95)",
+        native_unit_of_measurement="ms",
+        value_fn=lambda stats, _: _ms(stats.connect_s.percentile(0.95)),
+    ),
+    GiraDiagnosticSensorDescription(
+        key="write_time_p50",
+        name="Write time (median)",
+        native_unit_of_measurement="ms",
+        value_fn=lambda stats, _: _ms(stats.write_s.percentile(0.5)),
+    ),
+    GiraDiagnosticSensorDescription(
+        key="retries",
+        name="Retries",
+        state_class="total_increasing",
+        value_fn=lambda stats, _: stats.retries,
+    ),
+    GiraDiagnosticSensorDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class="total_increasing",
+        value_fn=lambda stats, _: stats.reconnects,
+    ),
+    GiraDiagnosticSensorDescription(
+        key="idle_disconnects",
+        name="Idle disconnects",
+        state_class="total_increasing",
+        value_fn=lambda stats, _: stats.idle_disconnects,
+    ),
+    GiraDiagnosticSensorDescription(
+        key="coalesced_writes",
+        name="Coalesced writes",
+        state_class="total_increasing",
+        value_fn=lambda _, client: client.coalesced_writes,
+    ),
+    GiraDiagnosticSensorDescription(
+        key="advertisement_rate",
+        name="Advertisement rate",
+        native_unit_of_measurement="1/min",
+        value_fn=lambda stats, _: (
+            None if (rate := stats.advertisements_per_minute) is None else round(rate, 1)
+        ),
+    ),
+    GiraDiagnosticSensorDescription(
+        key="parse_time_p50",
+        name="Parse time (median)",
+        native_unit_of_measurement="µs",
+        value_fn=lambda stats, _: (
+            None if (us := stats.parse_us.percentile(0.5)) is None else round(us, 2)
+        ),
+    ),
+)
+
+
+class GiraDiagnosticSensor(SensorEntity):
+    """Per-device performance value read from DeviceStats."""
+
+    entity_description: GiraDiagnosticSensorDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        stats: DeviceStats,
+        client: GiraBLEClient,
+        entry: ConfigEntry,
+        description: GiraDiagnosticSensorDescription,
+    ) -> None:
+        self.entity_description = description
+        self._stats = stats
+        self._client = client
+        self._attr_unique_id = f"{entry.unique_id or entry.entry_id}_{description.key}"
+        # Attach to the device of the entry's primary entity.
+        device_type = entry.data.get("device_type", "shutter")
+        if device_type == "sensor":
+            self._attr_device_info = _sensor_device_info(entry)
+        else:
+            device_id = entry.entry_id if device_type == "shutter" else entry.unique_id or entry.entry_id
+            self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_id)})
+
+    @property
+    def native_value(self) -> float | int | None:
+        return self.entity_description.value_fn(self._stats, self._client)
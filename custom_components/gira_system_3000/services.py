@@ -0,0 +1,310 @@
+"""Domain services for the Gira System 3000 integration."""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from itertools import chain, zip_longest
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .capture import CaptureRecord, write_capture
+from .codec import generate_command, lookup_shutter_raw
+from .const import (
+    DOMAIN,
+    GIRA_MANUFACTURER_ID,
+    LOGGER,
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+    CAPTURE_DIR,
+    CAPTURE_MAX_RECORDS,
+    CAPTURE_MAX_S,
+    DEFAULT_BULK_MAX_PARALLEL,
+    DEFAULT_CAPTURE_S,
+    DEFAULT_PREWARM_HOLD_S,
+    PREWARM_MAX_HOLD_S,
+    SERVICE_PREWARM,
+    SERVICE_RECORD_CAPTURE,
+    SERVICE_SET_POSITIONS,
+)
+from .dispatcher import async_get_dispatcher
+from .gira_ble import KEY_SHUTTER_MOTION, GiraBLEClient
+from .motion import ShutterMotion
+
+ATTR_POSITIONS = "positions"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_HOLD = "hold"
+ATTR_STOP_FIRST = "stop_first"
+ATTR_DURATION = "duration"
+
+SET_POSITIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_POSITIONS): {
+            cv.entity_id: vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+        },
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_BULK_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=32)
+        ),
+        vol.Optional(ATTR_STOP_FIRST, default=False): cv.boolean,
+    }
+)
+
+PREWARM_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_HOLD, default=DEFAULT_PREWARM_HOLD_S): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=PREWARM_MAX_HOLD_S)
+        ),
+    }
+)
+
+RECORD_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_CAPTURE_S): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=CAPTURE_MAX_S)
+        ),
+    }
+)
+
+
+def _resolve_entry_data(
+    hass: HomeAssistant, entity_id: str, device_types: tuple[str, ...] = ("shutter",)
+) -> dict[str, Any] | None:
+    """Return the config entry data behind a Gira entity of one of the given device types."""
+    entity = er.async_get(hass).async_get(entity_id)
+    if entity is None or entity.platform != DOMAIN or entity.config_entry_id is None:
+        return None
+    data = hass.data.get(DOMAIN, {}).get(entity.config_entry_id)
+    if not data or data.get("device_type", "shutter") not in device_types:
+        return None
+    return data
+
+
+def _travel_s(data: dict[str, Any], position: int) -> float:
+    """Return the expected travel time of a shutter to ``position`` (0 if unknown)."""
+    motion = data["coordinator"].motion
+    return motion.time_to(position, time.monotonic()) if motion is not None else 0.0
+
+
+def _plan(
+    work: list[tuple[str, GiraBLEClient, int, float]],
+) -> list[tuple[str, GiraBLEClient, int, str | None, float]]:
+    """Order the work so parallel workers spread over adapters.
+
+    Every item carries its expected travel time; adding the expected connect
+    time (none for an open link) gives its expected completion time. Devices
+    that already hold an open link go first (no connect cost). The rest are
+    interleaved round-robin across adapters so each adapter's slots fill
+    evenly instead of queueing everything behind one adapter. Within both
+    groups the slowest devices start first, so a long travel overlaps with
+    the connects of the others instead of starting last.
+    """
+    linked: list[tuple[str, GiraBLEClient, int, str | None, float]] = []
+    by_adapter: dict[str | None, list[tuple[str, GiraBLEClient, int, str | None, float]]] = {}
+    for entity_id, client, position, travel_s in work:
+        adapter = client.resolve_adapter()
+        if client.is_connected:
+            linked.append((entity_id, client, position, adapter, travel_s))
+            continue
+        connect_s = client.router.expected_cost(adapter) if adapter is not None else 0.0
+        item = (entity_id, client, position, adapter, travel_s + connect_s)
+        by_adapter.setdefault(adapter, []).append(item)
+
+    def slowest_first(items: list[tuple[str, GiraBLEClient, int, str | None, float]]) -> None:
+        items.sort(key=lambda item: item[4], reverse=True)
+
+    slowest_first(linked)
+    for items in by_adapter.values():
+        slowest_first(items)
+    interleaved = chain.from_iterable(zip_longest(*by_adapter.values()))
+    return linked + [item for item in interleaved if item is not None]
+
+
+async def _async_set_positions(call: ServiceCall) -> ServiceResponse:
+    """Move many shutters at once with bounded parallelism."""
+    hass = call.hass
+    positions: dict[str, int] = call.data[ATTR_POSITIONS]
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_PARALLEL])
+    stop_first: bool = call.data[ATTR_STOP_FIRST]
+
+    results: dict[str, dict[str, Any]] = {}
+    work: list[tuple[str, GiraBLEClient, int, float]] = []
+    motions: dict[str, ShutterMotion] = {}
+    for entity_id, position in positions.items():
+        data = _resolve_entry_data(hass, entity_id)
+        if data is None:
+            results[entity_id] = {"success": False, "error": "not a Gira shutter"}
+            continue
+        work.append((entity_id, data["client"], position, _travel_s(data, position)))
+        if data["coordinator"].motion is not None:
+            motions[entity_id] = data["coordinator"].motion
+
+    async def _run(
+        entity_id: str,
+        client: GiraBLEClient,
+        position: int,
+        adapter: str | None,
+        expected_s: float,
+    ) -> None:
+        async with semaphore:
+            start = time.monotonic()
+            error: str | None = None
+            if stop_first:
+                # STOP and new position written back to back over one link-up.
+                session = await client.send_stop_and_set_position(lookup_shutter_raw(position))
+                if not session.complete:
+                    error = session.error or f"{session.sent} of {session.total} commands sent"
+                    if session.sent and entity_id in motions:
+                        # The STOP went out, the new position did not.
+                        motions[entity_id].target = None
+            else:
+                try:
+                    # One command per shutter: nothing to coalesce, so it is
+                    # queued right away instead of waiting out the window.
+                    await client.send_command(
+                        generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, lookup_shutter_raw(position)),
+                        key=KEY_SHUTTER_MOTION,
+                    )
+                except UpdateFailed as err:
+                    error = str(err)
+            # Only a sent command tells the motion tracker where the shutter heads.
+            if error is None and entity_id in motions:
+                motions[entity_id].target = position
+            results[entity_id] = {
+                "success": error is None,
+                "adapter": adapter,
+                "latency_ms": round((time.monotonic() - start) * 1000),
+                "expected_s": round(expected_s, 1),
+            }
+            if error is not None:
+                results[entity_id]["error"] = error
+
+    start = time.monotonic()
+    planned = _plan(work)
+    outcomes = await asyncio.gather(*(_run(*item) for item in planned), return_exceptions=True)
+    for (entity_id, *_), outcome in zip(planned, outcomes):
+        # One shutter failing in an unexpected way must not hide the others' results.
+        if isinstance(outcome, BaseException):
+            LOGGER.debug("set_positions: %s failed: %s", entity_id, outcome, exc_info=outcome)
+            results[entity_id] = {"success": False, "error": str(outcome) or type(outcome).__name__}
+    elapsed_ms = round((time.monotonic() - start) * 1000)
+
+    LOGGER.debug(
+        "set_positions: %d devices in %d ms (%d failed)",
+        len(positions),
+        elapsed_ms,
+        sum(1 for r in results.values() if not r["success"]),
+    )
+    return {"elapsed_ms": elapsed_ms, "results": results}
+
+
+async def _async_prewarm(call: ServiceCall) -> ServiceResponse:
+    """Open links to shutters/thermostats ahead of an expected scene."""
+    hass = call.hass
+    hold_s: float = call.data[ATTR_HOLD]
+
+    results: dict[str, dict[str, Any]] = {}
+    # One client per device, even if several of its entities were listed.
+    clients: dict[str, tuple[str, GiraBLEClient]] = {}
+    for entity_id in call.data[ATTR_ENTITY_ID]:
+        data = _resolve_entry_data(hass, entity_id, ("shutter", "thermostat"))
+        if data is None:
+            results[entity_id] = {"connected": False, "error": "not a Gira shutter or thermostat"}
+            continue
+        clients.setdefault(data["client"].address, (entity_id, data["client"]))
+
+    async def _run(entity_id: str, client: GiraBLEClient) -> None:
+        start = time.monotonic()
+        connected = await client.async_prewarm(hold_s)
+        results[entity_id] = {
+            "connected": connected,
+            "adapter": client.resolve_adapter(),
+            "latency_ms": round((time.monotonic() - start) * 1000),
+        }
+
+    # Devices that already hold a link only restart their idle timer; the
+    # others take free adapter slots in adapter round-robin order.
+    planned = _plan([(entity_id, client, 0, 0.0) for entity_id, client in clients.values()])
+    await asyncio.gather(*(_run(entity_id, client) for entity_id, client, *_ in planned))
+    LOGGER.debug(
+        "prewarm: %d of %d devices connected",
+        sum(1 for r in results.values() if r["connected"]),
+        len(results),
+    )
+    return {"results": results}
+
+
+def _write_capture_file(path: str, records: list[CaptureRecord]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fp:
+        write_capture(fp, records)
+
+
+async def _async_record_capture(call: ServiceCall) -> ServiceResponse:
+    """Record the Gira advertisements heard for a while into a capture file.
+
+    The file (see capture.py) can be replayed and benchmarked offline with the
+    tools in benchmarks/.
+    """
+    hass = call.hass
+    records: list[CaptureRecord] = []
+
+    @callback
+    def _record(service_info: BluetoothServiceInfoBleak) -> None:
+        payload = service_info.manufacturer_data.get(GIRA_MANUFACTURER_ID)
+        if payload and len(records) < CAPTURE_MAX_RECORDS:
+            records.append(
+                CaptureRecord(
+                    time.time(), service_info.address, service_info.rssi, GIRA_MANUFACTURER_ID, bytes(payload)
+                )
+            )
+
+    remove = async_get_dispatcher(hass).async_add_recorder(_record)
+    try:
+        await asyncio.sleep(call.data[ATTR_DURATION])
+    finally:
+        remove()
+
+    path = hass.config.path(CAPTURE_DIR, f"capture_{dt_util.now():%Y%m%d_%H%M%S}.bin")
+    await hass.async_add_executor_job(_write_capture_file, path, records)
+    LOGGER.debug("record_capture: %d advertisements written to %s", len(records), path)
+    return {"path": path, "records": len(records)}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POSITIONS,
+        _async_set_positions,
+        schema=SET_POSITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PREWARM,
+        _async_prewarm,
+        schema=PREWARM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_CAPTURE,
+        _async_record_capture,
+        schema=RECORD_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,109 @@
+"""Persistent last-known state of all Gira System 3000 BT devices.
+
+One Home Assistant ``Store`` file holds the last state reported by every
+device, so entities show a value right after a restart instead of waiting for
+the first advertisement, and every client's learned pre-warm slots
+(``PrewarmSchedule``), so they survive restarts as well. Updates only change
+the in-memory copy; the file is written at most once per ``STATE_SAVE_DELAY_S``
+(and on shutdown), however many devices changed in between.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_STATE_STORE,
+    STATE_RESTORE_MAX_AGE_S,
+    STATE_SAVE_DELAY_S,
+    STATE_STORAGE_KEY,
+    STATE_STORAGE_VERSION,
+)
+
+
+class GiraStateStore:
+    """Last reported state per device address, with the time it was reported."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store (call ``async_load`` before use)."""
+        self._store: Store[dict[str, Any]] = Store(hass, STATE_STORAGE_VERSION, STATE_STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._prewarm: dict[str, dict[str, Any]] = {}
+        self._save_pending = False
+        self._load_task: asyncio.Task[None] | None = None
+        self._hass = hass
+
+    async def async_load(self) -> None:
+        """Load the file once, however many config entries ask for it."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self._devices = data.get("devices", {})
+        self._prewarm = data.get("prewarm", {})
+
+    def get(self, address: str) -> tuple[dict[str, Any], datetime] | None:
+        """Return the stored state and its timestamp, unless missing or too old."""
+        entry = self._devices.get(address.upper())
+        if not entry:
+            return None
+        updated = dt_util.parse_datetime(entry.get("updated", ""))
+        if updated is None or dt_util.utcnow() - updated > timedelta(seconds=STATE_RESTORE_MAX_AGE_S):
+            return None
+        return dict(entry.get("state", {})), updated
+
+    @callback
+    def async_update(self, address: str, state: dict[str, Any]) -> None:
+        """Remember a device's state; the file is written in the next batch."""
+        self._devices[address.upper()] = {
+            "state": dict(state),
+            "updated": dt_util.utcnow().isoformat(),
+        }
+        self._async_schedule_save()
+
+    def get_prewarm(self, address: str) -> dict[str, Any] | None:
+        """Return a client's stored pre-warm slots (``PrewarmSchedule.as_dict``)."""
+        return self._prewarm.get(address.upper())
+
+    @callback
+    def async_update_prewarm(self, address: str, schedule: dict[str, Any]) -> None:
+        """Remember a client's pre-warm slots; the file is written in the next batch."""
+        self._prewarm[address.upper()] = schedule
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, address: str) -> None:
+        """Forget a device (config entry removed)."""
+        removed = self._devices.pop(address.upper(), None) is not None
+        if self._prewarm.pop(address.upper(), None) is not None or removed:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Store.async_delay_save restarts its timer on every call, which would
+        # postpone the write for as long as any device keeps changing.
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STATE_SAVE_DELAY_S)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {"devices": self._devices, "prewarm": self._prewarm}
+
+
+async def async_get_state_store(hass: HomeAssistant) -> GiraStateStore:
+    """Return the integration-wide state store, loaded."""
+    store: GiraStateStore | None = hass.data.get(DATA_STATE_STORE)
+    if store is None:
+        store = hass.data[DATA_STATE_STORE] = GiraStateStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,110 @@
+"""Small fixed-size statistics helpers for Gira System 3000 BT devices."""
+from __future__ import annotations
+
+from collections import deque
+
+
+class RollingHistogram:
+    """Keeps the last ``size`` samples and answers percentile queries."""
+
+    def __init__(self, size: int = 64) -> None:
+        """Initialize the histogram."""
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample, evicting the oldest one when full."""
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-quantile (0..1) of the samples, or None if empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return a compact summary (count, p50, p95, max)."""
+        return {
+            "count": len(self._samples),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": max(self._samples) if self._samples else None,
+        }
+
+
+class DeviceStats:
+    """Per-device performance counters shared by the client and coordinator.
+
+    Timings are kept in fixed-size rolling histograms, so memory does not grow
+    with uptime and recording a sample is O(1).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.connect_s = RollingHistogram()
+        self.write_s = RollingHistogram()
+        self.parse_us = RollingHistogram(256)
+        self.advertisement_gap_s = RollingHistogram(256)
+        self.estimate_error_pct = RollingHistogram(256)  # interpolated vs advertised position
+        self.connects = 0
+        self.reconnects = 0
+        self.retries = 0
+        self.failures = 0
+        self.fast_failures = 0
+        self.probes = 0
+        self.prewarms = 0
+        self.confirmed = 0
+        self.resends = 0
+        self.unconfirmed = 0
+        self.idle_disconnects = 0
+        self.advertisements = 0
+        self._last_advertisement: float | None = None
+
+    def record_advertisement(self, now: float) -> None:
+        """Count an advertisement and its gap to the previous one."""
+        self.advertisements += 1
+        if self._last_advertisement is not None:
+            self.advertisement_gap_s.add(now - self._last_advertisement)
+        self._last_advertisement = now
+
+    def record_connect(self, duration_s: float) -> None:
+        """Record an established link (every link after the first is a reconnect)."""
+        if self.connects:
+            self.reconnects += 1
+        self.connects += 1
+        self.connect_s.add(duration_s)
+
+    @property
+    def advertisements_per_minute(self) -> float | None:
+        """Return the recent advertisement rate."""
+        gap = self.advertisement_gap_s.percentile(0.5)
+        if not gap:
+            return None
+        return 60.0 / gap
+
+    def as_dict(self) -> dict[str, object]:
+        """Return all counters and histogram summaries (for diagnostics)."""
+        return {
+            "connect_s": self.connect_s.as_dict(),
+            "write_s": self.write_s.as_dict(),
+            "parse_us": self.parse_us.as_dict(),
+            "advertisement_gap_s": self.advertisement_gap_s.as_dict(),
+            "estimate_error_pct": self.estimate_error_pct.as_dict(),
+            "advertisements": self.advertisements,
+            "advertisements_per_minute": self.advertisements_per_minute,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "retries": self.retries,
+            "failures": self.failures,
+            "fast_failures": self.fast_failures,
+            "probes": self.probes,
+            "prewarms": self.prewarms,
+            "confirmed": self.confirmed,
+            "resends": self.resends,
+            "unconfirmed": self.unconfirmed,
+            "idle_disconnects": self.idle_disconnects,
+        }
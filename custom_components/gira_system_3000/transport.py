@@ -0,0 +1,106 @@
+"""Connection transports used by GiraBLEClient."""
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple, Protocol
+
+from bleak import BleakClient
+from bleak_retry_connector import establish_connection
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+
+class UnsupportedCommandError(Exception):
+    """A link cannot carry a command (e.g. an ESP32 node has no equivalent).
+
+    Not a connection problem: the command is not retried and the link stays open.
+    """
+
+
+class Route(NamedTuple):
+    """One adapter that can reach a device."""
+
+    device: Any
+    source: str
+    rssi: int | None
+
+
+class GiraLink(Protocol):
+    """An open GATT link (BleakClient satisfies this)."""
+
+    @property
+    def is_connected(self) -> bool: ...
+
+    async def write_gatt_char(self, char_specifier: str, data: bytes, response: bool = ...) -> None: ...
+
+    async def start_notify(self, char_specifier: str, callback: Callable[[Any, bytearray], Any]) -> None: ...
+
+    async def disconnect(self) -> Any: ...
+
+
+class GiraTransport(Protocol):
+    """Resolves devices to adapters and opens links to them.
+
+    Errors are reported as ``BleakError`` or ``asyncio.TimeoutError``; a link
+    raises ``UnsupportedCommandError`` for a write it cannot express. A transport
+    without the thermostat step command sets ``supports_thermostat_step = False``.
+    """
+
+    def resolve(self, address: str) -> tuple[Any, str] | None:
+        """Return ``(device, adapter source)`` for an address, or None if unseen."""
+
+    def routes(self, address: str) -> list[Route]:
+        """Return every adapter that can currently connect to an address."""
+
+    async def connect(
+        self,
+        device: Any,
+        name: str,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 3,
+    ) -> GiraLink:
+        """Open (and pair) a link to a device from ``resolve`` or ``routes``."""
+
+
+class BleakTransport:
+    """Direct connections through the Home Assistant Bluetooth stack."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+
+    def resolve(self, address: str) -> tuple[Any, str] | None:
+        """Return the connectable BLEDevice and the adapter that sees it best."""
+        service_info = bluetooth.async_last_service_info(self.hass, address, connectable=True)
+        if not service_info:
+            return None
+        return service_info.device, service_info.source
+
+    def routes(self, address: str) -> list[Route]:
+        """Return the connectable BLEDevice as seen by each adapter."""
+        return [
+            Route(scanner_device.ble_device, scanner_device.scanner.source, scanner_device.advertisement.rssi)
+            for scanner_device in bluetooth.async_scanner_devices_by_address(
+                self.hass, address, connectable=True
+            )
+        ]
+
+    async def connect(
+        self,
+        device: Any,
+        name: str,
+        *,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        max_attempts: int = 3,
+    ) -> GiraLink:
+        """Connect and pair using bleak-retry-connector."""
+        return await establish_connection(
+            BleakClient,
+            device,
+            name,
+            disconnected_callback=disconnected_callback,
+            pair=True,
+            timeout=5,
+            max_attempts=max_attempts,
+        )
@@ -0,0 +1 @@
+"""Tests for the Gira System 3000 integration."""
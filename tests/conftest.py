@@ -0,0 +1,74 @@
+"""Fixtures for the Gira System 3000 tests.
+
+Run with ``pip install -r requirements_test.txt && pytest``. The simulator
+lives with the benchmarks (it is not part of the integration) and is imported
+from there.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+try:
+    from homeassistant.core import HomeAssistant
+except ImportError:
+    # The codec and batch tests import the codec through benchmarks/_loader.py
+    # and still run without Home Assistant; everything else needs it.
+    HomeAssistant = None
+    collect_ignore = [
+        path.name
+        for path in Path(__file__).parent.glob("test_*.py")
+        if path.name not in ("test_codec.py", "test_batch.py")
+    ]
+
+SHUTTER_ADDRESS = "E8:2B:E7:00:00:01"
+THERMOSTAT_ADDRESS = "E8:2B:E7:00:00:02"
+
+
+def fast_profile(**overrides: float):
+    """Return a simulator profile without random failures and with short delays."""
+    from simulator import SimulatorProfile
+
+    settings = {
+        "connect_delay_s": (0.01, 0.01),
+        "write_latency_s": (0.005, 0.005),
+        "connect_failure_rate": 0.0,
+        "connect_timeout_rate": 0.0,
+        "write_failure_rate": 0.0,
+        "travel_s_per_step": 0.0005,
+        **overrides,
+    }
+    return SimulatorProfile(**settings)
+
+
+if HomeAssistant is not None:
+    from custom_components.gira_system_3000.dispatcher import async_get_dispatcher
+    from custom_components.gira_system_3000.gira_ble import (
+        GiraPassiveBluetoothDataUpdateCoordinator,
+    )
+
+    @pytest.fixture(autouse=True)
+    def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+        """Enable custom integrations in all tests."""
+
+    @pytest.fixture
+    def shutter_coordinator(
+        hass: HomeAssistant, enable_bluetooth: None
+    ) -> GiraPassiveBluetoothDataUpdateCoordinator:
+        """Return a shutter coordinator that is not registered for advertisements."""
+        return GiraPassiveBluetoothDataUpdateCoordinator(
+            hass, SHUTTER_ADDRESS, "Shutter", "shutter", async_get_dispatcher(hass)
+        )
+
+    @pytest.fixture
+    def thermostat_coordinator(
+        hass: HomeAssistant, enable_bluetooth: None
+    ) -> GiraPassiveBluetoothDataUpdateCoordinator:
+        """Return a thermostat coordinator that is not registered for advertisements."""
+        return GiraPassiveBluetoothDataUpdateCoordinator(
+            hass, THERMOSTAT_ADDRESS, "Thermostat", "thermostat", async_get_dispatcher(hass)
+        )
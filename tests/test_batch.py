@@ -0,0 +1,96 @@
+"""Tests for the NumPy batch decoder in benchmarks/batch.py.
+
+The batch decoder must agree with ``codec.decode_frame`` on every payload in
+the layout devices broadcast. Like the codec tests these run without Home
+Assistant.
+"""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import batch  # noqa: E402
+from _loader import load  # noqa: E402
+
+codec = load("codec")
+const = load("const")
+
+HEADER = codec.ADVERTISEMENT_HEADER
+
+
+MIXED = [
+    codec.encode_shutter_frame(0x00),
+    codec.encode_shutter_frame(0x80),
+    codec.encode_shutter_frame(0xFF),
+    codec.encode_thermostat_frame(codec.thermo_raw_from_reading(20.5)),
+    codec.encode_thermostat_frame(codec.thermo_raw_from_reading(21.5), target=True),
+    codec.encode_sensor_frame(2250),
+    codec.encode_sensor_frame(0xFFF0),
+    codec.encode_sensor_frame(1234, brightness=True),
+]
+
+TRUNCATED = [
+    codec.encode_shutter_frame(0x40)[:-1],
+    codec.encode_thermostat_frame(2050)[:-1],
+    codec.encode_thermostat_frame(2050, target=True)[:-2],
+    codec.encode_sensor_frame(2250)[:-1],
+    HEADER,
+    b"",
+]
+
+UNKNOWN = [
+    bytes(13),
+    bytes(range(13)),
+    codec.encode_sensor_frame(2250)[:8] + b"\x00" + codec.encode_sensor_frame(2250)[9:],
+    codec.encode_sensor_frame(2250)[:9] + b"\x11" + codec.encode_sensor_frame(2250)[10:],
+    codec.encode_sensor_frame(2250) + b"\x00",
+    codec.generate_position_command(50),
+]
+
+
+def _rows(result, rows: int) -> list[dict[str, float]]:
+    """The decoded fields of each row, like ``decode_frame`` returns them."""
+    return [
+        {
+            field: float(getattr(result, field)[row])
+            for field in result._fields
+            if not math.isnan(getattr(result, field)[row])
+        }
+        for row in range(rows)
+    ]
+
+
+def _expected(payloads: list[bytes]) -> list[dict[str, float]]:
+    return [{} if frame is None else frame[1] for frame in map(codec.decode_frame, payloads)]
+
+
+@pytest.mark.parametrize(
+    "payloads",
+    [MIXED, TRUNCATED, UNKNOWN, MIXED + TRUNCATED + UNKNOWN],
+    ids=["mixed", "truncated", "unknown", "all"],
+)
+def test_padded_payloads_match_codec(payloads: list[bytes]) -> None:
+    """Zero-padded variable-length payloads decode like ``codec.decode_frame``."""
+    frames, lengths = batch.frames_from_payloads(payloads)
+    result = batch.decode_array(frames, lengths)
+    assert _rows(result, len(payloads)) == _expected(payloads)
+    assert result.decoded.tolist() == [bool(fields) for fields in _expected(payloads)]
+
+
+def test_fixed_length_buffer_matches_codec() -> None:
+    """A buffer of 13-byte frames decodes like ``codec.decode_frame`` row by row."""
+    payloads = [payload for payload in MIXED + UNKNOWN if len(payload) == const.SENSOR_FRAME_LENGTH]
+    result = batch.decode_buffer(b"".join(payloads))
+    assert _rows(result, len(payloads)) == _expected(payloads)
+
+
+def test_memory_mapped_file_matches_codec(tmp_path) -> None:
+    """A file of 13-byte frames, after a header, decodes like the buffer."""
+    payloads = [payload for payload in MIXED if len(payload) == const.SENSOR_FRAME_LENGTH]
+    path = tmp_path / "frames.bin"
+    path.write_bytes(b"head" + b"".join(payloads))
+    result = batch.decode_file(path, offset=4)
+    assert _rows(result, len(payloads)) == _expected(payloads)
@@ -0,0 +1,91 @@
+"""Tests for the circuit breaker and the shared retry budget."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from simulator import SimulatedAdapter
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.gira_system_3000 import gira_ble
+from custom_components.gira_system_3000.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    RetryBudget,
+)
+from custom_components.gira_system_3000.gira_ble import GiraBLEClient
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+
+from .conftest import SHUTTER_ADDRESS, fast_profile
+
+
+def test_breaker_opens_after_threshold_and_probes() -> None:
+    """Consecutive failures open the breaker; a probe half-opens it."""
+    breaker = CircuitBreaker(failure_threshold=2, probe_interval_s=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+
+    assert breaker.try_probe()
+    assert breaker.state == STATE_HALF_OPEN
+    breaker.record_failure()  # a failed probe opens it again right away
+    assert breaker.state == STATE_OPEN
+    assert breaker.opened == 1
+
+    assert breaker.try_probe()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_limits_probe_rate() -> None:
+    """At most one probe per probe interval."""
+    breaker = CircuitBreaker(failure_threshold=1, probe_interval_s=3600)
+    breaker.record_failure()
+    assert not breaker.try_probe()
+    assert breaker.state == STATE_OPEN
+
+
+def test_retry_budget_denies_when_empty() -> None:
+    """Retries are granted while tokens last and counted once denied."""
+    budget = RetryBudget(ratio=0.5, min_per_s=0, max_tokens=2)
+    assert budget.withdraw(3) == 2
+    assert budget.denied == 1
+    budget.record_attempt()
+    budget.record_attempt()
+    assert budget.withdraw(1) == 1
+
+
+async def test_unreachable_device_fails_fast_until_probe(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An open breaker fails commands without connecting; an advertisement probes it."""
+    monkeypatch.setattr(gira_ble, "CONNECT_RETRY_BACKOFF_S", 0)
+    adapter = SimulatedAdapter(profile=fast_profile(connect_timeout_s=0.01), seed=1)
+    shutter = adapter.add_shutter(SHUTTER_ADDRESS)
+    shutter.reachable = False
+    client = GiraBLEClient(
+        hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass), transport=adapter
+    )
+    client.breaker = CircuitBreaker(failure_threshold=1, probe_interval_s=0)
+
+    with pytest.raises(UpdateFailed):
+        await client.send_shutter_stop_command()
+    attempts = adapter.connect_attempts
+    with pytest.raises(UpdateFailed, match="unreachable"):
+        await client.send_shutter_stop_command()
+    assert adapter.connect_attempts == attempts
+    assert client.stats.fast_failures == 1
+
+    shutter.reachable = True
+    client.async_device_seen()
+    await asyncio.sleep(0.05)
+    assert client.breaker.state == STATE_CLOSED
+    assert client.is_connected
+    await client.async_close()
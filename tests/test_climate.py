@@ -0,0 +1,43 @@
+"""Tests for the thermostat entity."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, Mock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.gira_system_3000.climate import GiraThermostat, _Runtime
+from custom_components.gira_system_3000.codec import (
+    encode_thermostat_frame,
+    thermo_raw_from_reading,
+)
+from custom_components.gira_system_3000.const import DOMAIN
+from custom_components.gira_system_3000.gira_ble import (
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+
+from .conftest import THERMOSTAT_ADDRESS
+
+
+async def test_step_only_from_reported_target(
+    thermostat_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """±0.5 °C is a step from the device's target, an absolute setpoint from an optimistic one."""
+    client = Mock(
+        supports_thermostat_step=True,
+        send_thermostat_step=AsyncMock(),
+        send_thermostat_set_target_temperature=AsyncMock(),
+    )
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": THERMOSTAT_ADDRESS})
+    thermostat = GiraThermostat(_Runtime(client, thermostat_coordinator), entry)
+    thermostat_coordinator.async_handle_manufacturer_data(
+        encode_thermostat_frame(thermo_raw_from_reading(20.5), target=True)
+    )
+
+    await thermostat.async_set_temperature(temperature=21.0)
+    client.send_thermostat_step.assert_awaited_once_with(up=True, temp_c=21.0)
+
+    # 21.0 is not reported yet: 21.5 is not a step away from the device's target.
+    await thermostat.async_set_temperature(temperature=21.5)
+    client.send_thermostat_set_target_temperature.assert_awaited_once_with(21.5)
+    assert thermostat.target_temperature == 21.5
+    assert client.send_thermostat_step.await_count == 1
@@ -0,0 +1,203 @@
+"""Tests for the protocol codec.
+
+The codec is imported through ``benchmarks/_loader.py`` like the offline
+tools do, so these tests do not need Home Assistant.
+"""
+from __future__ import annotations
+
+import pytest
+from _loader import load
+
+codec = load("codec")
+const = load("const")
+
+HEADER = codec.ADVERTISEMENT_HEADER
+
+
+def _thermo(prefix: bytearray, raw: int) -> bytes:
+    return bytes(prefix) + raw.to_bytes(2, "big")
+
+
+def test_shutter_prefix_anywhere() -> None:
+    """The position prefix is found at any offset, with one value byte after it."""
+    assert codec.decode_shutter_frame(codec.encode_shutter_frame(0)) == {"position": 100}
+    assert codec.decode_shutter_frame(b"\x01\x02" + bytes(const.SHUTTER_POS_PREFIX) + b"\xff") == {
+        "position": 0
+    }
+    assert codec.decode_shutter_frame(HEADER + bytes(const.SHUTTER_POS_PREFIX)) is None
+
+
+def test_thermostat_payload_with_both_temperatures() -> None:
+    """One payload may carry the current and the target temperature."""
+    payload = (
+        HEADER
+        + _thermo(const.THERMO_CURRENT_TEMP_PREFIX, 2050)
+        + _thermo(const.THERMO_TARGET_TEMP_PREFIX, 3150)
+    )
+    assert codec.decode_thermostat_frame(payload) == {
+        "current_temperature": 20.5,
+        "target_temperature": 21.5,
+    }
+    assert codec.decode_frame(payload) == (
+        "thermostat",
+        {"current_temperature": 20.5, "target_temperature": 21.5},
+    )
+
+
+def test_thermostat_truncated_value() -> None:
+    """A prefix without both value bytes is ignored, the other field still decodes."""
+    truncated = HEADER + _thermo(const.THERMO_TARGET_TEMP_PREFIX, 2000) + _thermo(
+        const.THERMO_CURRENT_TEMP_PREFIX, 1900
+    )[:-1]
+    assert codec.decode_thermostat_frame(truncated) == {"target_temperature": 20.0}
+    assert codec.decode_thermostat_frame(truncated[:12]) is None
+
+
+@pytest.mark.parametrize("head", [HEADER + b"\xf7\x01\x99\x01", bytes(11)])
+def test_sensor_checks_command_and_suffix_only(head: bytes) -> None:
+    """Sensor frames are matched on length and bytes 8..10, not on bytes 4..7."""
+    frame = head[:8] + bytes((const.SENSOR_CMD_TEMPERATURE, const.SENSOR_SUFFIX_0, const.SENSOR_SUFFIX_1))
+    assert codec.decode_sensor_frame(frame + b"\x08\xca") == {"sensor_temperature": 22.5}
+    assert codec.decode_frame(frame + b"\x08\xca") == ("sensor", {"sensor_temperature": 22.5})
+
+
+def test_sensor_rejects_other_frames() -> None:
+    """Wrong length, suffix or command byte is not a sensor frame."""
+    frame = codec.encode_sensor_frame(1234, brightness=True)
+    assert codec.decode_sensor_frame(frame)["sensor_brightness"] == codec.sensor_brightness_from_raw(1234)
+    assert codec.decode_sensor_frame(frame + b"\x00") is None
+    assert codec.decode_sensor_frame(frame[:9] + b"\x11" + frame[10:]) is None
+    assert codec.decode_sensor_frame(frame[:8] + b"\x00" + frame[9:]) is None
+    assert codec.decode_frame(frame[:8] + b"\x00" + frame[9:]) is None
+
+
+def test_notification_without_header() -> None:
+    """Notifications carry the frame without the advertisement header."""
+    shutter = codec.encode_shutter_frame(0x80)[len(HEADER):]
+    sensor = codec.encode_sensor_frame(2250)[len(HEADER):]
+    assert codec.decode_notification(shutter, "shutter") == {"position": 50}
+    assert codec.decode_notification(sensor, "sensor") == {"sensor_temperature": 22.5}
+    assert codec.decode_notification(shutter, "thermostat") is None
+
+
+@pytest.mark.parametrize(
+    ("property_id", "value"),
+    [(const.SHUTTER_PROPERTY_ID_MOVE, 0), (const.SHUTTER_PROPERTY_ID_STOP, 1), (const.SHUTTER_PROPERTY_ID_STEP, 255)],
+)
+def test_shutter_command_round_trip(property_id: int, value: int) -> None:
+    """Shutter commands split back into the property and value they were built from."""
+    assert codec.decode_command(codec.generate_command(property_id, value)) == (
+        "shutter",
+        property_id,
+        value,
+    )
+
+
+@pytest.mark.parametrize("percentage", [0, 1, 50, 99, 100])
+def test_position_command_round_trip(percentage: int) -> None:
+    """The set-position command carries the percentage as its value byte."""
+    assert codec.decode_command(codec.generate_position_command(percentage)) == (
+        "shutter",
+        const.SHUTTER_PROPERTY_ID_SET_POSITION,
+        percentage,
+    )
+
+
+@pytest.mark.parametrize("percentage", [-1, 101])
+def test_position_command_out_of_range(percentage: int) -> None:
+    with pytest.raises(ValueError):
+        codec.generate_position_command(percentage)
+
+
+def test_thermostat_command_round_trip() -> None:
+    """u8 values are masked, u16 values clamped, both decode back to their value."""
+    assert codec.decode_command(codec.generate_thermo_u8_command(const.THERMO_PROPERTY_ID_STEP, 0x101)) == (
+        "thermostat",
+        const.THERMO_PROPERTY_ID_STEP,
+        0x01,
+    )
+    for value, expected in ((0x1234, 0x1234), (-5, 0), (0x1_0000, 0xFFFF)):
+        assert codec.decode_command(
+            codec.generate_thermo_u16_command(const.THERMO_PROPERTY_ID_TARGET_TEMP, value)
+        ) == ("thermostat", const.THERMO_PROPERTY_ID_TARGET_TEMP, expected)
+
+
+@pytest.mark.parametrize("temp_c", [5.0, 18.5, 21.0, 21.5, 30.0])
+def test_target_temperature_command_round_trip(temp_c: float) -> None:
+    """The setpoint written to the device decodes back to the same temperature."""
+    command = codec.decode_command(codec.generate_thermo_target_temperature_command(temp_c))
+    assert command.property_id == const.THERMO_PROPERTY_ID_TARGET_TEMP
+    assert command.value == codec.thermo_raw_from_temperature(temp_c)
+    assert codec.thermo_temperature_from_command_raw(command.value) == temp_c
+
+
+def test_decode_command_rejects_other_data() -> None:
+    command = codec.generate_command(const.SHUTTER_PROPERTY_ID_STOP, 0)
+    assert codec.decode_command(command[:-1]) is None
+    assert codec.decode_command(command + b"\x00\x00") is None
+    assert codec.decode_command(b"\x00" + command[1:]) is None
+
+
+@pytest.mark.parametrize("temp_c", [0.0, 20.5, 21.0, 21.5, 28.0])
+def test_thermostat_notification_round_trip(temp_c: float) -> None:
+    """Thermostat readings survive encoding and decoding as a notification."""
+    raw = codec.thermo_raw_from_reading(temp_c)
+    for target, field in ((False, "current_temperature"), (True, "target_temperature")):
+        frame = codec.encode_thermostat_frame(raw, target=target)[len(HEADER):]
+        assert codec.decode_notification(frame, "thermostat") == {field: temp_c}
+
+
+@pytest.mark.parametrize("raw", [0x00, 0x01, 0x80, 0xFE, 0xFF])
+def test_shutter_notification_round_trip(raw: int) -> None:
+    frame = codec.encode_shutter_frame(raw)[len(HEADER):]
+    assert codec.decode_notification(frame, "shutter") == {"position": codec.shutter_position_from_raw(raw)}
+
+
+@pytest.mark.parametrize("raw", [0, 2250, 0x7FFF, 0xFFFF])
+def test_sensor_notification_round_trip(raw: int) -> None:
+    """Sensor notifications decode like the advertisement they were cut from."""
+    for brightness, field, convert in (
+        (False, "sensor_temperature", codec.sensor_temperature_from_raw),
+        (True, "sensor_brightness", codec.sensor_brightness_from_raw),
+    ):
+        frame = codec.encode_sensor_frame(raw, brightness=brightness)
+        assert codec.decode_notification(frame[len(HEADER):], "sensor") == {field: convert(raw)}
+        assert codec.decode_notification(frame, "sensor") == {field: convert(raw)}
+
+
+def test_decode_frames_of_one_device_type() -> None:
+    """With the device type only that decoder runs and the fields are returned."""
+    payloads = [codec.encode_shutter_frame(0x00), codec.encode_sensor_frame(2250), b""]
+    assert codec.decode_frames(payloads, "shutter") == [{"position": 100}, None, None]
+    assert codec.decode_frames(payloads) == [
+        ("shutter", {"position": 100}),
+        ("sensor", {"sensor_temperature": 22.5}),
+        None,
+    ]
+
+
+@pytest.mark.parametrize(
+    ("table", "convert", "size"),
+    [
+        (codec.sensor_brightness_table, codec.sensor_brightness_from_raw, 0x10000),
+        (codec.sensor_temperature_table, codec.sensor_temperature_from_raw, 0x10000),
+        (codec.thermo_temperature_table, codec.thermo_temperature_from_raw, 0x10000),
+        (codec.shutter_position_table, codec.shutter_position_from_raw, 0x100),
+        (codec.shutter_raw_table, codec.shutter_raw_from_position, 101),
+    ],
+)
+def test_tables_match_conversions(table, convert, size: int) -> None:
+    """Every table entry equals the reference conversion it is built from."""
+    assert list(table()) == [convert(raw) for raw in range(size)]
+
+
+def test_tables_built_on_first_decode() -> None:
+    """A decoder builds its table on first use; later users share that table."""
+    codec.sensor_brightness_table.cache_clear()
+    codec.decode_sensor_frame(codec.encode_sensor_frame(2250))
+    assert codec.sensor_brightness_table.cache_info().currsize == 0
+
+    fields = codec.decode_sensor_frame(codec.encode_sensor_frame(1234, brightness=True))
+    assert codec.sensor_brightness_table.cache_info().currsize == 1
+    assert fields["sensor_brightness"] == codec.sensor_brightness_table()[1234]
+    assert codec.sensor_brightness_table.cache_info().hits >= 1
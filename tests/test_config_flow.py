@@ -0,0 +1,57 @@
+"""Tests for the options flow."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.gira_system_3000.config_flow import GiraSystem3000ConfigFlow
+from custom_components.gira_system_3000.const import (
+    CONF_COMMAND_COALESCE_MS,
+    CONF_CONFIRM_COMMANDS,
+    CONF_MAX_STATE_UPDATES_PER_S,
+    DOMAIN,
+)
+
+
+pytestmark = pytest.mark.usefixtures("enable_bluetooth")
+
+
+def _entry(hass: HomeAssistant, device_type: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"address": "E8:2B:E7:00:00:01", "name": "Device", "device_type": device_type},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def _option_keys(hass: HomeAssistant, entry: MockConfigEntry) -> set[str]:
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    return {str(key) for key in result["data_schema"].schema}
+
+
+@pytest.mark.parametrize(
+    ("device_type", "present", "absent"),
+    [
+        ("shutter", {CONF_MAX_STATE_UPDATES_PER_S, CONF_COMMAND_COALESCE_MS, CONF_CONFIRM_COMMANDS}, set()),
+        ("thermostat", {CONF_COMMAND_COALESCE_MS, CONF_CONFIRM_COMMANDS}, {CONF_MAX_STATE_UPDATES_PER_S}),
+    ],
+)
+async def test_options_depend_on_device_type(
+    hass: HomeAssistant, device_type: str, present: set[str], absent: set[str]
+) -> None:
+    """Only the options that apply to the device type are offered."""
+    keys = await _option_keys(hass, _entry(hass, device_type))
+    assert present <= keys
+    assert not absent & keys
+
+
+async def test_sensor_has_no_options(hass: HomeAssistant) -> None:
+    """Broadcast-only sensors do not offer an options flow."""
+    entry = _entry(hass, "sensor")
+    assert not GiraSystem3000ConfigFlow.async_supports_options_flow(entry)
+    assert GiraSystem3000ConfigFlow.async_supports_options_flow(_entry(hass, "shutter"))
@@ -0,0 +1,88 @@
+"""Tests for the passive coordinator's advertisement handling."""
+from __future__ import annotations
+
+from custom_components.gira_system_3000.codec import (
+    encode_shutter_frame,
+    encode_thermostat_frame,
+    lookup_shutter_raw,
+    thermo_raw_from_reading,
+)
+from custom_components.gira_system_3000.gira_ble import (
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+
+
+def _position(percent: int) -> bytes:
+    return encode_shutter_frame(lookup_shutter_raw(percent))
+
+
+def _temperature(temp_c: float, *, target: bool = False) -> bytes:
+    return encode_thermostat_frame(thermo_raw_from_reading(temp_c), target=target)
+
+
+async def test_duplicate_advertisement_is_skipped(
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """An advertisement identical to the applied one changes nothing."""
+    assert shutter_coordinator.async_handle_manufacturer_data(_position(30)) == {"position": 30}
+    assert shutter_coordinator.async_handle_manufacturer_data(_position(30)) is None
+    assert len(shutter_coordinator.stats.parse_us) == 1
+
+
+async def test_position_returning_to_a_seen_value(
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """A payload seen before a state change is applied again (30 -> 40 -> 30)."""
+    for percent in (30, 40, 30):
+        shutter_coordinator.async_handle_manufacturer_data(_position(percent))
+        assert shutter_coordinator.data["position"] == percent
+
+
+async def test_oscillating_thermostat_reading(
+    thermostat_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """Alternating frame types and a reading that comes back are all applied."""
+    coordinator = thermostat_coordinator
+    for payload, field, value in (
+        (_temperature(20.0), "current_temperature", 20.0),
+        (_temperature(21.0, target=True), "target_temperature", 21.0),
+        (_temperature(20.5), "current_temperature", 20.5),
+        (_temperature(21.0, target=True), "target_temperature", 21.0),
+        (_temperature(20.0), "current_temperature", 20.0),
+    ):
+        coordinator.async_handle_manufacturer_data(payload)
+        assert coordinator.data[field] == value
+
+
+async def test_notification_makes_old_advertisement_current_again(
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """After a notification changed the state, the old advertisement applies again."""
+    coordinator = shutter_coordinator
+    coordinator.async_handle_manufacturer_data(_position(30))
+    coordinator.async_handle_notification(_position(60)[4:])
+    assert coordinator.data["position"] == 60
+    coordinator.async_handle_manufacturer_data(_position(30))
+    assert coordinator.data["position"] == 30
+
+
+async def test_optimistic_update_does_not_hide_the_reported_state(
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """The device's own advertisement overrides an optimistic value it already sent."""
+    coordinator = shutter_coordinator
+    coordinator.async_handle_manufacturer_data(_position(30))
+    coordinator.async_set_field("position", 80)
+    coordinator.async_handle_manufacturer_data(_position(30))
+    assert coordinator.data["position"] == 30
+
+
+async def test_thermostat_payload_with_both_temperatures(
+    thermostat_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """A payload carrying current and target temperature updates both."""
+    payload = _temperature(20.5) + _temperature(22.0, target=True)[4:]
+    assert thermostat_coordinator.async_handle_manufacturer_data(payload) == {
+        "current_temperature": 20.5,
+        "target_temperature": 22.0,
+    }
@@ -0,0 +1,144 @@
+"""Tests for the cover entity: interpolation while moving and reconciliation."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gira_system_3000 import cover, gira_ble
+from custom_components.gira_system_3000.codec import encode_shutter_frame, lookup_shutter_raw
+from custom_components.gira_system_3000.const import (
+    CONF_MAX_STATE_UPDATES_PER_S,
+    DOMAIN,
+    INTERPOLATION_TOLERANCE_PCT,
+)
+from custom_components.gira_system_3000.dispatcher import async_get_dispatcher
+from custom_components.gira_system_3000.gira_ble import (
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+from custom_components.gira_system_3000.motion import async_get_timer_wheel
+
+from .conftest import SHUTTER_ADDRESS
+
+MAX_RATE = 10  # state writes per second: interpolation every 0.1 s
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """A fake monotonic clock shared by the coordinator and the cover."""
+    now = [1000.0]
+    fake = SimpleNamespace(monotonic=lambda: now[0], perf_counter_ns=time.perf_counter_ns)
+    monkeypatch.setattr(gira_ble, "time", fake)
+    monkeypatch.setattr(cover, "time", fake)
+    return now
+
+
+def _cover(
+    hass: HomeAssistant, max_rate: float = MAX_RATE
+) -> tuple[cover.GiraSystem3000Cover, GiraPassiveBluetoothDataUpdateCoordinator]:
+    """Return a cover whose state writes are recorded instead of written."""
+    coordinator = GiraPassiveBluetoothDataUpdateCoordinator(
+        hass,
+        SHUTTER_ADDRESS,
+        "Shutter",
+        "shutter",
+        async_get_dispatcher(hass),
+        timer_wheel=async_get_timer_wheel(hass),
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"address": SHUTTER_ADDRESS},
+        options={CONF_MAX_STATE_UPDATES_PER_S: max_rate},
+    )
+    entity = cover.GiraSystem3000Cover(coordinator, Mock(address=SHUTTER_ADDRESS), entry)
+    entity.hass = hass
+    entity.async_write_ha_state = Mock()
+    return entity, coordinator
+
+
+def _advertise(
+    entity: cover.GiraSystem3000Cover,
+    coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+    position: int,
+) -> None:
+    coordinator.async_handle_manufacturer_data(encode_shutter_frame(lookup_shutter_raw(position)))
+    entity._handle_coordinator_update()
+
+
+def _stop(hass: HomeAssistant, coordinator: GiraPassiveBluetoothDataUpdateCoordinator) -> None:
+    coordinator.motion.async_reset()
+    async_get_timer_wheel(hass).async_stop()
+
+
+async def test_interpolates_between_advertisements(
+    hass: HomeAssistant, enable_bluetooth: None, clock: list[float]
+) -> None:
+    """While moving, the cover shows the estimate, bounded by the commanded target."""
+    entity, coordinator = _cover(hass)
+    _advertise(entity, coordinator, 40)
+    clock[0] += 0.5
+    _advertise(entity, coordinator, 50)  # opening at 20 %/s
+    assert entity.current_cover_position == 50
+    assert entity.is_opening
+
+    clock[0] += 0.25
+    entity._async_interpolate()
+    assert entity.current_cover_position == 55
+    writes = entity.async_write_ha_state.call_count
+
+    entity._set_motion_target(58)
+    clock[0] += 0.25
+    entity._async_interpolate()
+    assert entity.current_cover_position == 58
+    clock[0] += 0.25
+    entity._async_interpolate()  # at the target: nothing new to write
+    assert entity.current_cover_position == 58
+    assert entity.async_write_ha_state.call_count == writes + 1
+    _stop(hass, coordinator)
+
+
+async def test_advertisement_within_tolerance_not_written(
+    hass: HomeAssistant, enable_bluetooth: None, clock: list[float]
+) -> None:
+    """An advertisement close to the interpolated position is not written; a far one reconciles."""
+    entity, coordinator = _cover(hass)
+    _advertise(entity, coordinator, 40)
+    clock[0] += 0.5
+    _advertise(entity, coordinator, 50)
+    clock[0] += 0.5
+    entity._async_interpolate()
+    assert entity.current_cover_position == 60
+    writes = entity.async_write_ha_state.call_count
+
+    clock[0] += 0.2
+    _advertise(entity, coordinator, 60 - INTERPOLATION_TOLERANCE_PCT)
+    assert entity.current_cover_position == 60
+    assert entity.async_write_ha_state.call_count == writes
+    # The coordinator still records how far off the estimate was.
+    assert len(coordinator.stats.estimate_error_pct) == 1
+
+    clock[0] += 0.2
+    _advertise(entity, coordinator, 60 + INTERPOLATION_TOLERANCE_PCT + 1)
+    assert entity.current_cover_position == 60 + INTERPOLATION_TOLERANCE_PCT + 1
+    assert entity.async_write_ha_state.call_count == writes + 1
+    assert len(coordinator.stats.estimate_error_pct) == 2
+    _stop(hass, coordinator)
+
+
+async def test_every_advertisement_written_without_interpolation(
+    hass: HomeAssistant, enable_bluetooth: None, clock: list[float]
+) -> None:
+    """Without a write interval there is no interpolation and no tolerance."""
+    entity, coordinator = _cover(hass, max_rate=0)
+    for position in (40, 42, 43):
+        clock[0] += 0.5
+        _advertise(entity, coordinator, position)
+        assert entity.current_cover_position == position
+    assert entity.async_write_ha_state.call_count == 3
+    assert len(async_get_timer_wheel(hass)) == 1  # the motion stop timer only
+    _stop(hass, coordinator)
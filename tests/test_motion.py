@@ -0,0 +1,138 @@
+"""Tests for the timer wheel and shutter motion tracking."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.gira_system_3000.const import TRAVEL_MIN_DISTANCE
+from custom_components.gira_system_3000.motion import (
+    DIRECTION_CLOSING,
+    DIRECTION_OPENING,
+    ShutterMotion,
+    TimerWheel,
+    TravelModel,
+)
+
+TICK_S = 0.01
+
+
+async def test_timer_wheel_fires_in_order(hass: HomeAssistant) -> None:
+    """Timers fire after their delay, including ones longer than a turn."""
+    wheel = TimerWheel(hass.loop, tick_s=TICK_S, slots=4)
+    fired: list[str] = []
+    wheel.schedule("late", 0.1, lambda: fired.append("late"))  # > 2 turns of the wheel
+    wheel.schedule("early", 0.02, lambda: fired.append("early"))
+    assert len(wheel) == 2
+
+    await asyncio.sleep(0.06)
+    assert fired == ["early"]
+    await asyncio.sleep(0.1)
+    assert fired == ["early", "late"]
+    assert len(wheel) == 0
+
+
+async def test_timer_wheel_reschedule_and_cancel(hass: HomeAssistant) -> None:
+    """Scheduling a key again replaces its timer; cancel drops it."""
+    wheel = TimerWheel(hass.loop, tick_s=TICK_S, slots=8)
+    fired: list[str] = []
+    wheel.schedule("a", 0.02, lambda: fired.append("first"))
+    wheel.schedule("a", 0.05, lambda: fired.append("second"))
+    wheel.schedule("b", 0.02, lambda: fired.append("b"))
+    wheel.cancel("b")
+    wheel.cancel("missing")
+
+    await asyncio.sleep(0.1)
+    assert fired == ["second"]
+    wheel.async_stop()
+
+
+async def test_motion_reports_stop_after_timeout(hass: HomeAssistant) -> None:
+    """Direction comes from position changes; silence ends the run."""
+    wheel = TimerWheel(hass.loop, tick_s=TICK_S)
+    stopped: list[int] = []
+    motion = ShutterMotion(wheel, "shutter", stopped.append, stop_timeout_s=0.05)
+
+    now = time.monotonic()
+    for step, position in enumerate((10, 12, 14)):
+        motion.async_update(position, now + step * 0.01)
+    assert motion.is_opening
+    assert motion.velocity > 0
+    assert motion.estimate_position(now + 0.03) > 14
+
+    await asyncio.sleep(0.12)
+    assert stopped == [14]
+    assert not motion.moving
+    motion.async_reset()
+
+
+def test_travel_model_learns_per_direction() -> None:
+    """Speeds are learned per direction; an unlearned direction borrows the other."""
+    model = TravelModel(default_travel_s=20.0)
+    assert model.speed(DIRECTION_OPENING) == model.speed(DIRECTION_CLOSING) == 5.0
+
+    model.learn(DIRECTION_CLOSING, 50, 5.0)
+    assert model.speed(DIRECTION_CLOSING) == model.speed(DIRECTION_OPENING) == 10.0
+    model.learn(DIRECTION_CLOSING, 100, 5.0)  # 20 %/s, weighted into the average
+    assert model.speed(DIRECTION_CLOSING) == pytest.approx(13.0)
+
+    model.learn(DIRECTION_OPENING, TRAVEL_MIN_DISTANCE - 1, 0.1)  # too short
+    model.learn(DIRECTION_OPENING, 50, 0.0)
+    assert model.runs == 2
+    model.learn(DIRECTION_OPENING, 40, 10.0)
+    assert model.speed(DIRECTION_OPENING) == 4.0
+    assert model.travel_s(20, 60) == 10.0
+    assert model.travel_s(60, 21) == pytest.approx(3.0)
+    assert model.travel_s(50, 50) == 0.0
+
+
+async def test_motion_learns_finished_runs(hass: HomeAssistant) -> None:
+    """A run is timed from its first position change and learned when it ends."""
+    wheel = TimerWheel(hass.loop, tick_s=TICK_S)
+    motion = ShutterMotion(wheel, "shutter", lambda _: None, stop_timeout_s=5.0)
+
+    for now, position in ((0.0, 10), (2.0, 20), (4.0, 30)):
+        motion.async_update(position, now)
+    assert motion.travel.runs == 0
+    motion.async_update(25, 5.0)  # reversal ends the opening run: 10 % in 2 s
+
+    assert motion.travel.runs == 1
+    assert motion.travel.speed(DIRECTION_OPENING) == 5.0
+    assert motion.is_closing
+    assert motion.time_to(0, 5.0) == pytest.approx(25 / 5.0)
+    motion.async_reset()
+    wheel.async_stop()
+
+
+async def test_estimate_position(hass: HomeAssistant) -> None:
+    """The estimate follows the measured speed, bounded by time, target and end stops."""
+    wheel = TimerWheel(hass.loop, tick_s=TICK_S)
+    motion = ShutterMotion(wheel, "shutter", lambda _: None, stop_timeout_s=5.0)
+    assert motion.estimate_position(0.0) is None
+
+    motion.async_update(40, 0.0)
+    assert motion.estimate_position(1.0) == 40  # not moving
+    motion.async_update(42, 0.5)  # opening at 4 %/s
+    assert motion.estimate_position(0.75) == pytest.approx(43.0)
+    assert motion.estimate_position(10.0) == pytest.approx(46.0)  # at most 1 s ahead
+    motion.target = 45
+    assert motion.estimate_position(10.0) == 45
+    motion.target = 30  # behind the shutter: no bound
+    assert motion.estimate_position(10.0) == pytest.approx(46.0)
+
+    motion.async_reset()
+    motion.async_update(3, 0.0)
+    motion.async_update(1, 0.5)
+    assert motion.estimate_position(1.5) == 0.0
+
+    # First change after a long pause: no speed measured, the learned one applies.
+    motion.async_reset()
+    motion.async_update(40, 0.0)
+    motion.async_update(42, 10.0)
+    assert motion.velocity == 0.0
+    assert motion.estimate_position(10.5) == pytest.approx(42 + motion.travel.default_speed * 0.5)
+    motion.async_reset()
+    wheel.async_stop()
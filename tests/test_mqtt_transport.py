@@ -0,0 +1,139 @@
+"""Tests for the ESP32/MQTT transport."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from simulator import LocalBroker, SimulatedAdapter, SimulatedEsp32Node
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.gira_system_3000.codec import (
+    generate_command,
+    generate_thermo_target_temperature_command,
+    generate_thermo_u8_command,
+)
+from custom_components.gira_system_3000.const import (
+    SHUTTER_PROPERTY_ID_MOVE,
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+    SHUTTER_PROPERTY_ID_STOP,
+    SHUTTER_VALUE_DOWN,
+    SHUTTER_VALUE_STOP,
+    SHUTTER_VALUE_UP,
+    THERMO_PROPERTY_ID_STEP,
+    THERMO_PROPERTY_ID_TIMER_HEAT,
+    THERMO_VALUE_START,
+)
+from custom_components.gira_system_3000.gira_ble import GiraBLEClient
+from custom_components.gira_system_3000.mqtt_transport import (
+    GiraMqttBridge,
+    MqttTransport,
+    command_string,
+)
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+from custom_components.gira_system_3000.transport import UnsupportedCommandError
+
+from .conftest import SHUTTER_ADDRESS, fast_profile
+
+
+@pytest.mark.parametrize(
+    ("command", "expected"),
+    [
+        (generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, 0xFF), "shutter set_pos=0"),
+        (generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, 0x00), "shutter set_pos=100"),
+        (generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_UP), "shutter move=up"),
+        (generate_command(SHUTTER_PROPERTY_ID_MOVE, SHUTTER_VALUE_DOWN), "shutter move=down"),
+        (generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP), "shutter stop=1"),
+        (generate_thermo_target_temperature_command(21.5), "thermostat set_target_c=21.5"),
+    ],
+)
+def test_command_string(command: bytearray, expected: str) -> None:
+    """GATT commands translate into the node's command strings."""
+    assert command_string(command) == expected
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        generate_thermo_u8_command(THERMO_PROPERTY_ID_STEP, 0x01),
+        generate_thermo_u8_command(THERMO_PROPERTY_ID_TIMER_HEAT, THERMO_VALUE_START),
+    ],
+)
+def test_command_string_unsupported(command: bytearray) -> None:
+    """Commands without a node equivalent raise UnsupportedCommandError."""
+    with pytest.raises(UnsupportedCommandError):
+        command_string(command)
+
+
+async def _node_client(hass: HomeAssistant) -> tuple[GiraBLEClient, SimulatedAdapter, SimulatedEsp32Node]:
+    """Return a client driving a simulated shutter through one ESP32 node."""
+    broker = LocalBroker()
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    adapter.add_shutter(SHUTTER_ADDRESS, position_u8=0xFF)
+    node = SimulatedEsp32Node(broker.publish, broker.subscribe, "node1", adapter)
+    await node.async_start()
+    bridge = GiraMqttBridge(broker.publish, broker.subscribe, connect_timeout_s=1, pair_timeout_s=1)
+    scheduler = GiraConnectionScheduler(hass)
+    scheduler.async_set_slots(await bridge.async_add_node("node1"), 1)
+    client = GiraBLEClient(
+        hass,
+        SHUTTER_ADDRESS,
+        "Shutter",
+        scheduler=scheduler,
+        transport=MqttTransport(bridge, ["node1"]),
+    )
+    return client, adapter, node
+
+
+async def _close(client: GiraBLEClient, adapter: SimulatedAdapter) -> None:
+    await client.async_close()
+    await asyncio.sleep(0.05)  # let the node publish its final status
+    adapter.stop()
+
+
+async def test_commands_through_node(hass: HomeAssistant) -> None:
+    """A set-position is published as a command string and reaches the device."""
+    client, adapter, node = await _node_client(hass)
+
+    await client.send_set_position_command(0x00)
+    await asyncio.sleep(0.05)  # the node writes to the device in its own task
+
+    assert "shutter set_pos=100" in node.commands
+    assert adapter.devices[SHUTTER_ADDRESS].target_u8 == 0x00
+    await _close(client, adapter)
+
+
+async def test_unsupported_command_not_retried(hass: HomeAssistant) -> None:
+    """A command the node cannot express fails once, without reconnecting."""
+    client, adapter, node = await _node_client(hass)
+    assert client.supports_thermostat_step is False
+
+    with pytest.raises(UpdateFailed, match="no MQTT equivalent"):
+        await client.send_thermostat_step(up=True, temp_c=21.5)
+
+    assert adapter.connect_attempts == 1
+    assert client.is_connected
+    assert client.stats.retries == 0
+    assert client.breaker.consecutive_failures == 0
+    with pytest.raises(UpdateFailed):
+        await client.send_thermostat_timer_heat(start=True)
+    assert adapter.connect_attempts == 1
+    assert not any(command.startswith("thermostat") for command in node.commands)
+    await _close(client, adapter)
+
+
+async def test_session_skips_unsupported_command(hass: HomeAssistant) -> None:
+    """The heating timer has no node command; the setpoint after it is still sent."""
+    client, adapter, node = await _node_client(hass)
+
+    result = await client.send_thermostat_heat_and_target(True, 21.5)
+
+    assert result.complete
+    assert result.error is None
+    assert (result.sent, result.total, result.skipped) == (1, 2, (0,))
+    assert [command for command in node.commands if command.startswith("thermostat")] == [
+        "thermostat set_target_c=21.5"
+    ]
+    assert client.breaker.consecutive_failures == 0
+    await _close(client, adapter)
@@ -0,0 +1,389 @@
+"""Tests for the client command queue, its coalescing stage, link reuse and
+confirmation by reported state."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from simulator import SimulatedAdapter
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.gira_system_3000 import gira_ble
+from custom_components.gira_system_3000.codec import (
+    decode_command,
+    encode_shutter_frame,
+    generate_command,
+    generate_thermo_target_temperature_command,
+    generate_thermo_u8_command,
+    lookup_shutter_raw,
+)
+from custom_components.gira_system_3000.const import (
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+    SHUTTER_PROPERTY_ID_STOP,
+    SHUTTER_VALUE_STOP,
+    THERMO_PROPERTY_ID_STEP,
+)
+from custom_components.gira_system_3000.gira_ble import (
+    GiraBLEClient,
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+from custom_components.gira_system_3000.transport import Route
+
+from .conftest import SHUTTER_ADDRESS, THERMOSTAT_ADDRESS, fast_profile
+
+WINDOW_S = 0.05
+STOP = bytes(generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP))
+STEP_UP = bytes(generate_thermo_u8_command(THERMO_PROPERTY_ID_STEP, 0x01))
+
+
+def _setpoint(temp_c: float) -> bytes:
+    return bytes(generate_thermo_target_temperature_command(temp_c))
+
+
+class _BlockingLink:
+    """A link whose set-position writes hang until released."""
+
+    def __init__(self) -> None:
+        self.is_connected = True
+        self.writes: list[bytes] = []
+        self.write_started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def write_gatt_char(self, char_specifier: str, data: bytes, response: bool = True) -> None:
+        self.writes.append(bytes(data))
+        if decode_command(data).property_id == SHUTTER_PROPERTY_ID_SET_POSITION:
+            self.write_started.set()
+            await self.release.wait()
+
+    async def start_notify(self, char_specifier: str, callback: Any) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+
+
+class _BlockingTransport:
+    """One adapter; connecting waits for ``connect_gate``."""
+
+    def __init__(self) -> None:
+        self.link = _BlockingLink()
+        self.connects = 0
+        self.connecting = asyncio.Event()
+        self.connect_gate = asyncio.Event()
+        self.connect_gate.set()
+
+    def resolve(self, address: str) -> tuple[Any, str]:
+        return address, "hci0"
+
+    def routes(self, address: str) -> list[Route]:
+        return [Route(address, "hci0", -60)]
+
+    async def connect(self, device: Any, name: str, **kwargs: Any) -> _BlockingLink:
+        self.connects += 1
+        self.connecting.set()
+        await self.connect_gate.wait()
+        return self.link
+
+
+def _client(hass: HomeAssistant, adapter: SimulatedAdapter) -> GiraBLEClient:
+    return GiraBLEClient(
+        hass,
+        SHUTTER_ADDRESS,
+        "Shutter",
+        scheduler=GiraConnectionScheduler(hass),
+        coalesce_window_s=WINDOW_S,
+        transport=adapter,
+    )
+
+
+async def test_stop_inside_coalescing_window_wins(hass: HomeAssistant) -> None:
+    """A STOP drops a set-position that is still waiting in the coalescing window."""
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    shutter = adapter.add_shutter(SHUTTER_ADDRESS, position_u8=100)
+    client = _client(hass, adapter)
+
+    move = asyncio.create_task(client.send_set_position_command(200))
+    await asyncio.sleep(0)
+    await client.send_shutter_stop_command()
+    await move  # resolved as superseded, without error
+    await asyncio.sleep(WINDOW_S * 2)
+
+    assert shutter.target_u8 == shutter.position_u8 == 100
+    assert client.coalesced_writes == 1
+    assert adapter.connect_attempts == 1
+    await client.async_close()
+    adapter.stop()
+
+
+async def test_newer_motion_command_replaces_coalescing_position(hass: HomeAssistant) -> None:
+    """Up/down issued inside the window replaces the pending set-position."""
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    shutter = adapter.add_shutter(SHUTTER_ADDRESS, position_u8=100)
+    client = _client(hass, adapter)
+
+    move = asyncio.create_task(client.send_set_position_command(200))
+    await asyncio.sleep(0)
+    await client.send_shutter_up_command()
+    await move
+    await asyncio.sleep(WINDOW_S * 2)
+
+    assert shutter.target_u8 == 0
+    await client.async_close()
+    adapter.stop()
+
+
+async def test_notifications_on_prewarmed_link(hass: HomeAssistant) -> None:
+    """A command on a pre-warmed link still gets the device's notifications."""
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    adapter.add_shutter(SHUTTER_ADDRESS, position_u8=100)
+    notifications: list[bytes] = []
+    client = GiraBLEClient(
+        hass,
+        SHUTTER_ADDRESS,
+        "Shutter",
+        scheduler=GiraConnectionScheduler(hass),
+        on_notification=notifications.append,
+        transport=adapter,
+    )
+
+    assert await client.async_prewarm(hold_s=5)
+    await client.send_set_position_command(110)
+    await asyncio.sleep(0.05)
+
+    assert notifications
+    assert adapter.connect_attempts == 1
+    await client.async_close()
+    adapter.stop()
+
+
+async def test_setpoint_keeps_queued_heat_session(hass: HomeAssistant) -> None:
+    """A plain setpoint queued after a heating-timer session does not drop it."""
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    adapter.add_shutter(THERMOSTAT_ADDRESS)  # any simulated device accepts the writes
+    client = GiraBLEClient(
+        hass,
+        THERMOSTAT_ADDRESS,
+        "Thermostat",
+        scheduler=GiraConnectionScheduler(hass),
+        transport=adapter,
+    )
+
+    first = asyncio.create_task(client.send_thermostat_set_target_temperature(20.0))
+    await asyncio.sleep(0)  # active: connecting
+    session = asyncio.create_task(client.send_thermostat_heat_and_target(True, 21.0))
+    await asyncio.sleep(0)
+    await client.send_thermostat_set_target_temperature(22.0)
+    await first
+
+    assert (await session).complete
+    await client.async_close()
+    adapter.stop()
+
+
+async def test_stop_preempts_in_flight_write(hass: HomeAssistant) -> None:
+    """A STOP cancels a set-position stuck mid-write and reuses the link."""
+    transport = _BlockingTransport()
+    client = GiraBLEClient(
+        hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass), transport=transport
+    )
+
+    move = asyncio.create_task(client.send_set_position_command(200))
+    await transport.link.write_started.wait()
+    await asyncio.wait_for(client.send_shutter_stop_command(), 1)
+    await move  # pre-empted, without error
+
+    assert transport.link.writes[-1] == STOP
+    assert len(transport.link.writes) == 2
+    assert transport.connects == 1
+    assert client.is_connected
+    await client.async_close()
+
+
+async def test_stop_while_connecting_keeps_the_connection(hass: HomeAssistant) -> None:
+    """A STOP during the connect lets it finish and only skips the superseded write."""
+    transport = _BlockingTransport()
+    transport.connect_gate.clear()
+    client = GiraBLEClient(
+        hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass), transport=transport
+    )
+
+    move = asyncio.create_task(client.send_set_position_command(200))
+    await transport.connecting.wait()
+    stop = asyncio.create_task(client.send_shutter_stop_command())
+    await asyncio.sleep(0)
+    transport.connect_gate.set()
+    await asyncio.wait_for(asyncio.gather(move, stop), 1)
+
+    assert transport.link.writes == [STOP]
+    assert transport.connects == 1
+    await client.async_close()
+
+
+async def test_step_does_not_overtake_a_coalescing_setpoint(hass: HomeAssistant) -> None:
+    """A step while a setpoint waits in the window is sent as that setpoint's successor."""
+    transport = _BlockingTransport()
+    client = GiraBLEClient(
+        hass,
+        THERMOSTAT_ADDRESS,
+        "Thermostat",
+        scheduler=GiraConnectionScheduler(hass),
+        coalesce_window_s=WINDOW_S,
+        transport=transport,
+    )
+
+    first = asyncio.create_task(client.send_thermostat_set_target_temperature(21.0))
+    await asyncio.sleep(0)
+    await client.send_thermostat_step(up=True, temp_c=21.5)
+    await first
+    assert transport.link.writes == [_setpoint(21.5)]
+
+    await client.send_thermostat_step(up=True, temp_c=22.0)
+    assert transport.link.writes[-1] == STEP_UP
+    await client.async_close()
+
+
+async def test_unconfirmed_step_is_resent_as_setpoint(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """In confirmation mode a step that is not reported is resent as the absolute setpoint."""
+    monkeypatch.setattr(gira_ble, "CONFIRM_TIMEOUT_S", 0.01)
+    transport = _BlockingTransport()
+    client = GiraBLEClient(
+        hass, THERMOSTAT_ADDRESS, "Thermostat", scheduler=GiraConnectionScheduler(hass), transport=transport
+    )
+    client.async_set_state_confirmation(lambda check: hass.loop.create_future())
+
+    with pytest.raises(UpdateFailed):
+        await client.send_thermostat_step(up=True, temp_c=21.5)
+    assert transport.link.writes == [STEP_UP] + [_setpoint(21.5)] * gira_ble.CONFIRM_RESENDS
+    await client.async_close()
+
+
+def _confirming_client(
+    hass: HomeAssistant, coordinator: GiraPassiveBluetoothDataUpdateCoordinator
+) -> tuple[GiraBLEClient, _BlockingTransport]:
+    """Return a shutter client confirming its commands by the coordinator's reports."""
+    transport = _BlockingTransport()
+    transport.link.release.set()
+    client = GiraBLEClient(
+        hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass), transport=transport
+    )
+    client.async_set_state_confirmation(coordinator.async_expect_state)
+    return client, transport
+
+
+def _report(coordinator: GiraPassiveBluetoothDataUpdateCoordinator, percent: int) -> None:
+    coordinator.async_handle_manufacturer_data(encode_shutter_frame(lookup_shutter_raw(percent)))
+
+
+async def _writes(link: _BlockingLink, count: int) -> None:
+    """Wait until the link has seen ``count`` writes."""
+    async with asyncio.timeout(1):
+        while len(link.writes) < count:
+            await asyncio.sleep(0.001)
+
+
+async def test_expect_state_checks_every_report(
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+) -> None:
+    """Expectations see the state before and now; a matching state resolves at once."""
+    _report(shutter_coordinator, 60)
+    seen: list[tuple[int, int]] = []
+
+    def check(before: dict[str, Any], now: dict[str, Any]) -> bool:
+        seen.append((before["position"], now["position"]))
+        return now["position"] == 40
+
+    expected = shutter_coordinator.async_expect_state(check)
+    _report(shutter_coordinator, 50)
+    assert not expected.done()
+    _report(shutter_coordinator, 40)
+    assert expected.done()
+    assert seen == [(60, 60), (60, 50), (60, 40)]
+    assert shutter_coordinator.async_expect_state(check).done()
+
+
+async def test_position_confirmed_by_movement(
+    hass: HomeAssistant, shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator
+) -> None:
+    """A set-position is confirmed by a report between the old position and the target."""
+    client, transport = _confirming_client(hass, shutter_coordinator)
+    _report(shutter_coordinator, 100)
+
+    move = asyncio.create_task(client.send_set_position_command(lookup_shutter_raw(50)))
+    await _writes(transport.link, 1)
+    _report(shutter_coordinator, 90)
+    await asyncio.wait_for(move, 1)
+
+    assert len(transport.link.writes) == 1
+    assert (client.stats.confirmed, client.stats.resends) == (1, 0)
+    await client.async_close()
+
+
+async def test_position_past_target_is_resent(
+    hass: HomeAssistant,
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Movement beyond the target does not confirm; the command is resent, then confirmed."""
+    monkeypatch.setattr(gira_ble, "CONFIRM_TIMEOUT_S", 0.05)
+    client, transport = _confirming_client(hass, shutter_coordinator)
+    _report(shutter_coordinator, 60)
+
+    move = asyncio.create_task(client.send_set_position_command(lookup_shutter_raw(50)))
+    await _writes(transport.link, 1)
+    _report(shutter_coordinator, 30)  # still closing from an earlier command
+    await _writes(transport.link, 2)
+    assert not move.done()
+    _report(shutter_coordinator, 50)
+    await asyncio.wait_for(move, 1)
+
+    assert transport.link.writes == [bytes(generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, lookup_shutter_raw(50)))] * 2
+    assert (client.stats.confirmed, client.stats.resends, client.stats.unconfirmed) == (1, 1, 0)
+    await client.async_close()
+
+
+async def test_unconfirmed_position_fails_after_resends(
+    hass: HomeAssistant,
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(gira_ble, "CONFIRM_TIMEOUT_S", 0.01)
+    client, transport = _confirming_client(hass, shutter_coordinator)
+    _report(shutter_coordinator, 60)
+
+    with pytest.raises(UpdateFailed, match="did not confirm"):
+        await client.send_set_position_command(lookup_shutter_raw(50))
+    assert len(transport.link.writes) == 1 + gira_ble.CONFIRM_RESENDS
+    assert (client.stats.resends, client.stats.unconfirmed) == (gira_ble.CONFIRM_RESENDS, 1)
+    await client.async_close()
+
+
+async def test_superseded_position_not_confirmed_or_resent(
+    hass: HomeAssistant,
+    shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A newer position or a STOP ends the wait for the older command without a resend."""
+    monkeypatch.setattr(gira_ble, "CONFIRM_TIMEOUT_S", 0.05)
+    client, transport = _confirming_client(hass, shutter_coordinator)
+    _report(shutter_coordinator, 60)
+
+    first = asyncio.create_task(client.send_set_position_command(lookup_shutter_raw(50)))
+    await _writes(transport.link, 1)
+    second = asyncio.create_task(client.send_set_position_command(lookup_shutter_raw(20)))
+    await _writes(transport.link, 2)
+    await client.send_shutter_stop_command()
+    await asyncio.wait_for(asyncio.gather(first, second), 1)
+
+    assert [decode_command(data).value for data in transport.link.writes] == [
+        lookup_shutter_raw(50),
+        lookup_shutter_raw(20),
+        SHUTTER_VALUE_STOP,
+    ]
+    assert (client.stats.confirmed, client.stats.resends, client.stats.unconfirmed) == (0, 0, 0)
+    await client.async_close()
@@ -0,0 +1,79 @@
+"""Tests for the per-device adapter router."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from custom_components.gira_system_3000.codec import encode_shutter_frame
+from custom_components.gira_system_3000.const import GIRA_MANUFACTURER_ID
+from custom_components.gira_system_3000.dispatcher import async_get_dispatcher
+from custom_components.gira_system_3000.gira_ble import (
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+from custom_components.gira_system_3000.router import AdapterRouter
+from custom_components.gira_system_3000.transport import Route
+
+from .conftest import SHUTTER_ADDRESS
+
+
+def _advertisement(source: str, rssi: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        address=SHUTTER_ADDRESS,
+        source=source,
+        rssi=rssi,
+        manufacturer_data={GIRA_MANUFACTURER_ID: encode_shutter_frame(0x80)},
+    )
+
+
+def test_rank_prefers_strong_signal() -> None:
+    """Without connect history the route with the better RSSI ranks first."""
+    router = AdapterRouter()
+    routes = [Route(None, "weak", -96), Route(None, "strong", -60)]
+    assert [route.source for route in router.rank(routes, lambda _: 0)] == ["strong", "weak"]
+
+
+def test_rank_does_not_record_rssi() -> None:
+    """Ranking reads the averages fed by advertisements and leaves them unchanged."""
+    router = AdapterRouter()
+    router.observe_rssi("observed", -95)
+    routes = [Route(None, "observed", -60), Route(None, "unseen", -80)]
+    for _ in range(3):
+        assert [route.source for route in router.rank(routes, lambda _: 0)] == ["unseen", "observed"]
+    assert router.as_dict()["observed"]["rssi"] == -95
+    assert "unseen" not in router.as_dict()
+
+
+def test_rank_avoids_failing_route() -> None:
+    """Connect failures outweigh a good signal."""
+    router = AdapterRouter()
+    for _ in range(5):
+        router.record_failure("strong")
+    router.record_connect("weak", 1.0)
+    routes = [Route(None, "strong", -60), Route(None, "weak", -80)]
+    assert router.rank(routes, lambda _: 0)[0].source == "weak"
+
+
+async def test_dispatcher_feeds_rssi_of_every_advertisement(
+    hass: HomeAssistant, shutter_coordinator: GiraPassiveBluetoothDataUpdateCoordinator
+) -> None:
+    """Each advertisement updates the RSSI average of the adapter that heard it."""
+    router = AdapterRouter()
+    shutter_coordinator.async_set_rssi_listener(router.observe_rssi)
+    dispatcher = async_get_dispatcher(hass)
+    unregister = dispatcher.async_register(shutter_coordinator)
+
+    for rssi in (-60, -90, -90, -90):
+        dispatcher._async_handle_advertisement(
+            _advertisement("hci0", rssi), bluetooth.BluetoothChange.ADVERTISEMENT
+        )
+    dispatcher._async_handle_advertisement(
+        _advertisement("proxy", -70), bluetooth.BluetoothChange.ADVERTISEMENT
+    )
+
+    history = router.as_dict()
+    assert set(history) == {"hci0", "proxy"}
+    assert -90 < history["hci0"]["rssi"] < -70
+    assert history["proxy"]["rssi"] == -70
+    unregister()
@@ -0,0 +1,165 @@
+"""Tests for the connection scheduler."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from types import SimpleNamespace
+
+import pytest
+from simulator import SimulatedAdapter
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from custom_components.gira_system_3000 import gira_ble
+from custom_components.gira_system_3000.codec import generate_command
+from custom_components.gira_system_3000.const import (
+    IDLE_DISCONNECT_DEFAULT_S,
+    IDLE_DISCONNECT_MAX_S,
+    IDLE_DISCONNECT_MIN_S,
+    IDLE_DISCONNECT_MIN_SAMPLES,
+    SHUTTER_PROPERTY_ID_SET_POSITION,
+)
+from custom_components.gira_system_3000.gira_ble import GiraBLEClient
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+
+from .conftest import SHUTTER_ADDRESS, fast_profile
+
+COMMAND = generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, 10)
+
+
+def _record_gaps(client: GiraBLEClient, gaps: Iterable[float]) -> None:
+    """Record commands at the given spacing (seconds) on a fake clock."""
+    clock = [0.0]
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(gira_ble, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        client._record_command_gap()
+        for gap in gaps:
+            clock[0] += gap
+            client._record_command_gap()
+
+
+async def _two_clients(
+    hass: HomeAssistant, *, release_idle_under_pressure: bool
+) -> tuple[GiraBLEClient, GiraBLEClient, SimulatedAdapter]:
+    """Return two shutter clients sharing one adapter slot."""
+    adapter = SimulatedAdapter(slots=1, profile=fast_profile(), seed=1)
+    scheduler = GiraConnectionScheduler(hass, default_slots=1)
+    first, second = (
+        GiraBLEClient(
+            hass,
+            address,
+            address,
+            scheduler=scheduler,
+            transport=adapter,
+            release_idle_under_pressure=release_idle_under_pressure,
+        )
+        for address in ("E8:2B:E7:00:00:01", "E8:2B:E7:00:00:02")
+    )
+    for client in (first, second):
+        adapter.add_shutter(client.address)
+    return first, second, adapter
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_slots_from_bluetooth_allocations(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An adapter's slots come from HA's allocation, less other integrations' links."""
+    allocation = SimpleNamespace(
+        source="hci0", slots=5, free=4, allocated=["AA:BB:CC:DD:EE:FF"]
+    )
+    monkeypatch.setattr(
+        bluetooth,
+        "async_current_allocations",
+        lambda hass, source=None: [allocation] if source == "hci0" else None,
+        raising=False,
+    )
+    scheduler = GiraConnectionScheduler(hass, default_slots=3)
+    assert scheduler.slots_for("hci0") == 4
+    assert scheduler.slots_for("proxy") == 3
+    scheduler.async_set_slots("hci0", 1)
+    assert scheduler.slots_for("hci0") == 1
+
+
+async def test_link_kept_for_queued_commands_of_the_same_device(hass: HomeAssistant) -> None:
+    """A waiting device only gets the slot once the holder's queue is empty."""
+    adapter = SimulatedAdapter(slots=1, profile=fast_profile(), seed=1)
+    scheduler = GiraConnectionScheduler(hass, default_slots=1)
+    first, second = (
+        GiraBLEClient(hass, address, address, scheduler=scheduler, transport=adapter)
+        for address in ("E8:2B:E7:00:00:01", "E8:2B:E7:00:00:02")
+    )
+    for client in (first, second):
+        adapter.add_shutter(client.address)
+
+    commands = [generate_command(SHUTTER_PROPERTY_ID_SET_POSITION, value) for value in (10, 20)]
+    first_sends = [asyncio.create_task(first.send_command(command)) for command in commands]
+    await asyncio.sleep(0)
+    second_send = asyncio.create_task(second.send_command(commands[0]))
+    await asyncio.gather(*first_sends, second_send)
+
+    # One link-up per device: the first one is not torn down between its commands.
+    assert adapter.connect_attempts == 2
+    assert first.stats.connects == 1
+
+    for client in (first, second):
+        await client.async_close()
+    adapter.stop()
+
+
+async def test_idle_timeout_from_command_gaps(hass: HomeAssistant) -> None:
+    """The idle timeout covers the 80th percentile gap once enough gaps were seen."""
+    client = GiraBLEClient(hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass))
+    _record_gaps(client, [10.0] * (IDLE_DISCONNECT_MIN_SAMPLES - 1))
+    assert client.idle_disconnect_s == IDLE_DISCONNECT_DEFAULT_S
+
+    client = GiraBLEClient(hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass))
+    _record_gaps(client, [10.0, 2.0, 9.0, 1.0, 8.0, 3.0, 7.0, 4.0, 6.0, 5.0])
+    assert client.idle_disconnect_s == pytest.approx(8.0 * 1.2)  # 80th percentile of 1..10 s
+
+
+@pytest.mark.parametrize(
+    ("gap", "idle_s"),
+    [
+        (1.0, IDLE_DISCONNECT_MIN_S),
+        (IDLE_DISCONNECT_MAX_S - 1, IDLE_DISCONNECT_MAX_S),
+        (IDLE_DISCONNECT_MAX_S + 1, IDLE_DISCONNECT_MIN_S),  # rare commands: do not hold a slot
+    ],
+)
+async def test_idle_timeout_clamped(hass: HomeAssistant, gap: float, idle_s: float) -> None:
+    """The learned timeout stays within [IDLE_DISCONNECT_MIN_S, IDLE_DISCONNECT_MAX_S]."""
+    client = GiraBLEClient(hass, SHUTTER_ADDRESS, "Shutter", scheduler=GiraConnectionScheduler(hass))
+    _record_gaps(client, [gap] * IDLE_DISCONNECT_MIN_SAMPLES)
+    assert client.idle_disconnect_s == idle_s
+
+
+async def test_idle_link_released_under_pressure(hass: HomeAssistant) -> None:
+    """An idle link gives its slot to another device right away."""
+    first, second, adapter = await _two_clients(hass, release_idle_under_pressure=True)
+    await first.send_command(COMMAND)
+    assert first.is_idle
+
+    await asyncio.wait_for(second.send_command(COMMAND), 1)
+    assert not first.is_connected
+    assert second.is_connected
+    for client in (first, second):
+        await client.async_close()
+    adapter.stop()
+
+
+async def test_idle_link_kept_without_early_release(hass: HomeAssistant) -> None:
+    """With early release off, the other device waits for the idle timeout (or close)."""
+    first, second, adapter = await _two_clients(hass, release_idle_under_pressure=False)
+    await first.send_command(COMMAND)
+
+    send = asyncio.create_task(second.send_command(COMMAND))
+    await asyncio.sleep(0.1)
+    assert not send.done()
+    assert first.is_connected
+
+    await first.async_close()
+    await asyncio.wait_for(send, 1)
+    assert second.is_connected
+    await second.async_close()
+    adapter.stop()
@@ -0,0 +1,37 @@
+"""Tests for the sensor platform."""
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.gira_system_3000.const import DOMAIN
+
+from .conftest import SHUTTER_ADDRESS
+
+
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_sensor_entry_has_one_named_device(hass: HomeAssistant) -> None:
+    """Measurements and diagnostics of a sensor share one device with a name."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="e8:2b:e7:00:00:01",
+        data={"address": SHUTTER_ADDRESS, "name": "Küche", "device_type": "sensor"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    devices = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+    assert len(devices) == 1
+    assert (devices[0].name, devices[0].manufacturer) == ("Küche", "Gira")
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    assert entities
+    assert {entity.device_id for entity in entities} == {devices[0].id}
+    assert hass.states.get("sensor.kuche_temperatur") is not None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,126 @@
+"""Tests for the domain services."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.gira_system_3000.capture import iter_capture
+from custom_components.gira_system_3000.codec import encode_shutter_frame
+from custom_components.gira_system_3000.const import (
+    DOMAIN,
+    GIRA_MANUFACTURER_ID,
+    SERVICE_RECORD_CAPTURE,
+    SERVICE_SET_POSITIONS,
+)
+from custom_components.gira_system_3000.dispatcher import async_get_dispatcher
+from custom_components.gira_system_3000.gira_ble import (
+    KEY_SHUTTER_MOTION,
+    GiraBLEClient,
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+from custom_components.gira_system_3000.motion import async_get_timer_wheel
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+from custom_components.gira_system_3000.services import async_setup_services
+
+
+def _add_shutter(hass: HomeAssistant, address: str) -> tuple[str, dict]:
+    """Register a shutter entity backed by a client whose sends are mocked."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"address": address, "device_type": "shutter"})
+    entry.add_to_hass(hass)
+    entity = er.async_get(hass).async_get_or_create(
+        "cover", DOMAIN, address, config_entry=entry
+    )
+    client = GiraBLEClient(hass, address, address, scheduler=GiraConnectionScheduler(hass))
+    client.send_command = AsyncMock()
+    data = {
+        "device_type": "shutter",
+        "client": client,
+        "coordinator": GiraPassiveBluetoothDataUpdateCoordinator(
+            hass,
+            address,
+            address,
+            "shutter",
+            async_get_dispatcher(hass),
+            timer_wheel=async_get_timer_wheel(hass),
+        ),
+    }
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = data
+    return entity.entity_id, data
+
+
+async def test_set_positions_reports_each_failure(
+    hass: HomeAssistant, enable_bluetooth: None
+) -> None:
+    """A failing shutter is reported on its own and keeps its motion target."""
+    async_setup_services(hass)
+    ok_id, ok = _add_shutter(hass, "E8:2B:E7:00:00:01")
+    broken_id, broken = _add_shutter(hass, "E8:2B:E7:00:00:02")
+    broken["client"].send_command.side_effect = RuntimeError("adapter gone")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_POSITIONS,
+        {"positions": {ok_id: 40, broken_id: 60, "cover.other": 10}},
+        blocking=True,
+        return_response=True,
+    )
+
+    results = response["results"]
+    assert results[ok_id]["success"] is True
+    assert results[broken_id] == {"success": False, "error": "adapter gone"}
+    assert results["cover.other"]["success"] is False
+    # Sent straight to the queue, not through the coalescing window
+    assert ok["client"].send_command.await_args.kwargs == {"key": KEY_SHUTTER_MOTION}
+    assert ok["coordinator"].motion.target == 40
+    assert broken["coordinator"].motion.target is None
+    for data in (ok, broken):
+        await data["client"].async_close()
+
+
+async def test_record_capture_tees_the_dispatcher(
+    hass: HomeAssistant, enable_bluetooth: None, tmp_path: Path
+) -> None:
+    """Advertisements heard while recording are written to a replayable capture."""
+    hass.config.config_dir = str(tmp_path)
+    async_setup_services(hass)
+    dispatcher = async_get_dispatcher(hass)
+
+    call = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN, SERVICE_RECORD_CAPTURE, {"duration": 5}, blocking=True, return_response=True
+        )
+    )
+    await asyncio.sleep(0)
+    for raw in (0x00, 0x80):
+        dispatcher._async_handle_advertisement(
+            SimpleNamespace(
+                address="E8:2B:E7:00:00:01",
+                source="hci0",
+                rssi=-70,
+                manufacturer_data={GIRA_MANUFACTURER_ID: encode_shutter_frame(raw)},
+            ),
+            bluetooth.BluetoothChange.ADVERTISEMENT,
+        )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    response = await call
+
+    assert response["records"] == 2
+    assert Path(response["path"]).parent == tmp_path / DOMAIN
+    with open(response["path"], "rb") as fp:
+        records = list(iter_capture(fp))
+    assert [record.payload for record in records] == [encode_shutter_frame(0x00), encode_shutter_frame(0x80)]
+    assert {(record.address, record.rssi) for record in records} == {("E8:2B:E7:00:00:01", -70)}
+    assert not dispatcher._recorders
@@ -0,0 +1,154 @@
+"""Tests for the persistent last-known device state."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from simulator import SimulatedAdapter
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.gira_system_3000.codec import (
+    encode_shutter_frame,
+    generate_command,
+    shutter_position_from_raw,
+)
+from custom_components.gira_system_3000.const import (
+    DATA_STATE_STORE,
+    SHUTTER_PROPERTY_ID_STOP,
+    SHUTTER_VALUE_STOP,
+    STATE_RESTORE_MAX_AGE_S,
+    STATE_SAVE_DELAY_S,
+    STATE_STORAGE_KEY,
+    STATE_STORAGE_VERSION,
+)
+from custom_components.gira_system_3000.dispatcher import async_get_dispatcher
+from custom_components.gira_system_3000.gira_ble import (
+    GiraBLEClient,
+    GiraPassiveBluetoothDataUpdateCoordinator,
+)
+from custom_components.gira_system_3000.prewarm import PrewarmSchedule
+from custom_components.gira_system_3000.scheduler import GiraConnectionScheduler
+from custom_components.gira_system_3000.state_store import async_get_state_store
+
+from .conftest import SHUTTER_ADDRESS, THERMOSTAT_ADDRESS, fast_profile
+
+
+def _stored(devices: dict[str, Any]) -> dict[str, Any]:
+    return {"version": STATE_STORAGE_VERSION, "key": STATE_STORAGE_KEY, "data": {"devices": devices}}
+
+
+async def test_restore_skips_stale_state(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Only states younger than STATE_RESTORE_MAX_AGE_S are restored."""
+    now = dt_util.utcnow()
+    old = now - timedelta(seconds=STATE_RESTORE_MAX_AGE_S + 60)
+    hass_storage[STATE_STORAGE_KEY] = _stored(
+        {
+            SHUTTER_ADDRESS: {"state": {"position": 40}, "updated": now.isoformat()},
+            THERMOSTAT_ADDRESS: {"state": {"target_temperature": 21.0}, "updated": old.isoformat()},
+        }
+    )
+    store = await async_get_state_store(hass)
+
+    assert store.get(SHUTTER_ADDRESS.lower()) == ({"position": 40}, now)
+    assert store.get(THERMOSTAT_ADDRESS) is None
+    assert await async_get_state_store(hass) is store
+
+
+async def test_updates_are_written_in_one_batch(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Many updates within the save delay result in a single write of the latest state."""
+    store = await async_get_state_store(hass)
+    for position in range(10):
+        store.async_update(SHUTTER_ADDRESS, {"position": position})
+    store.async_update(THERMOSTAT_ADDRESS, {"target_temperature": 20.5})
+    assert STATE_STORAGE_KEY not in hass_storage
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATE_SAVE_DELAY_S + 1))
+    await hass.async_block_till_done()
+    devices = hass_storage[STATE_STORAGE_KEY]["data"]["devices"]
+    assert devices[SHUTTER_ADDRESS]["state"] == {"position": 9}
+    assert devices[THERMOSTAT_ADDRESS]["state"] == {"target_temperature": 20.5}
+
+    store.async_remove(THERMOSTAT_ADDRESS)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2 * STATE_SAVE_DELAY_S + 2))
+    await hass.async_block_till_done()
+    assert THERMOSTAT_ADDRESS not in hass_storage[STATE_STORAGE_KEY]["data"]["devices"]
+
+
+async def test_coordinator_restores_until_reported(
+    hass: HomeAssistant, hass_storage: dict[str, Any], enable_bluetooth: None
+) -> None:
+    """A coordinator starts from the stored state and drops the flag once the device reports."""
+    hass_storage[STATE_STORAGE_KEY] = _stored(
+        {SHUTTER_ADDRESS: {"state": {"position": 40}, "updated": dt_util.utcnow().isoformat()}}
+    )
+    coordinator = GiraPassiveBluetoothDataUpdateCoordinator(
+        hass,
+        SHUTTER_ADDRESS,
+        "Shutter",
+        "shutter",
+        async_get_dispatcher(hass),
+        state_store=await async_get_state_store(hass),
+    )
+    assert coordinator.data == {"position": 40}
+    assert coordinator.restored_at is not None
+
+    coordinator.async_handle_manufacturer_data(encode_shutter_frame(0x80))
+    assert coordinator.restored_at is None
+    assert coordinator.data["position"] == shutter_position_from_raw(0x80)
+
+
+def test_prewarm_schedule_round_trip() -> None:
+    """Saved slots restore into a schedule with the same slot size only."""
+    schedule = PrewarmSchedule()
+    now = dt_util.now()
+    schedule.record(now - timedelta(days=1))
+    assert schedule.record(now)
+    assert not schedule.record(now)
+
+    restored = PrewarmSchedule()
+    restored.restore(schedule.as_dict())
+    assert restored.as_dict() == schedule.as_dict()
+    assert restored.score(now + timedelta(days=1)) == schedule.score(now + timedelta(days=1)) > 1
+
+    other = PrewarmSchedule(bin_minutes=30)
+    other.restore(schedule.as_dict())
+    assert other.as_dict()["slots"] == []
+
+
+async def test_prewarm_slots_survive_restart(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """A client's learned slots are saved with the state and restored by the next client."""
+    adapter = SimulatedAdapter(profile=fast_profile(), seed=1)
+    adapter.add_shutter(SHUTTER_ADDRESS, position_u8=100)
+
+    def _client(store) -> GiraBLEClient:
+        return GiraBLEClient(
+            hass,
+            SHUTTER_ADDRESS,
+            "Shutter",
+            scheduler=GiraConnectionScheduler(hass),
+            transport=adapter,
+            state_store=store,
+        )
+
+    client = _client(await async_get_state_store(hass))
+    await client.send_command(generate_command(SHUTTER_PROPERTY_ID_STOP, SHUTTER_VALUE_STOP))
+    await client.async_close()
+    adapter.stop()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=STATE_SAVE_DELAY_S + 1))
+    await hass.async_block_till_done()
+    saved = hass_storage[STATE_STORAGE_KEY]["data"]["prewarm"][SHUTTER_ADDRESS]
+    assert saved == client.prewarm_schedule.as_dict()
+    assert len(saved["slots"]) == 1
+
+    # A restart: a new store loads the file, a new client starts from it.
+    hass.data.pop(DATA_STATE_STORE)
+    restored = _client(await async_get_state_store(hass))
+    assert restored.prewarm_schedule.as_dict() == saved